@@ -1,16 +1,17 @@
 """
 Database operations for Expense Categories
+Prefer get_categories_by_ids over calling get_category_by_id in a loop
 """
 
-from models import ExpenseCategory, get_engine, get_session
+import logging
+from models import ExpenseCategory, session_scope
+
+logger = logging.getLogger(__name__)
 
 
 def create_expense_category(relocation_profile_id, name, description=None):
     """Create a new expense category"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         category = ExpenseCategory(
             relocation_profile_id=relocation_profile_id,
             name=name,
@@ -18,82 +19,62 @@ def create_expense_category(relocation_profile_id, name, description=None):
         )
         
         session.add(category)
-        session.commit()
-        
-        print(f"✓ Created category: {category.name}")
-        
-        category_id = category.id
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error creating category: {e}")
-        raise
-    finally:
-        session.close()
     
-    return get_category_by_id(category_id)
+    logger.debug("Created category %s (ID %s)", category.name, category.id)
+    
+    return category
+
+
+def create_expense_categories_bulk(records):
+    """Create many expense categories in a single transaction"""
+    with session_scope() as session:
+        categories = [ExpenseCategory(**record) for record in records]
+        session.add_all(categories)
+    
+    logger.debug("Created %d categories", len(categories))
+    
+    return categories
 
 
 def get_all_categories(relocation_profile_id=None):
     """Get all expense categories, optionally filtered by profile"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         query = session.query(ExpenseCategory)
         
         if relocation_profile_id:
             query = query.filter_by(relocation_profile_id=relocation_profile_id)
         
-        categories = query.order_by(ExpenseCategory.name).all()
-        
-        result = []
-        for cat in categories:
-            _ = (cat.id, cat.name)
-            result.append(cat)
-        
-        return result
-    finally:
-        session.close()
+        return query.order_by(ExpenseCategory.name).all()
 
 
 def get_category_by_id(category_id):
     """Get a specific category by ID"""
-    engine = get_engine()
-    session = get_session(engine)
+    with session_scope() as session:
+        return session.get(ExpenseCategory, category_id)
+
+
+def get_categories_by_ids(category_ids):
+    """Get several categories by ID with a single IN query"""
+    category_ids = list(category_ids)
+    if not category_ids:
+        return []
     
-    try:
-        category = session.query(ExpenseCategory).filter_by(id=category_id).first()
-        if category:
-            _ = (category.id, category.name)
-        return category
-    finally:
-        session.close()
+    with session_scope() as session:
+        return session.query(ExpenseCategory).filter(ExpenseCategory.id.in_(category_ids)).all()
 
 
 def delete_expense_category(category_id):
     """Delete a category"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        category = session.query(ExpenseCategory).filter_by(id=category_id).first()
+    with session_scope() as session:
+        category = session.get(ExpenseCategory, category_id)
         
         if not category:
-            print(f"❌ No category found with ID {category_id}")
+            logger.warning("No category found with ID %s", category_id)
             return False
         
         category_name = category.name
         
         session.delete(category)
-        session.commit()
-        
-        print(f"✓ Deleted category: {category_name}")
-        return True
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error deleting category: {e}")
-        raise
-    finally:
-        session.close()
\ No newline at end of file
+    
+    logger.debug("Deleted category %s (ID %s)", category_name, category_id)
+    return True
\ No newline at end of file
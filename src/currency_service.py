@@ -3,19 +3,190 @@ Currency exchange rate service
 Fetches real-time exchange rates from Frankfurter API
 """
 
-import urllib.request
-import json
-from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+import time
+from datetime import date
+from functools import lru_cache
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Cache to avoid repeated API calls
-_rate_cache = {}
-_cache_date = None
+from models import ExchangeRate, session_scope
+
+
+# One HTTP session for the whole process - keeps the TLS connection to the
+# API alive between lookups instead of reconnecting for every rate
+_http = requests.Session()
+_http.headers.update({'User-Agent': 'RelocationOS/1.0 (Educational Project)'})
+_http.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+))
+
+
+# Set while prefetching, so background lookups don't print over the user's prompts
+_quiet = ContextVar('quiet', default=False)
+
+# Background thread for prefetch_exchange_rate - created on first use
+_prefetch_pool = None
+
+
+def _log(message):
+    """Print a status message, unless running as a background prefetch"""
+    if not _quiet.get():
+        print(message)
+
+
+# Seconds to wait before trying a pair again after a failed lookup, so
+# working offline doesn't cost a network timeout on every expense
+FAILED_LOOKUP_TTL = 300
+
+# (from, to) -> time.monotonic() of the last failed lookup
+_failed_lookups = {}
+
+
+# Rates fetched in batches by get_exchange_rates, keyed by (day, from, to)
+# Single-pair lookups check here before going to the API
+_batch_rates = {}
+
+
+def _load_stored_rates(day_ordinal, from_currency, to_currencies):
+    """
+    Read rates saved to the database by an earlier run
+    
+    Returns:
+        Dictionary of target currency -> rate in cents for the rates found
+    """
+    try:
+        with session_scope() as session:
+            rows = session.query(ExchangeRate).filter(
+                ExchangeRate.from_currency == from_currency,
+                ExchangeRate.to_currency.in_(to_currencies),
+                ExchangeRate.rate_date == date.fromordinal(day_ordinal)
+            ).all()
+    except Exception as e:
+        _log(f"  ⚠️  Could not read stored exchange rates: {e}")
+        return {}
+    
+    return {row.to_currency: row.rate_cents for row in rows}
+
+
+def _load_previous_rates(day_ordinal, from_currency, to_currencies):
+    """
+    Read the most recent rates saved before the given day, with their
+    Last-Modified header
+    
+    Returns:
+        Dictionary of target currency -> (rate in cents, last_modified)
+    """
+    try:
+        with session_scope() as session:
+            rows = session.query(ExchangeRate).filter(
+                ExchangeRate.from_currency == from_currency,
+                ExchangeRate.to_currency.in_(to_currencies),
+                ExchangeRate.rate_date < date.fromordinal(day_ordinal),
+                ExchangeRate.last_modified.isnot(None)
+            ).order_by(ExchangeRate.rate_date.desc()).all()
+    except Exception as e:
+        _log(f"  ⚠️  Could not read stored exchange rates: {e}")
+        return {}
+    
+    previous = {}
+    for row in rows:
+        # Rows are newest first - keep the first one seen per currency
+        previous.setdefault(row.to_currency, (row.rate_cents, row.last_modified))
+    
+    return previous
+
+
+def _store_rates(day_ordinal, from_currency, rates, last_modified=None):
+    """Save fetched rates to the database so later runs can reuse them"""
+    try:
+        with session_scope() as session:
+            for to_currency, rate_cents in rates.items():
+                session.merge(ExchangeRate(
+                    from_currency=from_currency,
+                    to_currency=to_currency,
+                    rate_date=date.fromordinal(day_ordinal),
+                    rate_cents=rate_cents,
+                    last_modified=last_modified
+                ))
+    except Exception as e:
+        _log(f"  ⚠️  Could not save exchange rates: {e}")
+
+
+def _fetch_rates(day_ordinal, from_currency, to_currencies):
+    """
+    Fetch exchange rates for one or more target currencies in a single request
+    and save them for the given day
+    If earlier rates for all currencies share a Last-Modified header, the
+    request is conditional and a 304 reply reuses those rates
+    
+    Returns:
+        Dictionary of target currency -> rate in cents (e.g., {'EUR': 9200})
+    """
+    url = f"https://api.frankfurter.app/latest?from={from_currency}&to={','.join(to_currencies)}"
+    
+    previous = _load_previous_rates(day_ordinal, from_currency, to_currencies)
+    validators = {previous[to][1] for to in to_currencies if to in previous}
+    
+    headers = {}
+    if len(previous) == len(to_currencies) and len(validators) == 1:
+        headers['If-Modified-Since'] = validators.pop()
+    
+    _log(f"  Fetching exchange rate: {from_currency} → {', '.join(to_currencies)}...")
+    
+    response = _http.get(url, headers=headers, timeout=5)
+    
+    if response.status_code == 304:
+        # Rates haven't changed - carry the previous ones forward to today
+        last_modified = headers['If-Modified-Since']
+        rates = {to_currency: previous[to_currency][0] for to_currency in to_currencies}
+        _log(f"  ✓ Rates unchanged since {last_modified}")
+    else:
+        response.raise_for_status()
+        data = response.json()
+        last_modified = response.headers.get('Last-Modified')
+        
+        rates = {}
+        for to_currency, rate_float in data['rates'].items():
+            # Convert to our cent format (multiply by 10000)
+            rates[to_currency] = round(rate_float * 10000)
+            _log(f"  ✓ Rate: 1 {from_currency} = {rate_float:.4f} {to_currency}")
+    
+    _store_rates(day_ordinal, from_currency, rates, last_modified)
+    
+    return rates
+
+
+@lru_cache(maxsize=256)
+def _rate_for_day(day_ordinal, from_currency, to_currency):
+    """
+    Look up one exchange rate
+    Results are memoized per (day, from, to) so each pair is fetched at most
+    once a day - errors propagate and are never cached
+    
+    Returns:
+        Exchange rate as integer in cents (e.g., 9200 for 0.92)
+    """
+    rate_cents = _batch_rates.get((day_ordinal, from_currency, to_currency))
+    if rate_cents is not None:
+        return rate_cents
+    
+    stored = _load_stored_rates(day_ordinal, from_currency, [to_currency])
+    if to_currency in stored:
+        return stored[to_currency]
+    
+    return _fetch_rates(day_ordinal, from_currency, [to_currency])[to_currency]
 
 
 def get_exchange_rate(from_currency, to_currency):
     """
     Get exchange rate from one currency to another
+    Rates are cached for the rest of the day, failures for FAILED_LOOKUP_TTL seconds
     
     Args:
         from_currency: 3-letter currency code (e.g., 'USD')
@@ -29,55 +200,105 @@ def get_exchange_rate(from_currency, to_currency):
         rate = get_exchange_rate('USD', 'EUR')
         # Returns 9200 (meaning 1 USD = 0.92 EUR)
     """
-    global _rate_cache, _cache_date
-    
     # If same currency, rate is 1.0
     if from_currency == to_currency:
         return 10000  # 1.0 in our cent format
     
-    # Check cache (valid for 1 day)
-    today = date.today()
-    cache_key = f"{from_currency}_{to_currency}"
-    
-    if _cache_date == today and cache_key in _rate_cache:
-        print(f"  (Using cached rate for {from_currency} → {to_currency})")
-        return _rate_cache[cache_key]
+    failed_at = _failed_lookups.get((from_currency, to_currency))
+    if failed_at is not None and time.monotonic() - failed_at < FAILED_LOOKUP_TTL:
+        _log("  ⚠️  Exchange rate lookup failed recently, not retrying yet")
+        return None
     
-    # Fetch from API
     try:
-        url = f"https://api.frankfurter.app/latest?from={from_currency}&to={to_currency}"
-        
-        print(f"  Fetching exchange rate: {from_currency} → {to_currency}...")
-        
-        # Create request with headers
-        req = urllib.request.Request(
-            url,
-            headers={
-                'User-Agent': 'RelocationOS/1.0 (Educational Project)'
-            }
-        )
-        
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            
-            # Extract the rate
-            rate_float = data['rates'][to_currency]
-            
-            # Convert to our cent format (multiply by 10000)
-            rate_cents = int(rate_float * 10000)
-            
-            # Cache it
-            _rate_cache[cache_key] = rate_cents
-            _cache_date = today
-            
-            print(f"  ✓ Rate: 1 {from_currency} = {rate_float:.4f} {to_currency}")
-            
-            return rate_cents
-            
+        rate_cents = _rate_for_day(date.today().toordinal(), from_currency, to_currency)
     except Exception as e:
-        print(f"  ⚠️  Could not fetch exchange rate: {e}")
-        print(f"  You can enter the rate manually or use default (1.0)")
+        _failed_lookups[(from_currency, to_currency)] = time.monotonic()
+        _log(f"  ⚠️  Could not fetch exchange rate: {e}")
+        _log(f"  You can enter the rate manually or use default (1.0)")
         return None
+    
+    _failed_lookups.pop((from_currency, to_currency), None)
+    return rate_cents
+
+
+def _get_exchange_rate_quietly(from_currency, to_currency):
+    # Runs on the prefetch thread, so this only silences that thread
+    _quiet.set(True)
+    return get_exchange_rate(from_currency, to_currency)
+
+
+def prefetch_exchange_rate(from_currency, to_currency):
+    """
+    Start looking up an exchange rate on a background thread
+    The result is cached like any other lookup, so a later get_exchange_rate
+    for the same pair doesn't wait on the network
+    
+    Returns:
+        Future whose result() is the rate in cents, or None if it couldn't be fetched
+    """
+    global _prefetch_pool
+    
+    if _prefetch_pool is None:
+        _prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='rate-prefetch')
+    
+    return _prefetch_pool.submit(_get_exchange_rate_quietly, from_currency, to_currency)
+
+
+def get_exchange_rates(from_currency, to_currencies):
+    """
+    Get exchange rates from one currency to several others with one API call
+    
+    Args:
+        from_currency: 3-letter currency code (e.g., 'USD')
+        to_currencies: List of 3-letter currency codes (e.g., ['EUR', 'GBP'])
+    
+    Returns:
+        Dictionary of currency code -> rate in cents (e.g., {'EUR': 9200})
+        Currencies whose rate could not be fetched are left out, and aren't
+        asked for again for FAILED_LOOKUP_TTL seconds
+    """
+    global _batch_rates
+    
+    today = date.today().toordinal()
+    now = time.monotonic()
+    rates = {}
+    missing = []
+    
+    for to_currency in dict.fromkeys(to_currencies):
+        failed_at = _failed_lookups.get((from_currency, to_currency))
+        if to_currency == from_currency:
+            rates[to_currency] = 10000
+        elif (today, from_currency, to_currency) in _batch_rates:
+            rates[to_currency] = _batch_rates[(today, from_currency, to_currency)]
+        elif failed_at is None or now - failed_at >= FAILED_LOOKUP_TTL:
+            missing.append(to_currency)
+    
+    if not missing:
+        return rates
+    
+    fetched = _load_stored_rates(today, from_currency, missing)
+    missing = [to_currency for to_currency in missing if to_currency not in fetched]
+    
+    if missing:
+        try:
+            fetched.update(_fetch_rates(today, from_currency, missing))
+        except Exception as e:
+            _log(f"  ⚠️  Could not fetch exchange rates: {e}")
+    
+    # Remember what couldn't be fetched - the whole batch if the request
+    # failed, or just the currencies the API left out of its reply
+    for to_currency in missing:
+        if to_currency not in fetched:
+            _failed_lookups[(from_currency, to_currency)] = now
+    
+    # Drop rates from previous days before storing today's batch
+    _batch_rates = {key: rate for key, rate in _batch_rates.items() if key[0] == today}
+    for to_currency, rate_cents in fetched.items():
+        _batch_rates[(today, from_currency, to_currency)] = rate_cents
+        _failed_lookups.pop((from_currency, to_currency), None)
+        rates[to_currency] = rate_cents
+    
+    return rates
 
 
 def convert_amount(amount_cents, from_currency, to_currency):
@@ -97,12 +318,24 @@ def convert_amount(amount_cents, from_currency, to_currency):
     if rate is None:
         return amount_cents
     
-    # Convert: (amount * rate) / 10000
-    converted = (amount_cents * rate) // 10000
+    # Convert: (amount * rate) / 10000, rounded half up in integer math
+    converted = (amount_cents * rate + 5000) // 10000
     
     return converted
 
 
+# Currency symbols used by format_currency
+_SYMBOLS = {
+    'USD': '$',
+    'EUR': '€',
+    'GBP': '£',
+    'JPY': '¥',
+    'CAD': 'C$',
+    'AUD': 'A$',
+    'ILS': '₪',
+}
+
+
 def format_currency(amount_cents, currency_code):
     """
     Format amount for display
@@ -114,22 +347,9 @@ def format_currency(amount_cents, currency_code):
     Returns:
         Formatted string like "$123.45" or "€123.45"
     """
-    amount = amount_cents / 100
-    
-    # Currency symbols
-    symbols = {
-        'USD': '$',
-        'EUR': '€',
-        'GBP': '£',
-        'JPY': '¥',
-        'CAD': 'C$',
-        'AUD': 'A$',
-        'ILS': '₪',
-    }
-    
-    symbol = symbols.get(currency_code, currency_code + ' ')
+    symbol = _SYMBOLS.get(currency_code, currency_code + ' ')
     
-    return f"{symbol}{amount:,.2f}"
+    return f"{symbol}{amount_cents / 100:,.2f}"
 
 
 def get_manual_exchange_rate():
@@ -149,7 +369,7 @@ def get_manual_exchange_rate():
             return None
         
         rate_float = float(rate_input)
-        rate_cents = int(rate_float * 10000)
+        rate_cents = round(rate_float * 10000)
         
         return rate_cents
         
@@ -159,8 +379,8 @@ def get_manual_exchange_rate():
 
 
 def clear_cache():
-    """Clear the exchange rate cache"""
-    global _rate_cache, _cache_date
-    _rate_cache = {}
-    _cache_date = None
-    print("✓ Exchange rate cache cleared")
+    """Clear the in-memory exchange rate cache (rates saved in the database are kept)"""
+    global _batch_rates
+    _batch_rates = {}
+    _rate_for_day.cache_clear()
+    print("✓ Exchange rate cache cleared")
\ No newline at end of file
@@ -1,12 +1,26 @@
 """
 Database operations for Relocation OS
 Functions to create, read, update, and delete data
+Prefer get_profiles_by_ids over calling get_profile_by_id in a loop
 """
 
+import logging
 from datetime import date
-from models import RelocationProfile, get_engine, get_session, init_database
+from sqlalchemy.orm import joinedload
+from models import RelocationProfile, init_database, session_scope
+from request_scope import scoped_lookup, clears_request_scope
+from display import write_batched
 
+logger = logging.getLogger(__name__)
 
+# Column names accepted by the update functions
+_PROFILE_COLS = frozenset(c.name for c in RelocationProfile.__table__.columns) - {'id'}
+
+# Separator used by display_profile
+_BAR = "=" * 60
+
+
+@clears_request_scope
 def create_relocation_profile(
     relocation_name,
     origin_country,
@@ -37,11 +51,7 @@ def create_relocation_profile(
     Returns:
         The created RelocationProfile object
     """
-    # Get database connection
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         # Create new profile object
         profile = RelocationProfile(
             relocation_name=relocation_name,
@@ -56,40 +66,50 @@ def create_relocation_profile(
             notes=notes
         )
         
-        # Add to database
+        # Add to database - saved when the scope commits
         session.add(profile)
-        session.commit()  # Save changes
-        
-        print(f"✓ Created relocation profile: {profile.relocation_name}")
-        print(f"  ID: {profile.id}")
-        
-        return profile
-        
-    except Exception as e:
-        session.rollback()  # Undo changes if error
-        print(f"✗ Error creating profile: {e}")
-        raise
-    finally:
-        session.close()  # Always close the connection
+    
+    logger.debug("Created relocation profile %s (ID %s)", profile.relocation_name, profile.id)
+    
+    return profile
 
 
-def get_all_profiles():
+def get_all_profiles(limit=None, offset=None):
     """
     Retrieve all relocation profiles from the database
     
+    Args:
+        limit: Optional - return at most this many profiles
+        offset: Optional - skip this many profiles first
+    
     Returns:
-        List of all RelocationProfile objects
+        List of RelocationProfile objects, sorted by ID
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        profiles = session.query(RelocationProfile).all()
+    with session_scope() as session:
+        query = session.query(RelocationProfile).order_by(RelocationProfile.id)
+        profiles = query.limit(limit).offset(offset).all()
         return profiles
-    finally:
-        session.close()
 
 
+def list_profile_summaries():
+    """
+    Retrieve just the fields needed to list and pick profiles in a menu
+    
+    Returns:
+        List of (id, relocation_name, origin_country, destination_country,
+        primary_currency) rows
+    """
+    with session_scope() as session:
+        return session.query(
+            RelocationProfile.id,
+            RelocationProfile.relocation_name,
+            RelocationProfile.origin_country,
+            RelocationProfile.destination_country,
+            RelocationProfile.primary_currency
+        ).all()
+
+
+@scoped_lookup
 def get_profile_by_id(profile_id):
     """
     Get a specific relocation profile by its ID
@@ -100,14 +120,73 @@ def get_profile_by_id(profile_id):
     Returns:
         RelocationProfile object or None if not found
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        profile = session.query(RelocationProfile).filter_by(id=profile_id).first()
+    with session_scope() as session:
+        profile = session.get(RelocationProfile, profile_id)
         return profile
-    finally:
-        session.close()
+
+
+def get_profile_with_phases(profile_id):
+    """
+    Get a profile together with its phases in a single query
+    
+    Args:
+        profile_id: The ID of the profile to retrieve
+    
+    Returns:
+        RelocationProfile object with profile.phases loaded (sorted by
+        order_index), or None if not found
+    """
+    with session_scope() as session:
+        return session.get(RelocationProfile, profile_id,
+                           options=[joinedload(RelocationProfile.phases)])
+
+
+def get_profiles_by_ids(profile_ids):
+    """
+    Get several relocation profiles with a single IN query
+    
+    Args:
+        profile_ids: Iterable of profile IDs
+    
+    Returns:
+        List of RelocationProfile objects (missing IDs are skipped)
+    """
+    profile_ids = list(profile_ids)
+    if not profile_ids:
+        return []
+    
+    with session_scope() as session:
+        return session.query(RelocationProfile).filter(RelocationProfile.id.in_(profile_ids)).all()
+
+
+def format_profile(profile):
+    """
+    Build the display text for a relocation profile
+    
+    Args:
+        profile: RelocationProfile object to format
+    
+    Returns:
+        Multi-line string (without a trailing newline)
+    """
+    lines = [
+        "\n" + _BAR,
+        f"RELOCATION PROFILE: {profile.relocation_name}",
+        _BAR,
+        f"ID: {profile.id}",
+        f"Route: {profile.origin_country} → {profile.destination_country}",
+        f"Target Arrival: {profile.target_arrival_date}",
+        f"Family Size: {profile.family_size} person(s)",
+        f"Children: {profile.number_of_children}",
+        f"Pets: {'Yes' if profile.pets else 'No'}",
+        f"Primary Currency: {profile.primary_currency}",
+    ]
+    if profile.secondary_currency:
+        lines.append(f"Secondary Currency: {profile.secondary_currency}")
+    if profile.notes:
+        lines.append(f"\nNotes: {profile.notes}")
+    lines.append(_BAR + "\n")
+    return "\n".join(lines)
 
 
 def display_profile(profile):
@@ -121,23 +200,24 @@ def display_profile(profile):
         print("No profile found")
         return
     
-    print("\n" + "=" * 60)
-    print(f"RELOCATION PROFILE: {profile.relocation_name}")
-    print("=" * 60)
-    print(f"ID: {profile.id}")
-    print(f"Route: {profile.origin_country} → {profile.destination_country}")
-    print(f"Target Arrival: {profile.target_arrival_date}")
-    print(f"Family Size: {profile.family_size} person(s)")
-    print(f"Children: {profile.number_of_children}")
-    print(f"Pets: {'Yes' if profile.pets else 'No'}")
-    print(f"Primary Currency: {profile.primary_currency}")
-    if profile.secondary_currency:
-        print(f"Secondary Currency: {profile.secondary_currency}")
-    if profile.notes:
-        print(f"\nNotes: {profile.notes}")
-    print("=" * 60 + "\n")
+    print(format_profile(profile))
+
+
+def display_profiles_bulk(profiles, batch_size=50):
+    """
+    Pretty print many profiles, writing them to stdout in batches
     
+    Args:
+        profiles: Iterable of RelocationProfile objects (may be a generator)
+        batch_size: Number of profiles formatted per write
     
+    Returns:
+        Number of profiles displayed
+    """
+    return write_batched(profiles, format_profile, batch_size)
+
+
+@clears_request_scope
 def update_relocation_profile(profile_id, **kwargs):
     """
     Update an existing relocation profile
@@ -149,88 +229,64 @@ def update_relocation_profile(profile_id, **kwargs):
     Returns:
         Updated RelocationProfile object or None if not found
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         # Get the profile
-        profile = session.query(RelocationProfile).filter_by(id=profile_id).first()
+        profile = session.get(RelocationProfile, profile_id)
         
         if not profile:
-            print(f"❌ No profile found with ID {profile_id}")
+            logger.warning("No profile found with ID %s", profile_id)
             return None
         
         # Update fields
+        updated_fields = []
+        unknown_fields = []
         for key, value in kwargs.items():
-            if hasattr(profile, key):
+            if key in _PROFILE_COLS:
                 setattr(profile, key, value)
-                print(f"  ✓ Updated {key}")
+                updated_fields.append(key)
             else:
-                print(f"  ⚠️  Unknown field: {key}")
-        
-        session.commit()
-        print(f"\n✓ Profile {profile_id} updated successfully!")
-        
-        # Refresh to get updated data before session closes
-        session.refresh(profile)
-        
-        # Create a detached copy with all data loaded
-        profile_id_copy = profile.id
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error updating profile: {e}")
-        raise
-    finally:
-        session.close()
-    
-    # Get fresh copy in new session
-    return get_profile_by_id(profile_id_copy)
+                unknown_fields.append(key)
+    
+    for key in unknown_fields:
+        logger.warning("Unknown profile field: %s", key)
+    logger.debug("Updated profile %s: %s", profile_id, ", ".join(updated_fields))
+    return profile
 
 
-def update_relocation_profile(profile_id, **kwargs):
+@clears_request_scope
+def update_relocation_profile_fast(profile_id, **kwargs):
     """
-    Update an existing relocation profile
+    Update a relocation profile with a single UPDATE statement
+    Skips loading the profile - use update_relocation_profile if you need it back
     
     Args:
         profile_id: ID of the profile to update
         **kwargs: Fields to update (e.g., relocation_name="New Name")
     
     Returns:
-        Updated RelocationProfile object or None if not found
+        True if the profile was updated, False if it was not found
+        (or there was nothing to update)
     """
-    engine = get_engine()
-    session = get_session(engine)
+    if not kwargs:
+        return False
     
-    try:
-        # Get the profile
-        profile = session.query(RelocationProfile).filter_by(id=profile_id).first()
-        
-        if not profile:
-            print(f"❌ No profile found with ID {profile_id}")
-            return None
-        
-        # Update fields
-        for key, value in kwargs.items():
-            if hasattr(profile, key):
-                setattr(profile, key, value)
-                print(f"  ✓ Updated {key}")
-            else:
-                print(f"  ⚠️  Unknown field: {key}")
-        
-        session.commit()
-        print(f"\n✓ Profile {profile_id} updated successfully!")
-        
-        return profile
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error updating profile: {e}")
-        raise
-    finally:
-        session.close()
+    unknown = [key for key in kwargs if key not in _PROFILE_COLS]
+    if unknown:
+        raise ValueError(f"Unknown profile field(s): {', '.join(unknown)}")
+    
+    with session_scope() as session:
+        updated = session.query(RelocationProfile).filter_by(id=profile_id).update(
+            kwargs, synchronize_session=False
+        )
+    
+    if not updated:
+        logger.warning("No profile found with ID %s", profile_id)
+        return False
+    
+    return True
 
 
+@clears_request_scope
 def delete_relocation_profile(profile_id):
     """
     Delete a relocation profile
@@ -241,30 +297,19 @@ def delete_relocation_profile(profile_id):
     Returns:
         True if deleted, False if not found
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         # Get the profile
-        profile = session.query(RelocationProfile).filter_by(id=profile_id).first()
+        profile = session.get(RelocationProfile, profile_id)
         
         if not profile:
-            print(f"❌ No profile found with ID {profile_id}")
+            logger.warning("No profile found with ID %s", profile_id)
             return False
         
         # Store the name before deleting
         profile_name = profile.relocation_name
         
-        # Delete it
+        # Delete it - removed when the scope commits
         session.delete(profile)
-        session.commit()
-        
-        print(f"✓ Deleted profile: {profile_name} (ID: {profile_id})")
-        return True
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error deleting profile: {e}")
-        raise
-    finally:
-        session.close()
\ No newline at end of file
+    
+    logger.debug("Deleted profile %s (ID %s)", profile_name, profile_id)
+    return True
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Shared helpers for printing records to the terminal
+"""
+
+import sys
+
+
+def write_batched(items, fmt, batch_size=50):
+    """
+    Format items and write them to stdout in batches, so long listings
+    cost one write per batch instead of one print per item
+    
+    Args:
+        items: Iterable of records (may be a generator)
+        fmt: Function returning the display text for one record
+        batch_size: Number of records formatted per write
+    
+    Returns:
+        Number of records written
+    """
+    count = 0
+    batch = []
+    for item in items:
+        batch.append(fmt(item))
+        count += 1
+        if len(batch) >= batch_size:
+            sys.stdout.write("\n".join(batch) + "\n")
+            batch = []
+    
+    if batch:
+        sys.stdout.write("\n".join(batch) + "\n")
+    
+    return count
\ No newline at end of file
@@ -1,11 +1,65 @@
 """
 Database operations for Expenses
+Prefer get_expenses_by_ids over calling get_expense_by_id in a loop
 """
 
+import logging
+import re
 from datetime import date
-from models import Expense, get_engine, get_session
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import joinedload
+from models import Expense, session_scope
+from request_scope import scoped_lookup, clears_request_scope
+from display import write_batched
 
+logger = logging.getLogger(__name__)
 
+# Column names accepted by the update functions
+_EXPENSE_COLS = frozenset(c.name for c in Expense.__table__.columns) - {'id'}
+
+# Separators used by the display functions
+_BAR = "=" * 60
+_DIV = "-" * 60
+
+# A comma used as the decimal point ("123,45") - only with 1 or 2 digits
+# after it, so a thousands separator ("1,000") isn't read as one
+_DECIMAL_COMMA = re.compile(r'[+-]?\d*,\d{1,2}')
+
+# Payment status emoji used by format_expense
+_PAYMENT_EMOJI = {
+    'unpaid': '💰',
+    'paid': '✅'
+}
+
+
+def parse_amount_cents(text):
+    """
+    Parse an amount typed by the user (e.g. "123.45" or "123,45") into cents
+    Goes through Decimal rather than float, so "0.29" is 29 cents, not 28
+    
+    Raises:
+        ValueError: If the text isn't a valid amount - including amounts with
+        thousands separators such as "1,000", which are ambiguous
+    """
+    text = text.strip()
+    if ',' in text:
+        if not _DECIMAL_COMMA.fullmatch(text):
+            raise ValueError(f"Invalid amount: {text!r}")
+        text = text.replace(',', '.')
+    
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {text!r}") from None
+    
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {text!r}")
+    
+    return int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+@clears_request_scope
 def create_expense(relocation_profile_id, phase_id, title, category=None,
                    estimated_amount=0, actual_amount=None, currency='USD',
                    exchange_rate=None, cost_certainty='estimated',
@@ -35,10 +89,7 @@ def create_expense(relocation_profile_id, phase_id, title, category=None,
     Returns:
         The created Expense object
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         expense = Expense(
             relocation_profile_id=relocation_profile_id,
             phase_id=phase_id,
@@ -58,27 +109,41 @@ def create_expense(relocation_profile_id, phase_id, title, category=None,
         )
         
         session.add(expense)
-        session.commit()
-        
-        amount_display = estimated_amount / 100
-        print(f"✓ Created expense: {expense.title}")
-        print(f"  ID: {expense.id}")
-        print(f"  Amount: {amount_display:.2f} {currency}")
-        
-        expense_id = expense.id
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error creating expense: {e}")
-        raise
-    finally:
-        session.close()
     
-    return get_expense_by_id(expense_id)
+    logger.debug("Created expense %s (ID %s): %s %s", expense.title, expense.id,
+                 estimated_amount / 100, currency)
+    
+    return expense
+
+
+@clears_request_scope
+def create_expenses_bulk(records):
+    """
+    Create many expenses in a single transaction
+    
+    Args:
+        records: List of dicts with the same keys as create_expense arguments
+    
+    Returns:
+        List of created Expense objects (with their IDs populated)
+    """
+    records = list(records)
+    if not records:
+        return []
+    
+    with session_scope() as session:
+        # One multi-row INSERT ... RETURNING, rows in the same order as records
+        statement = insert(Expense).returning(Expense, sort_by_parameter_order=True)
+        expenses = session.scalars(statement, records).all()
+    
+    logger.debug("Created %d expense(s)", len(expenses))
+    
+    return expenses
 
 
 def get_all_expenses(relocation_profile_id=None, phase_id=None, 
-                     payment_status=None, cost_certainty=None):
+                     payment_status=None, cost_certainty=None, eager=False,
+                     limit=None, offset=None):
     """
     Get all expenses, optionally filtered
     
@@ -87,127 +152,195 @@ def get_all_expenses(relocation_profile_id=None, phase_id=None,
         phase_id: Filter by phase
         payment_status: Filter by payment status
         cost_certainty: Filter by cost certainty
+        eager: Also load expense.phase and expense.related_task in the same query
+        limit: Optional - return at most this many expenses
+        offset: Optional - skip this many expenses first
     
     Returns:
         List of Expense objects
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        query = session.query(Expense)
-        
-        if relocation_profile_id:
-            query = query.filter_by(relocation_profile_id=relocation_profile_id)
-        
-        if phase_id:
-            query = query.filter_by(phase_id=phase_id)
+    with session_scope() as session:
+        # Only filter on the arguments that were given
+        filters = {
+            key: value for key, value in (
+                ('relocation_profile_id', relocation_profile_id),
+                ('phase_id', phase_id),
+                ('payment_status', payment_status),
+                ('cost_certainty', cost_certainty),
+            ) if value
+        }
         
-        if payment_status:
-            query = query.filter_by(payment_status=payment_status)
+        query = session.query(Expense).filter_by(**filters)
         
-        if cost_certainty:
-            query = query.filter_by(cost_certainty=cost_certainty)
+        if eager:
+            query = query.options(joinedload(Expense.phase), joinedload(Expense.related_task))
         
-        expenses = query.order_by(Expense.due_date, Expense.title).all()
-        
-        # Load data while session is open
-        result = []
-        for expense in expenses:
-            _ = (expense.id, expense.title, expense.currency)
-            result.append(expense)
-        
-        return result
-    finally:
-        session.close()
+        query = query.order_by(Expense.due_date, Expense.title, Expense.id)
+        return query.limit(limit).offset(offset).all()
+
+
+def count_expenses(relocation_profile_id=None, phase_id=None, payment_status=None):
+    """
+    Count expenses with a single COUNT query, optionally filtered
+    
+    Returns:
+        Number of matching expenses
+    """
+    filters = {
+        key: value for key, value in (
+            ('relocation_profile_id', relocation_profile_id),
+            ('phase_id', phase_id),
+            ('payment_status', payment_status),
+        ) if value
+    }
+    
+    with session_scope() as session:
+        return session.scalar(select(func.count()).select_from(Expense).filter_by(**filters))
 
 
+@scoped_lookup
 def get_expense_by_id(expense_id):
     """Get a specific expense by ID"""
-    engine = get_engine()
-    session = get_session(engine)
+    with session_scope() as session:
+        return session.get(Expense, expense_id)
+
+
+def get_unpaid_expenses_with_overdue(relocation_profile_id=None):
+    """
+    Get unpaid expenses along with whether each one is overdue
+    The overdue flag is computed by the database in the same query
     
-    try:
-        expense = session.query(Expense).filter_by(id=expense_id).first()
-        if expense:
-            _ = (expense.id, expense.title, expense.currency)
-        return expense
-    finally:
-        session.close()
+    Args:
+        relocation_profile_id: Optional - only this profile's expenses
+    
+    Returns:
+        List of (Expense, is_overdue) rows, sorted by due date
+    """
+    with session_scope() as session:
+        query = session.query(Expense, Expense.is_overdue.label('is_overdue')).filter(
+            Expense.payment_status == 'unpaid'
+        )
+        
+        if relocation_profile_id:
+            query = query.filter(Expense.relocation_profile_id == relocation_profile_id)
+        
+        return query.order_by(Expense.due_date, Expense.title).all()
+
 
+def get_expenses_by_ids(expense_ids):
+    """Get several expenses by ID with a single IN query"""
+    expense_ids = list(expense_ids)
+    if not expense_ids:
+        return []
+    
+    with session_scope() as session:
+        return session.query(Expense).filter(Expense.id.in_(expense_ids)).all()
 
+
+@clears_request_scope
 def update_expense(expense_id, **kwargs):
     """Update an existing expense"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        expense = session.query(Expense).filter_by(id=expense_id).first()
+    with session_scope() as session:
+        expense = session.get(Expense, expense_id)
         
         if not expense:
-            print(f"❌ No expense found with ID {expense_id}")
+            logger.warning("No expense found with ID %s", expense_id)
             return None
         
+        updated_fields = []
+        unknown_fields = []
         for key, value in kwargs.items():
-            if hasattr(expense, key):
+            if key in _EXPENSE_COLS:
                 setattr(expense, key, value)
-                print(f"  ✓ Updated {key}")
+                updated_fields.append(key)
             else:
-                print(f"  ⚠️  Unknown field: {key}")
-        
-        session.commit()
-        print(f"\n✓ Expense {expense_id} updated successfully!")
-        
-        expense_id_copy = expense.id
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error updating expense: {e}")
-        raise
-    finally:
-        session.close()
+                unknown_fields.append(key)
     
-    return get_expense_by_id(expense_id_copy)
+    for key in unknown_fields:
+        logger.warning("Unknown expense field: %s", key)
+    logger.debug("Updated expense %s: %s", expense_id, ", ".join(updated_fields))
+    
+    return expense
 
 
+@clears_request_scope
+def update_expense_fast(expense_id, **kwargs):
+    """
+    Update an expense with a single UPDATE statement, without loading it first
+    Use this when the caller doesn't need the updated object back
+    
+    Returns:
+        True if the expense was updated, False if it was not found
+        (or there was nothing to update)
+    """
+    if not kwargs:
+        return False
+    
+    unknown = [key for key in kwargs if key not in _EXPENSE_COLS]
+    if unknown:
+        raise ValueError(f"Unknown expense field(s): {', '.join(unknown)}")
+    
+    with session_scope() as session:
+        updated = session.query(Expense).filter_by(id=expense_id).update(
+            kwargs, synchronize_session=False
+        )
+    
+    if not updated:
+        logger.warning("No expense found with ID %s", expense_id)
+        return False
+    
+    return True
+
+
+@clears_request_scope
 def delete_expense(expense_id):
     """Delete an expense"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        expense = session.query(Expense).filter_by(id=expense_id).first()
+    with session_scope() as session:
+        expense = session.get(Expense, expense_id)
         
         if not expense:
-            print(f"❌ No expense found with ID {expense_id}")
+            logger.warning("No expense found with ID %s", expense_id)
             return False
         
         expense_title = expense.title
         
         session.delete(expense)
-        session.commit()
-        
-        print(f"✓ Deleted expense: {expense_title} (ID: {expense_id})")
-        return True
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error deleting expense: {e}")
-        raise
-    finally:
-        session.close()
+    
+    logger.debug("Deleted expense %s (ID %s)", expense_title, expense_id)
+    return True
 
 
+@clears_request_scope
 def mark_expense_paid(expense_id):
-    """Mark an expense as paid"""
-    return update_expense(expense_id, payment_status='paid')
+    """
+    Mark an expense as paid with a single UPDATE ... RETURNING statement
+    
+    Returns:
+        Updated Expense object, or None if not found or already paid
+    """
+    with session_scope() as session:
+        statement = (
+            update(Expense)
+            # IS DISTINCT FROM, so expenses without a status can be paid too
+            .where(Expense.id == expense_id, Expense.payment_status.is_distinct_from('paid'))
+            .values(payment_status='paid')
+            .returning(Expense)
+        )
+        expense = session.scalars(statement).first()
+    
+    if not expense:
+        logger.warning("No unpaid expense found with ID %s", expense_id)
+        return None
+    
+    logger.debug("Expense %s marked as paid", expense_id)
+    return expense
 
 
 def display_budget_summary(summary):
     """Pretty print budget summary"""
-    print("\n" + "=" * 60)
+    print("\n" + _BAR)
     print("BUDGET SUMMARY")
-    print("=" * 60)
+    print(_BAR)
     print(f"Total Estimated: ${summary['total_estimated']:,.2f}")
     if summary['total_actual'] > 0:
         print(f"Total Actual: ${summary['total_actual']:,.2f}")
@@ -224,103 +357,115 @@ def display_budget_summary(summary):
     if summary['over_budget_count'] > 0:
         print(f"⚠️  {summary['over_budget_count']} over-budget expense(s)")
     
-    print("=" * 60 + "\n")
+    print(_BAR + "\n")
 def get_budget_summary(relocation_profile_id):
     """
     Get budget summary for a profile
+    All totals and counts are aggregated in a single SQL query
     
     Returns:
         Dictionary with budget statistics
     """
-    expenses = get_all_expenses(relocation_profile_id=relocation_profile_id)
-    
-    # Filter to only expenses included in budget
-    budget_expenses = [e for e in expenses if e.include_in_budget]
-    
-    total_estimated = sum(e.estimated_amount for e in budget_expenses) / 100
-    total_actual = sum(e.actual_amount for e in budget_expenses if e.actual_amount) / 100
-    total_paid = sum(
-        (e.actual_amount if e.actual_amount else e.estimated_amount) 
-        for e in budget_expenses if e.payment_status == 'paid'
-    ) / 100
-    
-    remaining = total_estimated - total_paid
-    
-    # Count issues
-    overdue_count = sum(1 for e in budget_expenses if e.is_overdue)
-    unknown_count = sum(1 for e in budget_expenses if e.cost_certainty == 'unknown')
-    over_budget_count = sum(
-        1 for e in budget_expenses 
-        if e.variance and e.variance > 0
-    )
+    # Amount that was actually paid - falls back to the estimate when no actual is known
+    paid_amount = func.coalesce(func.nullif(Expense.actual_amount, 0), Expense.estimated_amount)
+    
+    with session_scope() as session:
+        row = session.query(
+            func.coalesce(func.sum(Expense.estimated_amount), 0),
+            func.coalesce(func.sum(Expense.actual_amount), 0),
+            func.coalesce(func.sum(case((Expense.payment_status == 'paid', paid_amount), else_=0)), 0),
+            func.count(case((Expense.is_overdue, 1))),
+            func.count(case((Expense.cost_certainty == 'unknown', 1))),
+            func.count(case((Expense.variance > 0, 1))),
+            func.count(Expense.id)
+        ).filter(
+            Expense.relocation_profile_id == relocation_profile_id,
+            Expense.include_in_budget == True
+        ).one()
+    
+    (estimated_cents, actual_cents, paid_cents,
+     overdue_count, unknown_count, over_budget_count, total_expenses) = row
+    
+    # Amounts stay in integer cents until the final output
+    remaining_cents = estimated_cents - paid_cents
     
     return {
-        'total_estimated': total_estimated,
-        'total_actual': total_actual,
-        'total_paid': total_paid,
-        'remaining': remaining,
-        'budget_progress_pct': (total_paid / total_estimated * 100) if total_estimated > 0 else 0,
+        'total_estimated': estimated_cents / 100,
+        'total_actual': actual_cents / 100,
+        'total_paid': paid_cents / 100,
+        'remaining': remaining_cents / 100,
+        'budget_progress_pct': (paid_cents * 100 / estimated_cents) if estimated_cents > 0 else 0,
         'overdue_count': overdue_count,
         'unknown_count': unknown_count,
         'over_budget_count': over_budget_count,
-        'total_expenses': len(budget_expenses)
-    }
-def display_expense(expense):
-    """Pretty print an expense"""
-    if not expense:
-        print("No expense found")
-        return
-    
-    # Payment status emoji
-    status_emoji = {
-        'unpaid': '💰',
-        'paid': '✅'
+        'total_expenses': total_expenses
     }
-    
-    emoji = status_emoji.get(expense.payment_status, '❓')
+def format_expense(expense):
+    """Build the display text for an expense (without a trailing newline)"""
+    emoji = _PAYMENT_EMOJI.get(expense.payment_status, '❓')
     
     # Check if overdue
     overdue_flag = " ⚠️ OVERDUE" if expense.is_overdue else ""
     
-    print("\n" + "-" * 60)
-    print(f"{emoji} {expense.title}{overdue_flag}")
-    print("-" * 60)
-    print(f"ID: {expense.id}")
+    lines = [
+        "\n" + _DIV,
+        f"{emoji} {expense.title}{overdue_flag}",
+        _DIV,
+        f"ID: {expense.id}",
+    ]
     
     if expense.category:
-        print(f"Category: {expense.category}")
+        lines.append(f"Category: {expense.category}")
     
     # Amounts
     est_display = expense.estimated_amount / 100
-    print(f"Estimated: {est_display:.2f} {expense.currency}")
+    lines.append(f"Estimated: {est_display:.2f} {expense.currency}")
     
     if expense.actual_amount:
         act_display = expense.actual_amount / 100
-        print(f"Actual: {act_display:.2f} {expense.currency}")
+        lines.append(f"Actual: {act_display:.2f} {expense.currency}")
         
         if expense.variance:
             var_display = expense.variance
             var_symbol = "+" if var_display > 0 else ""
-            print(f"Variance: {var_symbol}{var_display:.2f} {expense.currency}")
+            lines.append(f"Variance: {var_symbol}{var_display:.2f} {expense.currency}")
     
     # Status
-    print(f"Cost Certainty: {expense.cost_certainty.title()}")
-    print(f"Payment Status: {expense.payment_status.title()}")
+    lines.append(f"Cost Certainty: {expense.cost_certainty.title()}")
+    lines.append(f"Payment Status: {expense.payment_status.title()}")
     
     # Dates
     if expense.due_date:
-        print(f"Due Date: {expense.due_date}")
+        lines.append(f"Due Date: {expense.due_date}")
     
     # Budget flags
-    print(f"Include in Budget: {'Yes' if expense.include_in_budget else 'No'}")
-    print(f"One-time Cost: {'Yes' if expense.one_time_relocation_cost else 'No'}")
+    lines.append(f"Include in Budget: {'Yes' if expense.include_in_budget else 'No'}")
+    lines.append(f"One-time Cost: {'Yes' if expense.one_time_relocation_cost else 'No'}")
     
     # References
-    print(f"Phase ID: {expense.phase_id}")
+    lines.append(f"Phase ID: {expense.phase_id}")
     if expense.related_task_id:
-        print(f"Related Task ID: {expense.related_task_id}")
+        lines.append(f"Related Task ID: {expense.related_task_id}")
     
     if expense.notes:
-        print(f"Notes: {expense.notes}")
+        lines.append(f"Notes: {expense.notes}")
+    
+    lines.append(_DIV + "\n")
+    return "\n".join(lines)
+
+
+def display_expense(expense):
+    """Pretty print an expense"""
+    if not expense:
+        print("No expense found")
+        return
     
-    print("-" * 60 + "\n")
\ No newline at end of file
+    print(format_expense(expense))
+
+
+def display_expenses_bulk(expenses, batch_size=50):
+    """
+    Pretty print many expenses, writing them to stdout in batches
+    Returns the number of expenses displayed
+    """
+    return write_batched(expenses, format_expense, batch_size)
\ No newline at end of file
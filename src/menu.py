@@ -3,58 +3,184 @@ Interactive menu system for Relocation OS
 Handles user input and navigation
 """
 
-from datetime import datetime
+import os
+import re
+import shutil
+import sys
+import threading
+from datetime import date
+from operator import attrgetter
+
+# Optional - gives terminal prompts line editing and history (not on Windows)
+try:
+    import readline
+except ImportError:
+    readline = None
+
 from database import (
     create_relocation_profile, 
-    get_all_profiles, 
+    get_all_profiles,
     get_profile_by_id,
     display_profile,
-    update_relocation_profile,
+    display_profiles_bulk,
+    update_relocation_profile_fast,
     delete_relocation_profile
 )
 from phase_operations import (
     create_phase,
+    create_phases_bulk,
+    DEFAULT_PHASES,
     get_all_phases,
     get_phase_by_id,
-    update_phase,
+    update_phase_fast,
     delete_phase,
-    display_phase
+    display_phase,
+    display_phases_bulk
 )
 from task_operations import (
     create_task,
+    create_tasks_bulk,
     get_all_tasks,
     get_task_by_id,
     update_task,
     delete_task,
     mark_task_completed,
-    display_task
+    display_task,
+    display_tasks_bulk
 )
 from expense_operations import (
     create_expense,
-    get_all_expenses,
-    get_expense_by_id,
     update_expense,
     delete_expense,
+    get_all_expenses,
     mark_expense_paid,
     get_budget_summary,
+    parse_amount_cents,
     display_expense,
+    display_expenses_bulk,
     display_budget_summary
 )
-from currency_service import get_exchange_rate, get_manual_exchange_rate, format_currency
+from models import init_database
+from request_scope import request_scope
+from menu_cache import (
+    cached_profile_summaries,
+    cached_phase_summaries,
+    cached_task_summaries,
+    cached_all_expenses,
+    cached_unpaid_expenses,
+    invalidate_profiles,
+    invalidate_phases,
+    invalidate_tasks,
+    invalidate_expenses,
+    warm_up
+)
+
+# Screen pieces built once instead of on every call
+_CLEAR = "\x1b[2J\x1b[H"  # ANSI: clear screen and move cursor to top-left
+_BAR = "=" * 60
+_DIV = "-" * 60
+_HEADER_TOP = f"\n{_BAR}\n  "
+_HEADER_BOT = f"\n{_BAR}\n\n"
+
+# Layout accepted by get_date_input
+_ISO_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+# ISO 4217 codes accepted wherever a currency is typed in
+_VALID_CURRENCIES = frozenset("""
+AED AFN ALL AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BHD BIF BMD BND BOB BRL BSD BTN BWP
+BYN BZD CAD CDF CHF CLP CNY COP CRC CUP CVE CZK DJF DKK DOP DZD EGP ERN ETB EUR FJD FKP GBP GEL
+GHS GIP GMD GNF GTQ GYD HKD HNL HTG HUF IDR ILS INR IQD IRR ISK JMD JOD JPY KES KGS KHR KMF KPW
+KRW KWD KYD KZT LAK LBP LKR LRD LSL LYD MAD MDL MGA MKD MMK MNT MOP MRU MUR MVR MWK MXN MYR MZN
+NAD NGN NIO NOK NPR NZD OMR PAB PEN PGK PHP PKR PLN PYG QAR RON RSD RUB RWF SAR SBD SCR SDG SEK
+SGD SHP SLE SOS SRD SSP STN SVC SYP SZL THB TJS TMT TND TOP TRY TTD TWD TZS UAH UGX USD UYU UZS
+VES VND VUV WST XAF XCD XOF XPF YER ZAR ZMW ZWL
+""".split())
+
+# Numbered menu choices for task status and cost certainty
+_STATUS_CHOICES = {'1': 'not_started', '2': 'in_progress', '3': 'completed'}
+_CERTAINTY_CHOICES = {'1': 'unknown', '2': 'estimated', '3': 'confirmed'}
+_TASK_EMOJI = {'not_started': '⏸️', 'in_progress': '🔄', 'completed': '✅'}
+
+# Accepted answers for yes/no prompts
+_YES_NO = {
+    **dict.fromkeys(('y', 'yes', 'yeah', 'yep', 'true', '1'), True),
+    **dict.fromkeys(('n', 'no', 'nope', 'false', '0'), False),
+}
+
+# Rows shown per page in long listings - RELOC_PAGE_SIZE overrides it (max 500)
+try:
+    PAGE_SIZE = min(max(int(os.environ.get('RELOC_PAGE_SIZE', 25)), 1), 500)
+except ValueError:
+    PAGE_SIZE = 25
+
+# Prompt history kept between runs when readline is available
+HISTORY_FILE = os.path.expanduser(os.environ.get('RELOC_HISTORY_FILE', '~/.relocation_os_history'))
+HISTORY_LENGTH = 1000
+
+
+class ScreenBuffer:
+    """Collects the lines of a screen so they are written with a single call"""
+    
+    def __init__(self):
+        self._lines = []
+    
+    def add(self, line: str = "") -> None:
+        """Queue one line of output"""
+        self._lines.append(line)
+    
+    def flush(self) -> None:
+        """Write all queued lines at once"""
+        if self._lines:
+            sys.stdout.write("\n".join(self._lines) + "\n")
+            self._lines = []
+
 
-def clear_screen():
+def _enable_windows_ansi() -> None:
+    """Windows consoles only understand ANSI escapes once VT processing is switched on"""
+    import ctypes
+    
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    mode = ctypes.c_uint32()
+    if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+        kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+
+
+def clear_screen() -> None:
     """Clear the terminal screen"""
-    print("\n" * 50)  # Simple way to "clear" by printing blank lines
+    if sys.stdout.isatty():
+        sys.stdout.write(_CLEAR)
+        # No newline in the escape, so line buffering won't send it by itself
+        sys.stdout.flush()
+    else:
+        # Not a terminal (e.g. piped output) - push old output out of view instead
+        sys.stdout.write("\n" * shutil.get_terminal_size().lines)
 
 
-def print_header(title):
+def print_header(title: str) -> None:
     """Print a nice header"""
-    print("\n" + "=" * 60)
-    print(f"  {title}")
-    print("=" * 60 + "\n")
+    sys.stdout.write(_HEADER_TOP + title + _HEADER_BOT)
 
 
-def get_date_input(prompt):
+def _prompt(message: str) -> str:
+    """
+    Show a prompt and read one line from stdin
+    On a terminal with readline available, input() is used so the user gets
+    line editing and history; otherwise the prompt is written directly
+    """
+    if readline is not None and sys.stdin.isatty():
+        return input(message)
+    
+    sys.stdout.write(message)
+    # Prompts don't end in a newline, so line buffering won't flush them
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
+def get_date_input(prompt: str) -> date | None:
     """
     Get a date from the user
     
@@ -66,18 +192,77 @@ def get_date_input(prompt):
     """
     print(prompt)
     print("Format: YYYY-MM-DD (e.g., 2026-06-15)")
-    date_str = input("Enter date: ").strip()
+    date_str = _prompt("Enter date: ").strip()
     
     try:
-        # Parse the date string
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
+        # fromisoformat also accepts other ISO layouts, so check for YYYY-MM-DD first
+        if not _ISO_DATE.fullmatch(date_str):
+            raise ValueError(date_str)
+        
+        date_obj = date.fromisoformat(date_str)
         return date_obj
     except ValueError:
         print("❌ Invalid date format. Please use YYYY-MM-DD")
         return None
 
 
-def get_yes_no_input(prompt):
+def safe_int(prompt: str, default: int | None = None, min_value: int | None = None,
+             max_value: int | None = None,
+             error: str | None = "❌ Please enter a valid number") -> int | None:
+    """
+    Ask for a whole number
+    The answer is checked up front instead of catching int()'s ValueError
+    
+    Args:
+        prompt: The message to show the user
+        default: Returned when the answer is empty (otherwise an empty answer is rejected)
+        min_value: Optional smallest accepted value
+        max_value: Optional largest accepted value
+        error: Printed when the answer is rejected (None to stay quiet)
+    
+    Returns:
+        The number, default for an empty answer, or None if it was rejected
+    """
+    raw = _prompt(prompt).strip()
+    if not raw and default is not None:
+        return default
+    
+    digits = raw[1:] if raw.startswith('-') else raw
+    if digits.isdecimal():
+        value = int(raw)
+        if (min_value is None or value >= min_value) and (max_value is None or value <= max_value):
+            return value
+    
+    if error:
+        print(error)
+    return None
+
+
+def pick_from(rows, prompt: str, noun: str, get_id=attrgetter('id')):
+    """
+    Ask for the ID of one of the rows just listed
+    The ID is checked against the list, so an unknown ID costs no query
+    
+    Args:
+        rows: The rows that were shown to the user
+        prompt: The message to show the user
+        noun: What the rows are, for the error message (e.g. "task")
+        get_id: Function returning a row's ID (defaults to row.id)
+    
+    Returns:
+        The picked row, or None
+    """
+    item_id = safe_int(prompt)
+    if item_id is None:
+        return None
+    
+    row = next((r for r in rows if get_id(r) == item_id), None)
+    if row is None:
+        print(f"❌ No {noun} found with ID {item_id}")
+    return row
+
+
+def get_yes_no_input(prompt: str) -> bool:
     """
     Get a yes/no answer from the user
     
@@ -87,15 +272,255 @@ def get_yes_no_input(prompt):
     Returns:
         True for yes, False for no
     """
+    question = f"{prompt} (y/n): "
     while True:
-        answer = input(f"{prompt} (y/n): ").strip().lower()
-        if answer in ['y', 'yes']:
-            return True
-        elif answer in ['n', 'no']:
-            return False
-        else:
-            print("Please enter 'y' or 'n'")
-def get_currency_amount(prompt):
+        answer = _YES_NO.get(_prompt(question).strip().lower())
+        if answer is not None:
+            return answer
+        print("Please enter 'y' or 'n'")
+
+
+def paginate(fetch_page, page_size=PAGE_SIZE):
+    """
+    Yield a listing one page at a time, asking the user where to go next
+    
+    Args:
+        fetch_page: Function taking limit and offset, returning that slice of rows
+        page_size: Number of rows per page
+    
+    Yields:
+        Lists of at most page_size rows
+    """
+    offset = 0
+    while True:
+        # One extra row tells us whether there is a next page
+        rows = fetch_page(limit=page_size + 1, offset=offset)
+        if not rows and offset:
+            print("⚠️  No entries on that page")
+            offset = 0
+            continue
+        
+        has_next = len(rows) > page_size
+        yield rows[:page_size]
+        
+        # Everything fitted on one page - nothing to navigate
+        if not has_next and not offset:
+            return
+        
+        page = offset // page_size + 1
+        while True:
+            choice = _prompt(f"Page {page} - [N]ext / [P]rev / [J]ump / [Q]uit: ").strip().lower()
+            if choice in ('', 'q'):
+                return
+            if choice == 'n' and has_next:
+                offset += page_size
+                break
+            if choice == 'p' and offset:
+                offset -= page_size
+                break
+            if choice == 'j':
+                page_number = safe_int("Page number: ", min_value=1)
+                if page_number is not None:
+                    offset = (page_number - 1) * page_size
+                    break
+                continue
+            print("❌ Invalid choice")
+
+
+def _print_paged(rows, format_row):
+    """Print a list that's already in memory one page at a time"""
+    for page in paginate(lambda limit, offset: rows[offset:offset + limit]):
+        print("\n".join(format_row(row) for row in page))
+
+
+# One line of an expense pick list - the format string is parsed once, not per row
+_EXPENSE_ROW = "  ID {e.id}: {icon}{e.title} ({amount:.2f} {e.currency}){flag}".format
+_PAYMENT_ICON = {'paid': '✅ ', 'unpaid': '💰 '}
+
+
+def _expense_row(expense, icon='', flag=''):
+    """Format an expense for a pick list, showing the actual amount if known"""
+    amount = (expense.actual_amount or expense.estimated_amount) / 100
+    return _EXPENSE_ROW(e=expense, icon=icon, amount=amount, flag=flag)
+
+
+def pick_profile(prompt: str = "Enter profile ID: "):
+    """
+    List the profiles and ask the user to pick one
+    
+    Returns:
+        The picked profile's summary row (id, relocation_name, origin_country,
+        destination_country, primary_currency), or None
+    """
+    profiles = cached_profile_summaries()
+    if not profiles:
+        print("❌ No profiles found. Create a profile first!")
+        return None
+    
+    print("\nAvailable profiles:")
+    _print_paged(profiles, lambda p: (
+        f"  ID {p.id}: {p.relocation_name} ({p.origin_country} → {p.destination_country})"
+    ))
+    print()
+    
+    return pick_from(profiles, prompt, "profile")
+
+
+def pick_phase(prompt: str = "Enter phase ID: ", relocation_profile_id: int | None = None):
+    """
+    List the phases (optionally only one profile's) and ask the user to pick one
+    
+    Returns:
+        The picked phase's summary row (id, name, relocation_profile_id,
+        relative_start_month, relative_end_month), or None
+    """
+    phases = cached_phase_summaries(relocation_profile_id=relocation_profile_id)
+    if not phases:
+        print("❌ No phases found. Create a phase first!")
+        return None
+    
+    print("\nAvailable phases:")
+    _print_paged(phases, lambda p: (
+        f"  ID {p.id}: {p.name} (Months {p.relative_start_month} to {p.relative_end_month}, "
+        f"Profile ID: {p.relocation_profile_id})"
+    ))
+    print()
+    
+    return pick_from(phases, prompt, "phase")
+
+
+def _optional_currency(value: str) -> str | None:
+    """Parse an optional currency code, where an empty answer or 'none' means None"""
+    value = value.upper()
+    if value in ("", "NONE"):
+        return None
+    if value not in _VALID_CURRENCIES:
+        raise ValueError(value)
+    return value
+
+
+def _required(value: str) -> str:
+    """Parse a field that can't be left empty"""
+    if not value:
+        raise ValueError("required")
+    return value
+
+
+def _optional(value: str) -> str | None:
+    """Parse a field where an empty answer means None"""
+    return value or None
+
+
+def _currency_code(value: str) -> str:
+    """Parse an ISO currency code, defaulting to USD"""
+    value = value.upper() if value else "USD"
+    if value not in _VALID_CURRENCIES:
+        raise ValueError(value)
+    return value
+
+
+# Simple update prompts as (field, label, parser, message when parsing fails)
+_PROFILE_ROUTE_FIELDS = (
+    ('relocation_name', "Relocation name", str, None),
+    ('origin_country', "Origin country", str, None),
+    ('destination_country', "Destination country", str, None),
+)
+_PROFILE_FAMILY_FIELDS = (
+    ('family_size', "Family size", int, "Invalid number for family size"),
+    ('number_of_children', "Number of children", int, "Invalid number for children"),
+)
+_PROFILE_CURRENCY_FIELDS = (
+    ('primary_currency', "Primary currency", _currency_code, "Unknown currency code"),
+    ('secondary_currency', "Secondary currency", _optional_currency, "Unknown currency code"),
+)
+_PHASE_FIELDS = (
+    ('name', "Phase name", str, None),
+    ('relative_start_month', "Start month", int, "Invalid number for start month"),
+    ('relative_end_month', "End month", int, "Invalid number for end month"),
+    ('order_index', "Order index", int, "Invalid number for order index"),
+)
+
+# Create forms as (field, prompt, parser, message when parsing fails)
+_PROFILE_ROUTE_FORM = (
+    ('relocation_name', "Relocation name (e.g., 'Moving to Portugal'): ", _required,
+     "Relocation name is required!"),
+    ('origin_country', "Origin country: ", _required, "Origin country is required!"),
+    ('destination_country', "Destination country: ", _required, "Destination country is required!"),
+)
+_PROFILE_FAMILY_FORM = (
+    ('family_size', "Family size (number of people): ", lambda v: int(v or "1"),
+     "Please enter valid numbers!"),
+    ('number_of_children', "Number of children: ", lambda v: int(v or "0"),
+     "Please enter valid numbers!"),
+)
+_PROFILE_CURRENCY_FORM = (
+    ('primary_currency', "Primary currency (3-letter code, e.g., USD, EUR): ", _currency_code,
+     "Currency must be a valid 3-letter code!"),
+    ('secondary_currency', "Secondary currency (optional, press Enter to skip): ",
+     _optional_currency, "Currency must be a valid 3-letter code!"),
+)
+_NOTES_FORM = (
+    ('notes', "Notes (optional): ", _optional, None),
+)
+_PHASE_NAME_FORM = (
+    ('name', "Phase name (e.g., 'Pre-departure Planning'): ", _required, "Phase name is required!"),
+)
+_PHASE_TIMELINE_FORM = (
+    ('relative_start_month', "Start month: ", int, "Please enter valid numbers!"),
+    ('relative_end_month', "End month: ", int, "Please enter valid numbers!"),
+    ('order_index', "Order index (for sorting, e.g., 1, 2, 3...): ", int, "Please enter valid numbers!"),
+)
+_DESCRIPTION_FORM = (
+    ('description', "Description (optional): ", _optional, None),
+)
+
+
+def _collect_updates(current: object, fields: tuple) -> dict:
+    """
+    Prompt for each field in a spec, showing the current value
+    An empty answer keeps the current value
+    
+    Args:
+        current: Object holding the current values
+        fields: Tuple of (field, label, parser, invalid message) entries
+    
+    Returns:
+        Dictionary of field -> new value for the fields that were changed
+    """
+    updates = {}
+    for field, label, parser, invalid_message in fields:
+        raw = _prompt(f"{label} [{getattr(current, field)}]: ").strip()
+        if not raw:
+            continue
+        try:
+            updates[field] = parser(raw)
+        except ValueError:
+            print(f"⚠️  {invalid_message}, skipping")
+    return updates
+
+
+def collect_form(fields: tuple, values: dict | None = None) -> dict | None:
+    """
+    Prompt for each field in a form spec, one after another
+    
+    Args:
+        fields: Tuple of (field, prompt, parser, invalid message) entries
+        values: Optional dictionary to add the answers to
+    
+    Returns:
+        Dictionary of field -> parsed value, or None as soon as an answer is rejected
+    """
+    values = {} if values is None else values
+    for field, prompt, parser, invalid_message in fields:
+        try:
+            values[field] = parser(_prompt(prompt).strip())
+        except ValueError:
+            print(f"❌ {invalid_message}")
+            return None
+    return values
+
+
+def get_currency_amount(prompt: str) -> int | None:
     """
     Get a currency amount from user and convert to cents
     
@@ -106,15 +531,11 @@ def get_currency_amount(prompt):
         Amount in cents (integer) or None if invalid
     """
     try:
-        amount_str = input(f"{prompt} (e.g., 123.45): ").strip()
+        amount_str = _prompt(f"{prompt} (e.g., 123.45): ").strip()
         if not amount_str:
             return None
         
-        # Convert to float, then to cents
-        amount_float = float(amount_str)
-        amount_cents = int(amount_float * 100)
-        
-        return amount_cents
+        return parse_amount_cents(amount_str)
     except ValueError:
         print("❌ Invalid amount format")
         return None
@@ -124,64 +545,54 @@ def menu_create_profile():
     print_header("Create New Relocation Profile")
     
     # Get basic information
-    relocation_name = input("Relocation name (e.g., 'Moving to Portugal'): ").strip()
-    if not relocation_name:
-        print("❌ Relocation name is required!")
-        return
-    
-    origin_country = input("Origin country: ").strip()
-    if not origin_country:
-        print("❌ Origin country is required!")
-        return
-    
-    destination_country = input("Destination country: ").strip()
-    if not destination_country:
-        print("❌ Destination country is required!")
+    form = collect_form(_PROFILE_ROUTE_FORM)
+    if form is None:
         return
     
     # Get target arrival date
     target_date = None
     while not target_date:
         target_date = get_date_input("\nTarget arrival date:")
+    form['target_arrival_date'] = target_date
     
     # Get family details
     print("\nFamily Details:")
-    try:
-        family_size = int(input("Family size (number of people): ").strip() or "1")
-        number_of_children = int(input("Number of children: ").strip() or "0")
-    except ValueError:
-        print("❌ Please enter valid numbers!")
+    if collect_form(_PROFILE_FAMILY_FORM, form) is None:
         return
     
-    pets = get_yes_no_input("Do you have pets?")
+    form['pets'] = get_yes_no_input("Do you have pets?")
     
     # Get currency settings
     print("\nCurrency Settings:")
-    primary_currency = input("Primary currency (3-letter code, e.g., USD, EUR): ").strip().upper() or "USD"
-    secondary_currency = input("Secondary currency (optional, press Enter to skip): ").strip().upper()
-    if not secondary_currency:
-        secondary_currency = None
+    if collect_form(_PROFILE_CURRENCY_FORM, form) is None:
+        return
+    
+    if form['secondary_currency'] and form['secondary_currency'] != form['primary_currency']:
+        # Warm the rate cache while the user finishes the form - not waited on here
+        from currency_service import prefetch_exchange_rate
+        prefetch_exchange_rate(form['secondary_currency'], form['primary_currency'])
     
     # Get notes
     print("\nAdditional Information:")
-    notes = input("Notes (optional): ").strip()
-    if not notes:
-        notes = None
+    collect_form(_NOTES_FORM, form)
     
     # Confirm before creating
-    print("\n" + "-" * 60)
-    print("REVIEW YOUR INFORMATION:")
-    print(f"  Name: {relocation_name}")
-    print(f"  Route: {origin_country} → {destination_country}")
-    print(f"  Target Arrival: {target_date}")
-    print(f"  Family Size: {family_size} ({number_of_children} children)")
-    print(f"  Pets: {'Yes' if pets else 'No'}")
-    print(f"  Primary Currency: {primary_currency}")
-    if secondary_currency:
-        print(f"  Secondary Currency: {secondary_currency}")
-    if notes:
-        print(f"  Notes: {notes}")
-    print("-" * 60)
+    lines = [
+        "\n" + _DIV,
+        "REVIEW YOUR INFORMATION:",
+        f"  Name: {form['relocation_name']}",
+        f"  Route: {form['origin_country']} → {form['destination_country']}",
+        f"  Target Arrival: {form['target_arrival_date']}",
+        f"  Family Size: {form['family_size']} ({form['number_of_children']} children)",
+        f"  Pets: {'Yes' if form['pets'] else 'No'}",
+        f"  Primary Currency: {form['primary_currency']}",
+    ]
+    if form['secondary_currency']:
+        lines.append(f"  Secondary Currency: {form['secondary_currency']}")
+    if form['notes']:
+        lines.append(f"  Notes: {form['notes']}")
+    lines.append(_DIV)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     if not get_yes_no_input("\nCreate this profile?"):
         print("❌ Profile creation cancelled")
@@ -189,80 +600,71 @@ def menu_create_profile():
     
     # Create the profile
     try:
-        profile = create_relocation_profile(
-            relocation_name=relocation_name,
-            origin_country=origin_country,
-            destination_country=destination_country,
-            target_arrival_date=target_date,
-            family_size=family_size,
-            number_of_children=number_of_children,
-            pets=pets,
-            primary_currency=primary_currency,
-            secondary_currency=secondary_currency,
-            notes=notes
-        )
+        profile = create_relocation_profile(**form)
+        invalidate_profiles()
         print("\n✅ Profile created successfully!")
         display_profile(profile)
     except Exception as e:
         print(f"\n❌ Error creating profile: {e}")
+        return
+    
+    # Shortcut for the most common next step
+    if get_yes_no_input("Create the default phases for this profile now?"):
+        menu_create_default_phases(profile.id)
+
+
+def menu_create_default_phases(profile_id):
+    """Create the standard set of phases for a profile in one go"""
+    try:
+        phases = create_phases_bulk(profile_id, DEFAULT_PHASES)
+        invalidate_phases()
+    except Exception as e:
+        print(f"\n❌ Error creating phases: {e}")
+        return
+    
+    _print_paged(phases, lambda p: (
+        f"  ID {p.id}: {p.name} (Months {p.relative_start_month} to {p.relative_end_month})"
+    ))
 
 
 def menu_view_all_profiles():
     """Display all relocation profiles"""
     print_header("All Relocation Profiles")
     
-    profiles = get_all_profiles()
+    # Only one page of profiles is loaded at a time
+    count = 0
+    for page in paginate(get_all_profiles):
+        count += display_profiles_bulk(page)
     
-    if not profiles:
+    if not count:
         print("No profiles found. Create one first!")
-        return
-    
-    print(f"Total profiles: {len(profiles)}\n")
-    
-    for profile in profiles:
-        display_profile(profile)
 
 
 def menu_view_profile_by_id():
     """View a specific profile by ID"""
     print_header("View Profile by ID")
     
-    try:
-        profile_id = int(input("Enter profile ID: ").strip())
-        profile = get_profile_by_id(profile_id)
-        
-        if profile:
-            display_profile(profile)
-        else:
-            print(f"❌ No profile found with ID {profile_id}")
-    except ValueError:
-        print("❌ Please enter a valid number")
+    profile_id = safe_int("Enter profile ID: ")
+    if profile_id is None:
+        return
+    
+    profile = get_profile_by_id(profile_id)
+    if profile:
+        display_profile(profile)
+    else:
+        print(f"❌ No profile found with ID {profile_id}")
 def menu_update_profile():
     """Update an existing profile"""
     print_header("Update Relocation Profile")
     
-    # First, show all profiles so user knows the IDs
-    profiles = get_all_profiles()
-    if not profiles:
-        print("No profiles found. Create one first!")
+    # Only the picked profile is loaded in full
+    picked = pick_profile("Enter profile ID to update: ")
+    if not picked:
         return
-    
-    print("Available profiles:")
-    for p in profiles:
-        print(f"  ID {p.id}: {p.relocation_name} ({p.origin_country} → {p.destination_country})")
-    
-    print()
-    
-    # Get profile ID to update
-    try:
-        profile_id = int(input("Enter profile ID to update: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    # Check if profile exists
+    profile_id = picked.id
     profile = get_profile_by_id(profile_id)
     if not profile:
+        # Deleted since the cached list was loaded
         print(f"❌ No profile found with ID {profile_id}")
         return
     
@@ -272,24 +674,10 @@ def menu_update_profile():
     
     # Ask what to update
     print("What would you like to update? (Press Enter to skip a field)")
-    print("-" * 60)
-    
-    updates = {}
+    print(_DIV)
     
-    # Relocation name
-    new_name = input(f"Relocation name [{profile.relocation_name}]: ").strip()
-    if new_name:
-        updates['relocation_name'] = new_name
-    
-    # Origin country
-    new_origin = input(f"Origin country [{profile.origin_country}]: ").strip()
-    if new_origin:
-        updates['origin_country'] = new_origin
-    
-    # Destination country
-    new_dest = input(f"Destination country [{profile.destination_country}]: ").strip()
-    if new_dest:
-        updates['destination_country'] = new_dest
+    # Name and route
+    updates = _collect_updates(profile, _PROFILE_ROUTE_FIELDS)
     
     # Target date
     print(f"Target arrival date [{profile.target_arrival_date}]")
@@ -297,42 +685,21 @@ def menu_update_profile():
     if new_date:
         updates['target_arrival_date'] = new_date
     
-    # Family size
-    new_family = input(f"Family size [{profile.family_size}]: ").strip()
-    if new_family:
-        try:
-            updates['family_size'] = int(new_family)
-        except ValueError:
-            print("⚠️  Invalid number for family size, skipping")
-    
-    # Children
-    new_children = input(f"Number of children [{profile.number_of_children}]: ").strip()
-    if new_children:
-        try:
-            updates['number_of_children'] = int(new_children)
-        except ValueError:
-            print("⚠️  Invalid number for children, skipping")
+    # Family size and children
+    updates.update(_collect_updates(profile, _PROFILE_FAMILY_FIELDS))
     
     # Pets
     current_pets = "Yes" if profile.pets else "No"
     if get_yes_no_input(f"Update pets? (currently: {current_pets})"):
         updates['pets'] = get_yes_no_input("Do you have pets?")
     
-    # Primary currency
-    new_currency = input(f"Primary currency [{profile.primary_currency}]: ").strip().upper()
-    if new_currency:
-        updates['primary_currency'] = new_currency
-    
-    # Secondary currency
-    current_secondary = profile.secondary_currency or "None"
-    new_secondary = input(f"Secondary currency [{current_secondary}]: ").strip().upper()
-    if new_secondary:
-        updates['secondary_currency'] = new_secondary if new_secondary != "NONE" else None
+    # Currencies
+    updates.update(_collect_updates(profile, _PROFILE_CURRENCY_FIELDS))
     
     # Notes
     print(f"Current notes: {profile.notes or 'None'}")
     if get_yes_no_input("Update notes?"):
-        new_notes = input("Enter new notes: ").strip()
+        new_notes = _prompt("Enter new notes: ").strip()
         updates['notes'] = new_notes if new_notes else None
     
     # Check if any updates were made
@@ -341,69 +708,53 @@ def menu_update_profile():
         return
     
     # Confirm updates
-    print("\n" + "-" * 60)
-    print("FIELDS TO UPDATE:")
+    screen = ScreenBuffer()
+    screen.add("\n" + _DIV)
+    screen.add("FIELDS TO UPDATE:")
     for key, value in updates.items():
-        print(f"  {key}: {value}")
-    print("-" * 60)
+        screen.add(f"  {key}: {value}")
+    screen.add(_DIV)
+    screen.flush()
     
     if not get_yes_no_input("\nApply these updates?"):
         print("❌ Update cancelled")
         return
     
     # Apply updates
-    updated_profile = update_relocation_profile(profile_id, **updates)
+    # All collected changes go out as one UPDATE - the profile isn't loaded again
+    updated = update_relocation_profile_fast(profile_id, **updates)
+    invalidate_profiles()
     
-    if updated_profile:
+    if updated:
+        for key, value in updates.items():
+            setattr(profile, key, value)
         print("\n✅ Profile updated successfully!")
-        display_profile(updated_profile)
+        display_profile(profile)
 
 
 def menu_delete_profile():
     """Delete a profile"""
     print_header("Delete Relocation Profile")
     
-    # Show all profiles
-    profiles = get_all_profiles()
-    if not profiles:
-        print("No profiles found.")
-        return
-    
-    print("Available profiles:")
-    for p in profiles:
-        print(f"  ID {p.id}: {p.relocation_name} ({p.origin_country} → {p.destination_country})")
-    
-    print()
-    
-    # Get profile ID to delete
-    try:
-        profile_id = int(input("Enter profile ID to delete: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
+    # Only the picked profile is loaded in full
+    picked = pick_profile("Enter profile ID to delete: ")
+    if not picked:
         return
-    
-    # Get and show the profile
+    profile_id = picked.id
     profile = get_profile_by_id(profile_id)
-    if not profile:
-        print(f"❌ No profile found with ID {profile_id}")
-        return
     
     print("\nProfile to delete:")
     display_profile(profile)
     
-    # Confirm deletion
+    # Confirm deletion - typing the word replaces the old double yes/no
     print("⚠️  WARNING: This cannot be undone!")
-    if not get_yes_no_input("Are you sure you want to delete this profile?"):
-        print("❌ Deletion cancelled")
-        return
-    
-    # Double confirmation
-    if not get_yes_no_input("Really delete? This is your last chance!"):
+    if _prompt("Type DELETE to confirm: ").strip() != "DELETE":
         print("❌ Deletion cancelled")
         return
     
     # Delete it
     if delete_relocation_profile(profile_id):
+        invalidate_profiles()
         print("\n✅ Profile deleted successfully")
     else:
         print("\n❌ Failed to delete profile")
@@ -411,339 +762,45 @@ def menu_create_phase():
     """Create a new phase for a relocation profile"""
     print_header("Create New Relocation Phase")
     
-    # First, show all profiles so user can choose
-    profiles = get_all_profiles()
-    if not profiles:
-        print("❌ No profiles found. Create a profile first!")
-        return
-    
-    print("Available profiles:")
-    for p in profiles:
-        print(f"  ID {p.id}: {p.relocation_name}")
-    
-    print()
-    
-    # Get profile ID
-    try:
-        profile_id = int(input("Enter profile ID for this phase: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    # Verify profile exists
-    profile = get_profile_by_id(profile_id)
+    profile = pick_profile("Enter profile ID for this phase: ")
     if not profile:
-        print(f"❌ No profile found with ID {profile_id}")
         return
+    profile_id = profile.id
     
     print(f"\nCreating phase for: {profile.relocation_name}")
-    print("-" * 60)
+    print(_DIV)
     
     # Get phase details
-    name = input("Phase name (e.g., 'Pre-departure Planning'): ").strip()
-    if not name:
-        print("❌ Phase name is required!")
+    form = collect_form(_PHASE_NAME_FORM)
+    if form is None:
         return
     
-    print("\nTimeline (in months relative to target arrival date):")
-    print("  Example: -6 means 6 months before arrival")
-    print("  Example: 0 means the arrival month")
-    print("  Example: 3 means 3 months after arrival")
+    print("\nTimeline (in months relative to target arrival date):\n"
+          "  Example: -6 means 6 months before arrival\n"
+          "  Example: 0 means the arrival month\n"
+          "  Example: 3 means 3 months after arrival")
     
-    try:
-        start_month = int(input("Start month: ").strip())
-        end_month = int(input("End month: ").strip())
-        
-        if start_month >= end_month:
-            print("❌ Start month must be before end month!")
-            return
-        
-        order_index = int(input("Order index (for sorting, e.g., 1, 2, 3...): ").strip())
-        
-    except ValueError:
-        print("❌ Please enter valid numbers!")
+    if collect_form(_PHASE_TIMELINE_FORM, form) is None:
         return
     
-    description = input("Description (optional): ").strip()
-    if not description:
-        description = None
-    
-    # Confirm
-    print("\n" + "-" * 60)
-    print("REVIEW PHASE:")
-    print(f"  Name: {name}")
-    print(f"  Timeline: Month {start_month} to {end_month}")
-    print(f"  Order: {order_index}")
-    if description:
-        print(f"  Description: {description}")
-    print("-" * 60)
-    
-    if not get_yes_no_input("\nCreate this phase?"):
-        print("❌ Phase creation cancelled")
+    if form['relative_start_month'] >= form['relative_end_month']:
+        print("❌ Start month must be before end month!")
         return
     
-    # Create the phase
-    try:
-        phase = create_phase(
-            relocation_profile_id=profile_id,
-            name=name,
-            relative_start_month=start_month,
-            relative_end_month=end_month,
-            order_index=order_index,
-            description=description
-        )
-        print("\n✅ Phase created successfully!")
-        display_phase(phase)
-    except Exception as e:
-        print(f"\n❌ Error creating phase: {e}")
-
-
-def menu_view_all_phases():
-    """View all phases, optionally filtered by profile"""
-    print_header("View Relocation Phases")
-    
-    # Ask if they want to filter by profile
-    if get_yes_no_input("Filter by specific profile?"):
-        profiles = get_all_profiles()
-        if not profiles:
-            print("❌ No profiles found")
-            return
-        
-        print("\nAvailable profiles:")
-        for p in profiles:
-            print(f"  ID {p.id}: {p.relocation_name}")
-        
-        try:
-            profile_id = int(input("\nEnter profile ID: ").strip())
-            phases = get_all_phases(relocation_profile_id=profile_id)
-        except ValueError:
-            print("❌ Invalid profile ID")
-            return
-    else:
-        phases = get_all_phases()
-    
-    if not phases:
-        print("No phases found.")
-        return
-    
-    print(f"\nTotal phases: {len(phases)}\n")
-    
-    for phase in phases:
-        display_phase(phase)
-
-
-def menu_update_phase():
-    """Update an existing phase"""
-    print_header("Update Relocation Phase")
-    
-    # Show all phases
-    phases = get_all_phases()
-    if not phases:
-        print("No phases found.")
-        return
-    
-    print("Available phases:")
-    for p in phases:
-        print(f"  ID {p.id}: {p.name} (Profile ID: {p.relocation_profile_id})")
-    
-    print()
-    
-    # Get phase ID
-    try:
-        phase_id = int(input("Enter phase ID to update: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    # Get the phase
-    phase = get_phase_by_id(phase_id)
-    if not phase:
-        print(f"❌ No phase found with ID {phase_id}")
-        return
-    
-    # Show current phase
-    print("\nCurrent phase:")
-    display_phase(phase)
-    
-    # Ask what to update
-    print("What would you like to update? (Press Enter to skip)")
-    print("-" * 60)
-    
-    updates = {}
-    
-    # Name
-    new_name = input(f"Phase name [{phase.name}]: ").strip()
-    if new_name:
-        updates['name'] = new_name
-    
-    # Start month
-    new_start = input(f"Start month [{phase.relative_start_month}]: ").strip()
-    if new_start:
-        try:
-            updates['relative_start_month'] = int(new_start)
-        except ValueError:
-            print("⚠️  Invalid number for start month, skipping")
-    
-    # End month
-    new_end = input(f"End month [{phase.relative_end_month}]: ").strip()
-    if new_end:
-        try:
-            updates['relative_end_month'] = int(new_end)
-        except ValueError:
-            print("⚠️  Invalid number for end month, skipping")
-    
-    # Order index
-    new_order = input(f"Order index [{phase.order_index}]: ").strip()
-    if new_order:
-        try:
-            updates['order_index'] = int(new_order)
-        except ValueError:
-            print("⚠️  Invalid number for order index, skipping")
-    
-    # Description
-    print(f"Current description: {phase.description or 'None'}")
-    if get_yes_no_input("Update description?"):
-        new_desc = input("Enter new description: ").strip()
-        updates['description'] = new_desc if new_desc else None
-    
-    # Check if any updates
-    if not updates:
-        print("\n⚠️  No changes made")
-        return
+    collect_form(_DESCRIPTION_FORM, form)
     
     # Confirm
-    print("\n" + "-" * 60)
-    print("FIELDS TO UPDATE:")
-    for key, value in updates.items():
-        print(f"  {key}: {value}")
-    print("-" * 60)
-    
-    if not get_yes_no_input("\nApply these updates?"):
-        print("❌ Update cancelled")
-        return
-    
-    # Apply updates
-    updated_phase = update_phase(phase_id, **updates)
-    
-    if updated_phase:
-        print("\n✅ Phase updated successfully!")
-        display_phase(updated_phase)
-
-
-def menu_delete_phase():
-    """Delete a phase"""
-    print_header("Delete Relocation Phase")
-    
-    # Show all phases
-    phases = get_all_phases()
-    if not phases:
-        print("No phases found.")
-        return
-    
-    print("Available phases:")
-    for p in phases:
-        print(f"  ID {p.id}: {p.name} (Profile ID: {p.relocation_profile_id})")
-    
-    print()
-    
-    # Get phase ID
-    try:
-        phase_id = int(input("Enter phase ID to delete: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    # Get and show the phase
-    phase = get_phase_by_id(phase_id)
-    if not phase:
-        print(f"❌ No phase found with ID {phase_id}")
-        return
-    
-    print("\nPhase to delete:")
-    display_phase(phase)
-    
-    # Confirm deletion
-    print("⚠️  WARNING: This cannot be undone!")
-    if not get_yes_no_input("Are you sure you want to delete this phase?"):
-        print("❌ Deletion cancelled")
-        return
-    
-    # Delete it
-    if delete_phase(phase_id):
-        print("\n✅ Phase deleted successfully")
-    else:
-        print("\n❌ Failed to delete phase")
-
-def menu_create_phase():
-    """Create a new phase for a relocation profile"""
-    print_header("Create New Relocation Phase")
-    
-    # First, show all profiles so user can choose
-    profiles = get_all_profiles()
-    if not profiles:
-        print("❌ No profiles found. Create a profile first!")
-        return
-    
-    print("Available profiles:")
-    for p in profiles:
-        print(f"  ID {p.id}: {p.relocation_name}")
-    
-    print()
-    
-    # Get profile ID
-    try:
-        profile_id = int(input("Enter profile ID for this phase: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    # Verify profile exists
-    profile = get_profile_by_id(profile_id)
-    if not profile:
-        print(f"❌ No profile found with ID {profile_id}")
-        return
-    
-    print(f"\nCreating phase for: {profile.relocation_name}")
-    print("-" * 60)
-    
-    # Get phase details
-    name = input("Phase name (e.g., 'Pre-departure Planning'): ").strip()
-    if not name:
-        print("❌ Phase name is required!")
-        return
-    
-    print("\nTimeline (in months relative to target arrival date):")
-    print("  Example: -6 means 6 months before arrival")
-    print("  Example: 0 means the arrival month")
-    print("  Example: 3 means 3 months after arrival")
-    
-    try:
-        start_month = int(input("Start month: ").strip())
-        end_month = int(input("End month: ").strip())
-        
-        if start_month >= end_month:
-            print("❌ Start month must be before end month!")
-            return
-        
-        order_index = int(input("Order index (for sorting, e.g., 1, 2, 3...): ").strip())
-        
-    except ValueError:
-        print("❌ Please enter valid numbers!")
-        return
-    
-    description = input("Description (optional): ").strip()
-    if not description:
-        description = None
-    
-    # Confirm
-    print("\n" + "-" * 60)
-    print("REVIEW PHASE:")
-    print(f"  Name: {name}")
-    print(f"  Timeline: Month {start_month} to {end_month}")
-    print(f"  Order: {order_index}")
-    if description:
-        print(f"  Description: {description}")
-    print("-" * 60)
+    lines = [
+        "\n" + _DIV,
+        "REVIEW PHASE:",
+        f"  Name: {form['name']}",
+        f"  Timeline: Month {form['relative_start_month']} to {form['relative_end_month']}",
+        f"  Order: {form['order_index']}",
+    ]
+    if form['description']:
+        lines.append(f"  Description: {form['description']}")
+    lines.append(_DIV)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     if not get_yes_no_input("\nCreate this phase?"):
         print("❌ Phase creation cancelled")
@@ -751,14 +808,8 @@ def menu_create_phase():
     
     # Create the phase
     try:
-        phase = create_phase(
-            relocation_profile_id=profile_id,
-            name=name,
-            relative_start_month=start_month,
-            relative_end_month=end_month,
-            order_index=order_index,
-            description=description
-        )
+        phase = create_phase(relocation_profile_id=profile_id, **form)
+        invalidate_phases()
         print("\n✅ Phase created successfully!")
         display_phase(phase)
     except Exception as e:
@@ -771,106 +822,54 @@ def menu_view_all_phases():
     
     # Ask if they want to filter by profile
     if get_yes_no_input("Filter by specific profile?"):
-        profiles = get_all_profiles()
-        if not profiles:
-            print("❌ No profiles found")
-            return
-        
-        print("\nAvailable profiles:")
-        for p in profiles:
-            print(f"  ID {p.id}: {p.relocation_name}")
-        
-        try:
-            profile_id = int(input("\nEnter profile ID: ").strip())
-            phases = get_all_phases(relocation_profile_id=profile_id)
-        except ValueError:
-            print("❌ Invalid profile ID")
+        profile = pick_profile()
+        if not profile:
             return
+        profile_id = profile.id
     else:
-        phases = get_all_phases()
+        profile_id = None
     
-    if not phases:
-        print("No phases found.")
-        return
-    
-    print(f"\nTotal phases: {len(phases)}\n")
+    # Only one page of phases is loaded at a time
+    count = 0
+    for page in paginate(lambda limit, offset: get_all_phases(
+        relocation_profile_id=profile_id, limit=limit, offset=offset
+    )):
+        count += display_phases_bulk(page)
     
-    for phase in phases:
-        display_phase(phase)
+    if not count:
+        print("No phases found.")
 
 
 def menu_update_phase():
     """Update an existing phase"""
     print_header("Update Relocation Phase")
     
-    # Show all phases
-    phases = get_all_phases()
-    if not phases:
-        print("No phases found.")
+    # Only the picked phase is loaded in full
+    picked = pick_phase("Enter phase ID to update: ")
+    if not picked:
         return
-    
-    print("Available phases:")
-    for p in phases:
-        print(f"  ID {p.id}: {p.name} (Profile ID: {p.relocation_profile_id})")
-    
-    print()
-    
-    # Get phase ID
-    try:
-        phase_id = int(input("Enter phase ID to update: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    # Get the phase
+    phase_id = picked.id
     phase = get_phase_by_id(phase_id)
     if not phase:
+        # Deleted since the cached list was loaded
         print(f"❌ No phase found with ID {phase_id}")
         return
     
     # Show current phase
-    print("\nCurrent phase:")
-    display_phase(phase)
-    
-    # Ask what to update
-    print("What would you like to update? (Press Enter to skip)")
-    print("-" * 60)
-    
-    updates = {}
-    
-    # Name
-    new_name = input(f"Phase name [{phase.name}]: ").strip()
-    if new_name:
-        updates['name'] = new_name
-    
-    # Start month
-    new_start = input(f"Start month [{phase.relative_start_month}]: ").strip()
-    if new_start:
-        try:
-            updates['relative_start_month'] = int(new_start)
-        except ValueError:
-            print("⚠️  Invalid number for start month, skipping")
+    print("\nCurrent phase:")
+    display_phase(phase)
     
-    # End month
-    new_end = input(f"End month [{phase.relative_end_month}]: ").strip()
-    if new_end:
-        try:
-            updates['relative_end_month'] = int(new_end)
-        except ValueError:
-            print("⚠️  Invalid number for end month, skipping")
+    # Ask what to update
+    print("What would you like to update? (Press Enter to skip)")
+    print(_DIV)
     
-    # Order index
-    new_order = input(f"Order index [{phase.order_index}]: ").strip()
-    if new_order:
-        try:
-            updates['order_index'] = int(new_order)
-        except ValueError:
-            print("⚠️  Invalid number for order index, skipping")
+    # Name, timeline and order
+    updates = _collect_updates(phase, _PHASE_FIELDS)
     
     # Description
     print(f"Current description: {phase.description or 'None'}")
     if get_yes_no_input("Update description?"):
-        new_desc = input("Enter new description: ").strip()
+        new_desc = _prompt("Enter new description: ").strip()
         updates['description'] = new_desc if new_desc else None
     
     # Check if any updates
@@ -879,52 +878,40 @@ def menu_update_phase():
         return
     
     # Confirm
-    print("\n" + "-" * 60)
-    print("FIELDS TO UPDATE:")
+    screen = ScreenBuffer()
+    screen.add("\n" + _DIV)
+    screen.add("FIELDS TO UPDATE:")
     for key, value in updates.items():
-        print(f"  {key}: {value}")
-    print("-" * 60)
+        screen.add(f"  {key}: {value}")
+    screen.add(_DIV)
+    screen.flush()
     
     if not get_yes_no_input("\nApply these updates?"):
         print("❌ Update cancelled")
         return
     
     # Apply updates
-    updated_phase = update_phase(phase_id, **updates)
+    # All collected changes go out as one UPDATE - the phase isn't loaded again
+    updated = update_phase_fast(phase_id, **updates)
+    invalidate_phases()
     
-    if updated_phase:
+    if updated:
+        for key, value in updates.items():
+            setattr(phase, key, value)
         print("\n✅ Phase updated successfully!")
-        display_phase(updated_phase)
+        display_phase(phase)
 
 
 def menu_delete_phase():
     """Delete a phase"""
     print_header("Delete Relocation Phase")
     
-    # Show all phases
-    phases = get_all_phases()
-    if not phases:
-        print("No phases found.")
-        return
-    
-    print("Available phases:")
-    for p in phases:
-        print(f"  ID {p.id}: {p.name} (Profile ID: {p.relocation_profile_id})")
-    
-    print()
-    
-    # Get phase ID
-    try:
-        phase_id = int(input("Enter phase ID to delete: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
+    # Only the picked phase is loaded in full
+    picked = pick_phase("Enter phase ID to delete: ")
+    if not picked:
         return
-    
-    # Get and show the phase
+    phase_id = picked.id
     phase = get_phase_by_id(phase_id)
-    if not phase:
-        print(f"❌ No phase found with ID {phase_id}")
-        return
     
     print("\nPhase to delete:")
     display_phase(phase)
@@ -937,90 +924,33 @@ def menu_delete_phase():
     
     # Delete it
     if delete_phase(phase_id):
+        invalidate_phases()
         print("\n✅ Phase deleted successfully")
     else:
         print("\n❌ Failed to delete phase")
-def menu_create_task():
-    """Create a new task"""
-    print_header("Create New Task")
-    
-    # First, show all profiles
-    profiles = get_all_profiles()
-    if not profiles:
-        print("❌ No profiles found. Create a profile first!")
-        return
-    
-    print("Available profiles:")
-    for p in profiles:
-        print(f"  ID {p.id}: {p.relocation_name}")
-    
-    print()
-    
-    # Get profile ID
-    try:
-        profile_id = int(input("Enter profile ID for this task: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    # Verify profile exists
-    profile = get_profile_by_id(profile_id)
-    if not profile:
-        print(f"❌ No profile found with ID {profile_id}")
-        return
-    
-    # Get phases for this profile
-    phases = get_all_phases(relocation_profile_id=profile_id)
-    if not phases:
-        print(f"❌ No phases found for this profile. Create a phase first!")
-        return
-    
-    print(f"\nAvailable phases for '{profile.relocation_name}':")
-    for p in phases:
-        print(f"  ID {p.id}: {p.name} (Months {p.relative_start_month} to {p.relative_end_month})")
-    
-    print()
-    
-    # Get phase ID
-    try:
-        phase_id = int(input("Enter phase ID for this task: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    # Verify phase exists and belongs to this profile
-    phase = get_phase_by_id(phase_id)
-    if not phase or phase.relocation_profile_id != profile_id:
-        print(f"❌ Invalid phase ID for this profile")
-        return
-    
-    print(f"\nCreating task for phase: {phase.name}")
-    print("-" * 60)
+def _prompt_task_fields(phase):
+    """
+    Ask for the details of one task in the given phase
     
-    # Get task details
-    title = input("Task title: ").strip()
+    Returns:
+        Dict of create_task arguments (without the IDs), or None if no title was given
+    """
+    title = _prompt("Task title: ").strip()
     if not title:
-        print("❌ Task title is required!")
-        return
+        return None
     
-    description = input("Description (optional): ").strip()
+    description = _prompt("Description (optional): ").strip()
     if not description:
         description = None
     
     # Status
-    print("\nStatus:")
-    print("  1. Not started (default)")
-    print("  2. In progress")
-    print("  3. Completed")
-    status_choice = input("Choose status (1-3, or Enter for default): ").strip()
-    
-    status_map = {
-        '1': 'not_started',
-        '2': 'in_progress',
-        '3': 'completed',
-        '': 'not_started'
-    }
-    status = status_map.get(status_choice, 'not_started')
+    print("\nStatus:\n"
+          "  1. Not started (default)\n"
+          "  2. In progress\n"
+          "  3. Completed")
+    status_choice = _prompt("Choose status (1-3, or Enter for default): ").strip()
+    
+    status = _STATUS_CHOICES.get(status_choice, 'not_started')
     
     # Critical
     critical = get_yes_no_input("Is this task critical/important?")
@@ -1030,24 +960,57 @@ def menu_create_task():
     planned_date = get_date_input("Enter planned date or press Enter to skip:")
     
     # Notes
-    notes = input("Additional notes (optional): ").strip()
+    notes = _prompt("Additional notes (optional): ").strip()
     if not notes:
         notes = None
     
+    return dict(title=title, description=description, status=status,
+                critical=critical, planned_date=planned_date, notes=notes)
+
+
+def _task_review_lines(fields, phase):
+    """Lines describing a task that is about to be created"""
+    lines = [
+        f"  Title: {fields['title']}",
+        f"  Phase: {phase.name}",
+        f"  Status: {fields['status'].replace('_', ' ').title()}",
+        f"  Critical: {'Yes' if fields['critical'] else 'No'}",
+    ]
+    if fields['description']:
+        lines.append(f"  Description: {fields['description']}")
+    if fields['planned_date']:
+        lines.append(f"  Planned Date: {fields['planned_date']}")
+    if fields['notes']:
+        lines.append(f"  Notes: {fields['notes']}")
+    return lines
+
+
+def menu_create_task():
+    """Create a new task"""
+    print_header("Create New Task")
+    
+    profile = pick_profile("Enter profile ID for this task: ")
+    if not profile:
+        return
+    profile_id = profile.id
+    
+    phase = pick_phase("Enter phase ID for this task: ", relocation_profile_id=profile_id)
+    if not phase:
+        return
+    phase_id = phase.id
+    
+    print(f"\nCreating task for phase: {phase.name}")
+    print(_DIV)
+    
+    # Get task details
+    fields = _prompt_task_fields(phase)
+    if fields is None:
+        print("❌ Task title is required!")
+        return
+    
     # Confirm
-    print("\n" + "-" * 60)
-    print("REVIEW TASK:")
-    print(f"  Title: {title}")
-    print(f"  Phase: {phase.name}")
-    print(f"  Status: {status.replace('_', ' ').title()}")
-    print(f"  Critical: {'Yes' if critical else 'No'}")
-    if description:
-        print(f"  Description: {description}")
-    if planned_date:
-        print(f"  Planned Date: {planned_date}")
-    if notes:
-        print(f"  Notes: {notes}")
-    print("-" * 60)
+    lines = ["\n" + _DIV, "REVIEW TASK:"] + _task_review_lines(fields, phase) + [_DIV]
+    sys.stdout.write("\n".join(lines) + "\n")
     
     if not get_yes_no_input("\nCreate this task?"):
         print("❌ Task creation cancelled")
@@ -1055,103 +1018,112 @@ def menu_create_task():
     
     # Create the task
     try:
-        task = create_task(
-            relocation_profile_id=profile_id,
-            phase_id=phase_id,
-            title=title,
-            description=description,
-            status=status,
-            critical=critical,
-            planned_date=planned_date,
-            notes=notes
-        )
+        task = create_task(relocation_profile_id=profile_id, phase_id=phase_id, **fields)
+        invalidate_tasks()
         print("\n✅ Task created successfully!")
         display_task(task)
     except Exception as e:
         print(f"\n❌ Error creating task: {e}")
 
 
+def menu_create_tasks_bulk():
+    """Enter several tasks for one phase and save them all at once"""
+    print_header("Create Several Tasks")
+    
+    profile = pick_profile("Enter profile ID for these tasks: ")
+    if not profile:
+        return
+    profile_id = profile.id
+    
+    phase = pick_phase("Enter phase ID for these tasks: ", relocation_profile_id=profile_id)
+    if not phase:
+        return
+    
+    print(f"\nCreating tasks for phase: {phase.name}")
+    print("Leave the title empty when you're done")
+    
+    records = []
+    while True:
+        print(f"\nTask #{len(records) + 1}")
+        print(_DIV)
+        fields = _prompt_task_fields(phase)
+        if fields is None:
+            break
+        records.append(dict(relocation_profile_id=profile_id, phase_id=phase.id, **fields))
+    
+    if not records:
+        print("❌ No tasks entered")
+        return
+    
+    # Confirm
+    lines = ["\n" + _DIV, f"REVIEW {len(records)} TASK(S):"]
+    for record in records:
+        lines += _task_review_lines(record, phase) + [""]
+    lines.append(_DIV)
+    sys.stdout.write("\n".join(lines) + "\n")
+    
+    if not get_yes_no_input("\nCreate these tasks?"):
+        print("❌ Task creation cancelled")
+        return
+    
+    # One transaction for all of them
+    try:
+        create_tasks_bulk(records)
+        invalidate_tasks()
+        print(f"\n✅ {len(records)} task(s) created successfully!")
+    except Exception as e:
+        print(f"\n❌ Error creating tasks: {e}")
+
+
 def menu_view_all_tasks():
     """View all tasks with filtering options"""
     print_header("View Tasks")
     
     # Ask about filtering
-    print("Filter options:")
-    print("  1. View all tasks")
-    print("  2. Filter by profile")
-    print("  3. Filter by phase")
-    print("  4. Filter by status")
+    print("Filter options:\n"
+          "  1. View all tasks\n"
+          "  2. Filter by profile\n"
+          "  3. Filter by phase\n"
+          "  4. Filter by status")
     
-    filter_choice = input("\nChoose filter (1-4): ").strip()
+    filter_choice = _prompt("\nChoose filter (1-4): ").strip()
     
     profile_id = None
     phase_id = None
     status = None
     
     if filter_choice == '2':
-        # Filter by profile
-        profiles = get_all_profiles()
-        if not profiles:
-            print("❌ No profiles found")
-            return
-        
-        print("\nAvailable profiles:")
-        for p in profiles:
-            print(f"  ID {p.id}: {p.relocation_name}")
-        
-        try:
-            profile_id = int(input("\nEnter profile ID: ").strip())
-        except ValueError:
-            print("❌ Invalid profile ID")
+        profile = pick_profile()
+        if not profile:
             return
+        profile_id = profile.id
     
     elif filter_choice == '3':
-        # Filter by phase
-        phases = get_all_phases()
-        if not phases:
-            print("❌ No phases found")
-            return
-        
-        print("\nAvailable phases:")
-        for p in phases:
-            print(f"  ID {p.id}: {p.name} (Profile ID: {p.relocation_profile_id})")
-        
-        try:
-            phase_id = int(input("\nEnter phase ID: ").strip())
-        except ValueError:
-            print("❌ Invalid phase ID")
+        phase = pick_phase()
+        if not phase:
             return
+        phase_id = phase.id
     
     elif filter_choice == '4':
         # Filter by status
-        print("\nStatus options:")
-        print("  1. Not started")
-        print("  2. In progress")
-        print("  3. Completed")
+        print("\nStatus options:\n"
+              "  1. Not started\n"
+              "  2. In progress\n"
+              "  3. Completed")
         
-        status_choice = input("\nChoose status (1-3): ").strip()
-        status_map = {
-            '1': 'not_started',
-            '2': 'in_progress',
-            '3': 'completed'
-        }
-        status = status_map.get(status_choice)
-    
-    # Get tasks
-    tasks = get_all_tasks(
-        relocation_profile_id=profile_id,
-        phase_id=phase_id,
-        status=status
-    )
-    
-    if not tasks:
+        status_choice = _prompt("\nChoose status (1-3): ").strip()
+        status = _STATUS_CHOICES.get(status_choice)
+    
+    # Only one page of tasks is loaded at a time
+    count = 0
+    for page in paginate(lambda limit, offset: get_all_tasks(
+        relocation_profile_id=profile_id, phase_id=phase_id, status=status,
+        limit=limit, offset=offset
+    )):
+        count += display_tasks_bulk(page)
+    
+    if not count:
         print("\nNo tasks found.")
-        return
-    
-    print(f"\nTotal tasks: {len(tasks)}\n")
-    
-    for task in tasks:
-        display_task(task)
 
 
 def menu_update_task():
@@ -1159,28 +1131,23 @@ def menu_update_task():
     print_header("Update Task")
     
     # Show all tasks
-    tasks = get_all_tasks()
+    tasks = cached_task_summaries()
     if not tasks:
         print("No tasks found.")
         return
     
     print("Available tasks:")
-    for t in tasks:
-        status_emoji = {'not_started': '⏸️', 'in_progress': '🔄', 'completed': '✅'}
-        emoji = status_emoji.get(t.status, '❓')
-        critical = "🔴" if t.critical else ""
-        print(f"  ID {t.id}: {emoji} {t.title} {critical}")
+    _print_paged(tasks, lambda t: (
+        f"  ID {t.id}: {_TASK_EMOJI.get(t.status, '❓')} {t.title} {'🔴' if t.critical else ''}"
+    ))
     
     print()
     
-    # Get task ID
-    try:
-        task_id = int(input("Enter task ID to update: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
+    # Only the picked task is loaded in full
+    picked = pick_from(tasks, "Enter task ID to update: ", "task")
+    if not picked:
         return
-    
-    # Get the task
+    task_id = picked.id
     task = get_task_by_id(task_id)
     if not task:
         print(f"❌ No task found with ID {task_id}")
@@ -1192,35 +1159,33 @@ def menu_update_task():
     
     # Ask what to update
     print("What would you like to update? (Press Enter to skip)")
-    print("-" * 60)
+    print(_DIV)
     
     updates = {}
     
     # Title
-    new_title = input(f"Title [{task.title}]: ").strip()
+    new_title = _prompt(f"Title [{task.title}]: ").strip()
     if new_title:
         updates['title'] = new_title
     
     # Description
     print(f"Current description: {task.description or 'None'}")
     if get_yes_no_input("Update description?"):
-        new_desc = input("Enter new description: ").strip()
+        new_desc = _prompt("Enter new description: ").strip()
         updates['description'] = new_desc if new_desc else None
     
     # Status
     print(f"\nCurrent status: {task.status.replace('_', ' ').title()}")
     if get_yes_no_input("Update status?"):
-        print("  1. Not started")
-        print("  2. In progress")
-        print("  3. Completed")
-        status_choice = input("Choose status (1-3): ").strip()
-        status_map = {'1': 'not_started', '2': 'in_progress', '3': 'completed'}
-        if status_choice in status_map:
-            updates['status'] = status_map[status_choice]
+        print("  1. Not started\n"
+              "  2. In progress\n"
+              "  3. Completed")
+        status_choice = _prompt("Choose status (1-3): ").strip()
+        if status_choice in _STATUS_CHOICES:
+            updates['status'] = _STATUS_CHOICES[status_choice]
             
             # If marking as completed, set completed date
-            if status_map[status_choice] == 'completed':
-                from datetime import date
+            if updates['status'] == 'completed':
                 updates['completed_date'] = date.today()
     
     # Critical
@@ -1238,7 +1203,7 @@ def menu_update_task():
     # Notes
     print(f"Current notes: {task.notes or 'None'}")
     if get_yes_no_input("Update notes?"):
-        new_notes = input("Enter new notes: ").strip()
+        new_notes = _prompt("Enter new notes: ").strip()
         updates['notes'] = new_notes if new_notes else None
     
     # Check if any updates
@@ -1247,11 +1212,13 @@ def menu_update_task():
         return
     
     # Confirm
-    print("\n" + "-" * 60)
-    print("FIELDS TO UPDATE:")
+    screen = ScreenBuffer()
+    screen.add("\n" + _DIV)
+    screen.add("FIELDS TO UPDATE:")
     for key, value in updates.items():
-        print(f"  {key}: {value}")
-    print("-" * 60)
+        screen.add(f"  {key}: {value}")
+    screen.add(_DIV)
+    screen.flush()
     
     if not get_yes_no_input("\nApply these updates?"):
         print("❌ Update cancelled")
@@ -1259,6 +1226,7 @@ def menu_update_task():
     
     # Apply updates
     updated_task = update_task(task_id, **updates)
+    invalidate_tasks()
     
     if updated_task:
         print("\n✅ Task updated successfully!")
@@ -1270,27 +1238,24 @@ def menu_mark_task_completed():
     print_header("Mark Task as Completed")
     
     # Show incomplete tasks
-    incomplete_tasks = get_all_tasks(status='not_started') + get_all_tasks(status='in_progress')
+    incomplete_tasks = cached_task_summaries(status=('not_started', 'in_progress'))
     
     if not incomplete_tasks:
         print("No incomplete tasks found. Great job! 🎉")
         return
     
     print("Incomplete tasks:")
-    for t in incomplete_tasks:
-        critical = "🔴" if t.critical else ""
-        print(f"  ID {t.id}: {t.title} {critical} [{t.status.replace('_', ' ').title()}]")
+    _print_paged(incomplete_tasks, lambda t: (
+        f"  ID {t.id}: {t.title} {'🔴' if t.critical else ''} [{t.status.replace('_', ' ').title()}]"
+    ))
     
     print()
     
-    # Get task ID
-    try:
-        task_id = int(input("Enter task ID to mark as completed: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
+    # Only the picked task is loaded in full
+    picked = pick_from(incomplete_tasks, "Enter task ID to mark as completed: ", "task")
+    if not picked:
         return
-    
-    # Get the task
+    task_id = picked.id
     task = get_task_by_id(task_id)
     if not task:
         print(f"❌ No task found with ID {task_id}")
@@ -1310,10 +1275,13 @@ def menu_mark_task_completed():
     
     # Mark completed
     updated_task = mark_task_completed(task_id)
+    invalidate_tasks()
     
     if updated_task:
         print("\n✅ Task marked as completed!")
         display_task(updated_task)
+    else:
+        print("⚠️  Task is already completed or was not found")
 
 
 def menu_delete_task():
@@ -1321,27 +1289,21 @@ def menu_delete_task():
     print_header("Delete Task")
     
     # Show all tasks
-    tasks = get_all_tasks()
+    tasks = cached_task_summaries()
     if not tasks:
         print("No tasks found.")
         return
     
     print("Available tasks:")
-    for t in tasks:
-        status_emoji = {'not_started': '⏸️', 'in_progress': '🔄', 'completed': '✅'}
-        emoji = status_emoji.get(t.status, '❓')
-        print(f"  ID {t.id}: {emoji} {t.title}")
+    _print_paged(tasks, lambda t: f"  ID {t.id}: {_TASK_EMOJI.get(t.status, '❓')} {t.title}")
     
     print()
     
-    # Get task ID
-    try:
-        task_id = int(input("Enter task ID to delete: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
+    # Only the picked task is loaded in full
+    picked = pick_from(tasks, "Enter task ID to delete: ", "task")
+    if not picked:
         return
-    
-    # Get and show the task
+    task_id = picked.id
     task = get_task_by_id(task_id)
     if not task:
         print(f"❌ No task found with ID {task_id}")
@@ -1358,6 +1320,7 @@ def menu_delete_task():
     
     # Delete it
     if delete_task(task_id):
+        invalidate_tasks()
         print("\n✅ Task deleted successfully")
     else:
         print("\n❌ Failed to delete task")
@@ -1365,84 +1328,46 @@ def menu_create_expense():
     """Create a new expense"""
     print_header("Create New Expense")
     
-    # Get profile
-    profiles = get_all_profiles()
-    if not profiles:
-        print("❌ No profiles found. Create a profile first!")
-        return
-    
-    print("Available profiles:")
-    for p in profiles:
-        print(f"  ID {p.id}: {p.relocation_name}")
-    
-    print()
-    
-    try:
-        profile_id = int(input("Enter profile ID: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    profile = get_profile_by_id(profile_id)
+    profile = pick_profile()
     if not profile:
-        print(f"❌ No profile found with ID {profile_id}")
-        return
-    
-    # Get phase
-    phases = get_all_phases(relocation_profile_id=profile_id)
-    if not phases:
-        print("❌ No phases found. Create a phase first!")
-        return
-    
-    print(f"\nAvailable phases for '{profile.relocation_name}':")
-    for p in phases:
-        print(f"  ID {p.id}: {p.name}")
-    
-    print()
-    
-    try:
-        phase_id = int(input("Enter phase ID: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
         return
+    profile_id = profile.id
     
-    phase = get_phase_by_id(phase_id)
-    if not phase or phase.relocation_profile_id != profile_id:
-        print("❌ Invalid phase ID")
+    phase = pick_phase(relocation_profile_id=profile_id)
+    if not phase:
         return
+    phase_id = phase.id
     
     print(f"\nCreating expense for phase: {phase.name}")
-    print("-" * 60)
+    print(_DIV)
     
     # Get expense details
-    title = input("Expense title (e.g., 'Visa application fee'): ").strip()
+    title = _prompt("Expense title (e.g., 'Visa application fee'): ").strip()
     if not title:
         print("❌ Title is required!")
         return
     
-    category = input("Category (e.g., 'Legal', 'Housing', 'Transportation'): ").strip()
+    category = _prompt("Category (e.g., 'Legal', 'Housing', 'Transportation'): ").strip()
     if not category:
         category = None
     
     # Currency
     print(f"\nPrimary currency for profile: {profile.primary_currency}")
-    currency = input(f"Expense currency (or Enter for {profile.primary_currency}): ").strip().upper()
+    currency = _prompt(f"Expense currency (or Enter for {profile.primary_currency}): ").strip().upper()
     if not currency:
         currency = profile.primary_currency
+    elif currency not in _VALID_CURRENCIES:
+        # Caught here, before a typo costs an exchange rate request
+        print(f"❌ Unknown currency code: {currency}")
+        return
     
-    # Get exchange rate if different currency
-    exchange_rate = None
+    # Start fetching the exchange rate if different currency - the amounts
+    # below are asked for while the request is in flight
+    rate_future = None
     if currency != profile.primary_currency:
-        print(f"\nFetching exchange rate from {currency} to {profile.primary_currency}...")
-        exchange_rate = get_exchange_rate(currency, profile.primary_currency)
-        
-        if exchange_rate is None:
-            # API failed, offer manual entry
-            exchange_rate = get_manual_exchange_rate()
-            
-        if exchange_rate:
-            rate_display = exchange_rate / 10000
-            print(f"  Using rate: 1 {currency} = {rate_display:.4f} {profile.primary_currency}")
+        # Imported here so the requests/urllib3 stack only loads when a rate is needed
+        from currency_service import prefetch_exchange_rate
+        rate_future = prefetch_exchange_rate(currency, profile.primary_currency)
     
     # Estimated amount
     print("\nEstimated amount:")
@@ -1458,18 +1383,12 @@ def menu_create_expense():
         actual_amount = None
     
     # Cost certainty
-    print("\nCost certainty:")
-    print("  1. Unknown")
-    print("  2. Estimated (default)")
-    print("  3. Confirmed")
-    certainty_choice = input("Choose (1-3, or Enter for default): ").strip()
-    certainty_map = {
-        '1': 'unknown',
-        '2': 'estimated',
-        '3': 'confirmed',
-        '': 'estimated'
-    }
-    cost_certainty = certainty_map.get(certainty_choice, 'estimated')
+    print("\nCost certainty:\n"
+          "  1. Unknown\n"
+          "  2. Estimated (default)\n"
+          "  3. Confirmed")
+    certainty_choice = _prompt("Choose (1-3, or Enter for default): ").strip()
+    cost_certainty = _CERTAINTY_CHOICES.get(certainty_choice, 'estimated')
     
     # Payment status
     payment_status = 'paid' if get_yes_no_input("\nHas this been paid already?") else 'unpaid'
@@ -1485,45 +1404,65 @@ def menu_create_expense():
     one_time_cost = get_yes_no_input("Is this a one-time relocation cost?")
     
     # Related task (optional)
+    related_task_id = None
+    related_task_title = None
     if get_yes_no_input("\nLink to a task?"):
-        tasks = get_all_tasks(relocation_profile_id=profile_id)
+        tasks = cached_task_summaries(relocation_profile_id=profile_id)
         if tasks:
             print("\nAvailable tasks:")
-            for t in tasks:
-                print(f"  ID {t.id}: {t.title}")
-            try:
-                related_task_id = int(input("\nEnter task ID: ").strip())
-            except ValueError:
+            _print_paged(tasks, lambda t: f"  ID {t.id}: {t.title}")
+            related_task_id = safe_int("\nEnter task ID: ", error=None)
+            
+            # Checked against the list just shown - no need to look the task up again
+            related_task_title = {t.id: t.title for t in tasks}.get(related_task_id)
+            if related_task_id is not None and related_task_title is None:
+                print(f"⚠️  No task with ID {related_task_id} in this profile - the expense won't be linked")
                 related_task_id = None
         else:
             print("No tasks found")
-            related_task_id = None
-    else:
-        related_task_id = None
     
     # Notes
-    notes = input("\nAdditional notes (optional): ").strip()
+    notes = _prompt("\nAdditional notes (optional): ").strip()
     if not notes:
         notes = None
     
+    # Get exchange rate if different currency
+    exchange_rate = None
+    if rate_future is not None:
+        print(f"\nFetching exchange rate from {currency} to {profile.primary_currency}...")
+        exchange_rate = rate_future.result()
+        
+        if exchange_rate is None:
+            # API failed, offer manual entry
+            from currency_service import get_manual_exchange_rate
+            print("  ⚠️  Could not fetch exchange rate")
+            exchange_rate = get_manual_exchange_rate()
+            
+        if exchange_rate:
+            rate_display = exchange_rate / 10000
+            print(f"  Using rate: 1 {currency} = {rate_display:.4f} {profile.primary_currency}")
+    
     # Confirm
-    print("\n" + "-" * 60)
-    print("REVIEW EXPENSE:")
-    print(f"  Title: {title}")
-    print(f"  Category: {category or 'None'}")
-    print(f"  Phase: {phase.name}")
-    est_display = estimated_amount / 100
-    print(f"  Estimated: {est_display:.2f} {currency}")
+    lines = [
+        "\n" + _DIV,
+        "REVIEW EXPENSE:",
+        f"  Title: {title}",
+        f"  Category: {category or 'None'}",
+        f"  Phase: {phase.name}",
+        f"  Estimated: {estimated_amount / 100:.2f} {currency}",
+    ]
     if actual_amount:
-        act_display = actual_amount / 100
-        print(f"  Actual: {act_display:.2f} {currency}")
-    print(f"  Cost Certainty: {cost_certainty}")
-    print(f"  Payment Status: {payment_status}")
+        lines.append(f"  Actual: {actual_amount / 100:.2f} {currency}")
+    lines.append(f"  Cost Certainty: {cost_certainty}")
+    lines.append(f"  Payment Status: {payment_status}")
     if due_date:
-        print(f"  Due Date: {due_date}")
-    print(f"  Include in Budget: {'Yes' if include_in_budget else 'No'}")
-    print(f"  One-time Cost: {'Yes' if one_time_cost else 'No'}")
-    print("-" * 60)
+        lines.append(f"  Due Date: {due_date}")
+    if related_task_title:
+        lines.append(f"  Related Task: {related_task_title}")
+    lines.append(f"  Include in Budget: {'Yes' if include_in_budget else 'No'}")
+    lines.append(f"  One-time Cost: {'Yes' if one_time_cost else 'No'}")
+    lines.append(_DIV)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     if not get_yes_no_input("\nCreate this expense?"):
         print("❌ Expense creation cancelled")
@@ -1548,6 +1487,7 @@ def menu_create_expense():
             related_task_id=related_task_id,
             notes=notes
         )
+        invalidate_expenses()
         print("\n✅ Expense created successfully!")
         display_expense(expense)
     except Exception as e:
@@ -1558,118 +1498,84 @@ def menu_view_all_expenses():
     """View all expenses with filtering"""
     print_header("View Expenses")
     
-    print("Filter options:")
-    print("  1. View all expenses")
-    print("  2. Filter by profile")
-    print("  3. Filter by phase")
-    print("  4. Filter by payment status")
+    print("Filter options:\n"
+          "  1. View all expenses\n"
+          "  2. Filter by profile\n"
+          "  3. Filter by phase\n"
+          "  4. Filter by payment status")
     
-    filter_choice = input("\nChoose filter (1-4): ").strip()
+    filter_choice = _prompt("\nChoose filter (1-4): ").strip()
     
     profile_id = None
     phase_id = None
     payment_status = None
     
     if filter_choice == '2':
-        profiles = get_all_profiles()
-        if not profiles:
-            print("❌ No profiles found")
-            return
-        
-        print("\nAvailable profiles:")
-        for p in profiles:
-            print(f"  ID {p.id}: {p.relocation_name}")
-        
-        try:
-            profile_id = int(input("\nEnter profile ID: ").strip())
-        except ValueError:
-            print("❌ Invalid profile ID")
+        profile = pick_profile()
+        if not profile:
             return
+        profile_id = profile.id
     
     elif filter_choice == '3':
-        phases = get_all_phases()
-        if not phases:
-            print("❌ No phases found")
-            return
-        
-        print("\nAvailable phases:")
-        for p in phases:
-            print(f"  ID {p.id}: {p.name}")
-        
-        try:
-            phase_id = int(input("\nEnter phase ID: ").strip())
-        except ValueError:
-            print("❌ Invalid phase ID")
+        phase = pick_phase()
+        if not phase:
             return
+        phase_id = phase.id
     
     elif filter_choice == '4':
-        print("\nPayment status:")
-        print("  1. Unpaid")
-        print("  2. Paid")
+        print("\nPayment status:\n"
+              "  1. Unpaid\n"
+              "  2. Paid")
         
-        status_choice = input("\nChoose (1-2): ").strip()
+        status_choice = _prompt("\nChoose (1-2): ").strip()
         payment_status = 'unpaid' if status_choice == '1' else 'paid'
     
-    # Get expenses
-    expenses = get_all_expenses(
-        relocation_profile_id=profile_id,
-        phase_id=phase_id,
-        payment_status=payment_status
-    )
+    # Only one page of expenses is loaded at a time
+    count = 0
+    for page in paginate(lambda limit, offset: get_all_expenses(
+        relocation_profile_id=profile_id, phase_id=phase_id, payment_status=payment_status,
+        limit=limit, offset=offset
+    )):
+        count += display_expenses_bulk(page)
     
-    if not expenses:
+    if not count:
         print("\nNo expenses found.")
-        return
-    
-    print(f"\nTotal expenses: {len(expenses)}\n")
-    
-    for expense in expenses:
-        display_expense(expense)
 
 
 def menu_update_expense():
     """Update an existing expense"""
     print_header("Update Expense")
     
-    expenses = get_all_expenses()
+    expenses = cached_all_expenses()
     if not expenses:
         print("No expenses found.")
         return
     
     print("Available expenses:")
-    for e in expenses:
-        amount = (e.actual_amount if e.actual_amount else e.estimated_amount) / 100
-        status = "✅" if e.payment_status == 'paid' else "💰"
-        print(f"  ID {e.id}: {status} {e.title} ({amount:.2f} {e.currency})")
+    _print_paged(expenses, lambda e: _expense_row(e, icon=_PAYMENT_ICON.get(e.payment_status, '💰 ')))
     
     print()
     
-    try:
-        expense_id = int(input("Enter expense ID to update: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    expense = get_expense_by_id(expense_id)
+    expense = pick_from(expenses, "Enter expense ID to update: ", "expense")
     if not expense:
-        print(f"❌ No expense found with ID {expense_id}")
         return
+    expense_id = expense.id
     
     print("\nCurrent expense:")
     display_expense(expense)
     
     print("What would you like to update? (Press Enter to skip)")
-    print("-" * 60)
+    print(_DIV)
     
     updates = {}
     
     # Title
-    new_title = input(f"Title [{expense.title}]: ").strip()
+    new_title = _prompt(f"Title [{expense.title}]: ").strip()
     if new_title:
         updates['title'] = new_title
     
     # Category
-    new_category = input(f"Category [{expense.category or 'None'}]: ").strip()
+    new_category = _prompt(f"Category [{expense.category or 'None'}]: ").strip()
     if new_category:
         updates['category'] = new_category
     
@@ -1699,13 +1605,12 @@ def menu_update_expense():
     # Cost certainty
     print(f"Current cost certainty: {expense.cost_certainty}")
     if get_yes_no_input("Update cost certainty?"):
-        print("  1. Unknown")
-        print("  2. Estimated")
-        print("  3. Confirmed")
-        cert_choice = input("Choose (1-3): ").strip()
-        cert_map = {'1': 'unknown', '2': 'estimated', '3': 'confirmed'}
-        if cert_choice in cert_map:
-            updates['cost_certainty'] = cert_map[cert_choice]
+        print("  1. Unknown\n"
+              "  2. Estimated\n"
+              "  3. Confirmed")
+        cert_choice = _prompt("Choose (1-3): ").strip()
+        if cert_choice in _CERTAINTY_CHOICES:
+            updates['cost_certainty'] = _CERTAINTY_CHOICES[cert_choice]
     
     # Due date
     if get_yes_no_input(f"\nUpdate due date? (current: {expense.due_date or 'None'})"):
@@ -1715,7 +1620,7 @@ def menu_update_expense():
     
     # Notes
     if get_yes_no_input("\nUpdate notes?"):
-        new_notes = input("Enter new notes: ").strip()
+        new_notes = _prompt("Enter new notes: ").strip()
         updates['notes'] = new_notes if new_notes else None
     
     if not updates:
@@ -1723,20 +1628,23 @@ def menu_update_expense():
         return
     
     # Confirm
-    print("\n" + "-" * 60)
-    print("FIELDS TO UPDATE:")
+    screen = ScreenBuffer()
+    screen.add("\n" + _DIV)
+    screen.add("FIELDS TO UPDATE:")
     for key, value in updates.items():
         if key in ['estimated_amount', 'actual_amount'] and value:
-            print(f"  {key}: {value/100:.2f}")
+            screen.add(f"  {key}: {value/100:.2f}")
         else:
-            print(f"  {key}: {value}")
-    print("-" * 60)
+            screen.add(f"  {key}: {value}")
+    screen.add(_DIV)
+    screen.flush()
     
     if not get_yes_no_input("\nApply these updates?"):
         print("❌ Update cancelled")
         return
     
     updated_expense = update_expense(expense_id, **updates)
+    invalidate_expenses()
     
     if updated_expense:
         print("\n✅ Expense updated successfully!")
@@ -1747,30 +1655,23 @@ def menu_mark_expense_paid():
     """Quick action to mark expense as paid"""
     print_header("Mark Expense as Paid")
     
-    unpaid = get_all_expenses(payment_status='unpaid')
+    # (expense, is_overdue) rows - the overdue check is done in SQL
+    unpaid = cached_unpaid_expenses()
     
     if not unpaid:
         print("No unpaid expenses. Great! 🎉")
         return
     
     print("Unpaid expenses:")
-    for e in unpaid:
-        amount = (e.actual_amount if e.actual_amount else e.estimated_amount) / 100
-        overdue = " ⚠️ OVERDUE" if e.is_overdue else ""
-        print(f"  ID {e.id}: {e.title} ({amount:.2f} {e.currency}){overdue}")
+    _print_paged(unpaid, lambda row: _expense_row(row.Expense, flag=' ⚠️ OVERDUE' if row.is_overdue else ''))
     
     print()
     
-    try:
-        expense_id = int(input("Enter expense ID to mark as paid: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    expense = get_expense_by_id(expense_id)
-    if not expense:
-        print(f"❌ No expense found with ID {expense_id}")
+    row = pick_from(unpaid, "Enter expense ID to mark as paid: ", "expense", get_id=lambda row: row.Expense.id)
+    if not row:
         return
+    expense = row.Expense
+    expense_id = expense.id
     
     if expense.payment_status == 'paid':
         print("⚠️  This expense is already marked as paid")
@@ -1783,38 +1684,33 @@ def menu_mark_expense_paid():
         return
     
     updated = mark_expense_paid(expense_id)
+    invalidate_expenses()
     
     if updated:
         print("\n✅ Expense marked as paid!")
         display_expense(updated)
+    else:
+        print("⚠️  Expense is already paid or was not found")
 
 
 def menu_delete_expense():
     """Delete an expense"""
     print_header("Delete Expense")
     
-    expenses = get_all_expenses()
+    expenses = cached_all_expenses()
     if not expenses:
         print("No expenses found.")
         return
     
     print("Available expenses:")
-    for e in expenses:
-        amount = (e.actual_amount if e.actual_amount else e.estimated_amount) / 100
-        print(f"  ID {e.id}: {e.title} ({amount:.2f} {e.currency})")
+    _print_paged(expenses, _expense_row)
     
     print()
     
-    try:
-        expense_id = int(input("Enter expense ID to delete: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    expense = get_expense_by_id(expense_id)
+    expense = pick_from(expenses, "Enter expense ID to delete: ", "expense")
     if not expense:
-        print(f"❌ No expense found with ID {expense_id}")
         return
+    expense_id = expense.id
     
     print("\nExpense to delete:")
     display_expense(expense)
@@ -1825,6 +1721,7 @@ def menu_delete_expense():
         return
     
     if delete_expense(expense_id):
+        invalidate_expenses()
         print("\n✅ Expense deleted successfully")
     else:
         print("\n❌ Failed to delete expense")
@@ -1834,67 +1731,116 @@ def menu_view_budget_summary():
     """View budget summary for a profile"""
     print_header("Budget Summary")
     
-    profiles = get_all_profiles()
-    if not profiles:
-        print("❌ No profiles found")
-        return
-    
-    print("Available profiles:")
-    for p in profiles:
-        print(f"  ID {p.id}: {p.relocation_name}")
-    
-    print()
-    
-    try:
-        profile_id = int(input("Enter profile ID: ").strip())
-    except ValueError:
-        print("❌ Please enter a valid number")
-        return
-    
-    profile = get_profile_by_id(profile_id)
+    profile = pick_profile()
     if not profile:
-        print(f"❌ No profile found with ID {profile_id}")
         return
+    profile_id = profile.id
     
     summary = get_budget_summary(profile_id)
     display_budget_summary(summary)
+# Main menu body, written in one go by show_main_menu
+_MAIN_MENU = "\n".join([
+    "RELOCATION PROFILES:",
+    "  1. Create new relocation profile",
+    "  2. View all profiles",
+    "  3. View specific profile by ID",
+    "  4. Update a profile",
+    "  5. Delete a profile",
+    "\nRELOCATION PHASES:",
+    "  6. Create new phase",
+    "  7. View all phases",
+    "  8. Update a phase",
+    "  9. Delete a phase",
+    "\nTASKS:",
+    "  10. Create new task",
+    "  11. View all tasks",
+    "  12. Update a task",
+    "  13. Mark task as completed ✅",
+    "  14. Delete a task",
+    "  21. Create several tasks at once",
+    "\nEXPENSES:",
+    "  15. Create new expense",
+    "  16. View all expenses",
+    "  17. Update an expense",
+    "  18. Mark expense as paid 💰",
+    "  19. Delete an expense",
+    "  20. View budget summary 📊",
+    "\nOTHER:",
+    "  0. Exit",
+    "",
+]) + "\n"
+
+# Header and options together, so the whole screen is one write
+_MAIN_MENU_SCREEN = _HEADER_TOP + "RELOCATION OS - Main Menu" + _HEADER_BOT + _MAIN_MENU
+
+
 def show_main_menu():
     """Display the main menu and get user choice"""
-    print_header("RELOCATION OS - Main Menu")
-    print("RELOCATION PROFILES:")
-    print("  1. Create new relocation profile")
-    print("  2. View all profiles")
-    print("  3. View specific profile by ID")
-    print("  4. Update a profile")
-    print("  5. Delete a profile")
-    print("\nRELOCATION PHASES:")
-    print("  6. Create new phase")
-    print("  7. View all phases")
-    print("  8. Update a phase")
-    print("  9. Delete a phase")
-    print("\nTASKS:")
-    print("  10. Create new task")
-    print("  11. View all tasks")
-    print("  12. Update a task")
-    print("  13. Mark task as completed ✅")
-    print("  14. Delete a task")
-    print("\nEXPENSES:")
-    print("  15. Create new expense")
-    print("  16. View all expenses")
-    print("  17. Update an expense")
-    print("  18. Mark expense as paid 💰")
-    print("  19. Delete an expense")
-    print("  20. View budget summary 📊")
-    print("\nOTHER:")
-    print("  0. Exit")
-    print()
+    sys.stdout.write(_MAIN_MENU_SCREEN)
     
-    choice = input("Enter your choice: ").strip()
+    choice = _prompt("Enter your choice: ").strip()
     return choice
 
+# Main menu choice -> handler
+_DISPATCH = {
+    # Profile management
+    '1': menu_create_profile,
+    '2': menu_view_all_profiles,
+    '3': menu_view_profile_by_id,
+    '4': menu_update_profile,
+    '5': menu_delete_profile,
+    
+    # Phase management
+    '6': menu_create_phase,
+    '7': menu_view_all_phases,
+    '8': menu_update_phase,
+    '9': menu_delete_phase,
+    
+    # Task management
+    '10': menu_create_task,
+    '11': menu_view_all_tasks,
+    '12': menu_update_task,
+    '13': menu_mark_task_completed,
+    '14': menu_delete_task,
+    '21': menu_create_tasks_bulk,
+    
+    # Expense management
+    '15': menu_create_expense,
+    '16': menu_view_all_expenses,
+    '17': menu_update_expense,
+    '18': menu_mark_expense_paid,
+    '19': menu_delete_expense,
+    '20': menu_view_budget_summary,
+}
+
+
+def _load_history():
+    """Load prompt history from earlier runs - returns True if history is in use"""
+    if readline is None or not sys.stdin.isatty():
+        return False
+    
+    readline.set_history_length(HISTORY_LENGTH)
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass  # First run - no history yet
+    return True
+
+
+def _save_history():
+    """Write prompt history so the next run can recall it"""
+    try:
+        readline.write_history_file(HISTORY_FILE)
+    except OSError as e:
+        print(f"⚠️  Could not save prompt history: {e}")
+
+
 def run_menu():
     """Main menu loop"""
-    from models import init_database
+    # Flush at every newline, even when stdout is a pipe
+    sys.stdout.reconfigure(line_buffering=True)
+    if os.name == 'nt' and sys.stdout.isatty():
+        _enable_windows_ansi()
     
     # Initialize database on startup
     print_header("Starting Relocation OS")
@@ -1902,63 +1848,28 @@ def run_menu():
     init_database()
     print("✓ Ready!\n")
     
-    while True:
-        choice = show_main_menu()
-        
-        # Profile management
-        if choice == '1':
-            menu_create_profile()
-        elif choice == '2':
-            menu_view_all_profiles()
-        elif choice == '3':
-            menu_view_profile_by_id()
-        elif choice == '4':
-            menu_update_profile()
-        elif choice == '5':
-            menu_delete_profile()
-        
-        # Phase management
-        elif choice == '6':
-            menu_create_phase()
-        elif choice == '7':
-            menu_view_all_phases()
-        elif choice == '8':
-            menu_update_phase()
-        elif choice == '9':
-            menu_delete_phase()
-        
-        # Task management
-        elif choice == '10':
-            menu_create_task()
-        elif choice == '11':
-            menu_view_all_tasks()
-        elif choice == '12':
-            menu_update_task()
-        elif choice == '13':
-            menu_mark_task_completed()
-        elif choice == '14':
-            menu_delete_task()
-        
-        # Expense management
-        elif choice == '15':
-            menu_create_expense()
-        elif choice == '16':
-            menu_view_all_expenses()
-        elif choice == '17':
-            menu_update_expense()
-        elif choice == '18':
-            menu_mark_expense_paid()
-        elif choice == '19':
-            menu_delete_expense()
-        elif choice == '20':
-            menu_view_budget_summary()
-
-        # Exit
-        elif choice == '0':
-            print("\n👋 Goodbye! Your data is saved.\n")
-            break
-        else:
-            print("❌ Invalid choice. Please enter a valid option")
-        
-        # Wait for user to press Enter before showing menu again
-        input("\nPress Enter to continue...")
\ No newline at end of file
+    # Load the lists in the background while the user reads the menu
+    threading.Thread(target=warm_up, name='cache-warm-up', daemon=True).start()
+    
+    use_history = _load_history()
+    try:
+        while True:
+            choice = show_main_menu()
+            
+            handler = _DISPATCH.get(choice)
+            if handler:
+                # Lookups by ID are only remembered for the length of one action
+                with request_scope():
+                    handler()
+            elif choice == '0':
+                print("\n👋 Goodbye! Your data is saved.\n")
+                break
+            else:
+                print("❌ Invalid choice. Please enter a valid option")
+            
+            # Wait for user to press Enter before showing menu again
+            _prompt("\nPress Enter to continue...")
+    finally:
+        # Also on Ctrl+C / Ctrl+D, so the session's history isn't lost
+        if use_history:
+            _save_history()
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Short-lived in-memory cache for the lists shown on menu screens
+Menu actions that change data call the matching invalidate_* function
+The cached_* functions return a new list each time, so callers can sort
+or filter it without changing the cached one - but the items are shared:
+summaries are read-only rows, expenses are the cached Expense objects
+themselves, so don't modify them
+"""
+
+import time
+from functools import lru_cache
+
+from database import list_profile_summaries
+from phase_operations import list_phase_summaries
+from task_operations import list_task_summaries
+from expense_operations import get_all_expenses, get_unpaid_expenses_with_overdue
+
+
+# Entries also expire after this many seconds, in case another process
+# (e.g. the web app) changed the database in the meantime
+CACHE_TTL = 2.0
+
+
+def _ttl_bucket():
+    """Changes value every CACHE_TTL seconds, so older cache entries stop matching"""
+    return int(time.monotonic() // CACHE_TTL)
+
+
+@lru_cache(maxsize=8)
+def _profile_summaries(bucket):
+    return list_profile_summaries()
+
+
+@lru_cache(maxsize=8)
+def _phase_summaries(bucket, relocation_profile_id):
+    return list_phase_summaries(relocation_profile_id=relocation_profile_id)
+
+
+@lru_cache(maxsize=8)
+def _task_summaries(bucket, relocation_profile_id, phase_id, status):
+    return list_task_summaries(relocation_profile_id=relocation_profile_id, phase_id=phase_id, status=status)
+
+
+@lru_cache(maxsize=8)
+def _all_expenses(bucket, relocation_profile_id, phase_id, payment_status):
+    return get_all_expenses(relocation_profile_id=relocation_profile_id, phase_id=phase_id,
+                            payment_status=payment_status)
+
+
+@lru_cache(maxsize=2)
+def _unpaid_expenses(bucket):
+    return get_unpaid_expenses_with_overdue()
+
+
+def cached_profile_summaries():
+    """Cached version of list_profile_summaries"""
+    return list(_profile_summaries(_ttl_bucket()))
+
+
+def cached_phase_summaries(relocation_profile_id=None):
+    """Cached version of list_phase_summaries"""
+    return list(_phase_summaries(_ttl_bucket(), relocation_profile_id))
+
+
+def cached_task_summaries(relocation_profile_id=None, phase_id=None, status=None):
+    """Cached version of list_task_summaries"""
+    return list(_task_summaries(_ttl_bucket(), relocation_profile_id, phase_id, status))
+
+
+def cached_all_expenses(relocation_profile_id=None, phase_id=None, payment_status=None):
+    """Cached version of get_all_expenses - the Expense objects are shared, don't modify them"""
+    return list(_all_expenses(_ttl_bucket(), relocation_profile_id, phase_id, payment_status))
+
+
+def cached_unpaid_expenses():
+    """Cached version of get_unpaid_expenses_with_overdue - the Expense objects are shared, don't modify them"""
+    return list(_unpaid_expenses(_ttl_bucket()))
+
+
+def invalidate_expenses():
+    """Forget cached expense lists after an expense is created, changed or deleted"""
+    _all_expenses.cache_clear()
+    _unpaid_expenses.cache_clear()
+
+
+def warm_up():
+    """
+    Fill the caches ahead of the first menu action
+    Also pays the one-off cost of the first query (mapper setup, statement
+    compilation, opening a connection) - safe to run on a background thread
+    """
+    try:
+        cached_profile_summaries()
+        cached_phase_summaries()
+        cached_task_summaries()
+        cached_all_expenses()
+        cached_unpaid_expenses()
+    except Exception:
+        pass  # Only an optimization - the menu loads everything on demand anyway
+
+
+def invalidate_tasks():
+    """Forget cached task lists - expenses may point at a deleted task"""
+    _task_summaries.cache_clear()
+    invalidate_expenses()
+
+
+def invalidate_phases():
+    """Forget cached phase lists - deleting a phase also deletes its tasks and expenses"""
+    _phase_summaries.cache_clear()
+    invalidate_tasks()
+
+
+def invalidate_profiles():
+    """Forget cached profile lists - deleting a profile also deletes everything under it"""
+    _profile_summaries.cache_clear()
+    invalidate_phases()
\ No newline at end of file
@@ -3,8 +3,12 @@ Database Models for Relocation OS
 Defines the structure of our data
 """
 
+import os
+from contextlib import contextmanager
 from datetime import date
-from sqlalchemy import create_engine, Column, Integer, String, Date, Boolean, Text, ForeignKey
+from pathlib import Path
+from sqlalchemy import create_engine, event, Column, Integer, String, Date, Boolean, Text, ForeignKey, Index, and_, func, text
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 
@@ -39,26 +43,35 @@ class RelocationProfile(Base):
     
     # Additional info
     notes = Column(Text, nullable=True)
+    
     # Relationship - easy access to all phases for this profile
-    phases = relationship("RelocationPhase", back_populates="relocation_profile", cascade="all, delete-orphan")
+    phases = relationship("RelocationPhase", back_populates="relocation_profile", cascade="all, delete-orphan",
+                          order_by="RelocationPhase.order_index")
     # Relationship - easy access to all tasks for this profile
     tasks = relationship("Task", back_populates="relocation_profile", cascade="all, delete-orphan")
+    # Relationship - all expenses for this profile
+    expenses = relationship("Expense", back_populates="relocation_profile", cascade="all, delete-orphan")
+    # Relationship - expense categories
+    expense_categories = relationship("ExpenseCategory", back_populates="relocation_profile", cascade="all, delete-orphan")
+    
     def __repr__(self):
         """
         String representation of the object
         Helpful for debugging - shows you what's in the object
         """
         return f"<RelocationProfile(name='{self.relocation_name}', {self.origin_country} → {self.destination_country})>"
-    # Relationship - all expenses for this profile
-    expenses = relationship("Expense", back_populates="relocation_profile", cascade="all, delete-orphan")
-    # Relationship - expense categories
-    expense_categories = relationship("ExpenseCategory", back_populates="relocation_profile", cascade="all, delete-orphan")
+
+
 class RelocationPhase(Base):
     """
     Represents a phase/stage in the relocation timeline
     Phases help organize tasks and expenses by time period
     """
     __tablename__ = 'relocation_phases'
+    __table_args__ = (
+        # Per-profile phase listings, already in order_index order
+        Index('ix_phase_profile', 'relocation_profile_id', 'order_index'),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -77,17 +90,28 @@ class RelocationPhase(Base):
     relocation_profile = relationship("RelocationProfile", back_populates="phases")
     # Relationship - easy access to all tasks in this phase
     tasks = relationship("Task", back_populates="phase", cascade="all, delete-orphan")
+    # Relationship - expenses in this phase
+    expenses = relationship("Expense", back_populates="phase", cascade="all, delete-orphan")
+    
     def __repr__(self):
         """String representation for debugging"""
         return f"<RelocationPhase(name='{self.name}', months={self.relative_start_month} to {self.relative_end_month})>"
-    # Relationship - expenses in this phase
-    expenses = relationship("Expense", back_populates="phase", cascade="all, delete-orphan")
+
+
 class Task(Base):
     """
     Represents a task/action item in the relocation process
     Tasks belong to phases and help track what needs to be done
     """
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # get_all_tasks filters on any mix of profile, phase and status
+        Index('ix_task_profile_phase_status', 'relocation_profile_id', 'phase_id', 'status'),
+        Index('ix_task_phase_status', 'phase_id', 'status'),
+        Index('ix_task_status', 'status'),
+        # Unfiltered listings, in get_all_tasks order
+        Index('ix_task_critical_planned', text('critical DESC'), 'planned_date', 'id'),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -112,19 +136,29 @@ class Task(Base):
     # Relationships
     phase = relationship("RelocationPhase", back_populates="tasks")
     relocation_profile = relationship("RelocationProfile", back_populates="tasks")
+    # Expenses related to this task
+    expenses = relationship("Expense", back_populates="related_task")
     
     def __repr__(self):
         """String representation for debugging"""
         return f"<Task(title='{self.title}', status='{self.status}', critical={self.critical})>"
-    # Database setup functions
-    # Relationship - expenses related to this task
-    expenses = relationship("Expense", back_populates="related_task")
+
+
 class Expense(Base):
     """
     Represents an expense/cost in the relocation process
     Tracks estimated vs actual costs with multi-currency support
     """
     __tablename__ = 'expenses'
+    __table_args__ = (
+        # Cover the profile filters and the (due_date, title) ordering used by listings
+        Index('ix_expense_profile_due', 'relocation_profile_id', 'due_date', 'title'),
+        Index('ix_expense_profile_status', 'relocation_profile_id', 'payment_status'),
+        Index('ix_expense_profile_phase', 'relocation_profile_id', 'phase_id'),
+        # Phase-only and status-only filters (e.g. all unpaid expenses by due date)
+        Index('ix_expense_phase_status', 'phase_id', 'payment_status'),
+        Index('ix_expense_status_due', 'payment_status', 'due_date'),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -156,7 +190,7 @@ class Expense(Base):
     # Foreign keys
     phase_id = Column(Integer, ForeignKey('relocation_phases.id'), nullable=False)
     relocation_profile_id = Column(Integer, ForeignKey('relocation_profiles.id'), nullable=False)
-    related_task_id = Column(Integer, ForeignKey('tasks.id'), nullable=True)  # Optional link to task
+    related_task_id = Column(Integer, ForeignKey('tasks.id'), nullable=True, index=True)  # Optional link to task
     
     # Relationships
     phase = relationship("RelocationPhase", back_populates="expenses")
@@ -168,34 +202,63 @@ class Expense(Base):
         amount = self.actual_amount if self.actual_amount else self.estimated_amount
         return f"<Expense(title='{self.title}', amount={amount/100:.2f} {self.currency}, status='{self.payment_status}')>"
     
-    @property
-    def total_primary_currency(self):
-        """Calculate total in primary currency using exchange rate"""
+    @hybrid_property
+    def total_primary_currency_cents(self):
+        """Total in primary currency cents using exchange rate, rounded half up in integer math"""
         amount = self.actual_amount if self.actual_amount else self.estimated_amount
         if self.exchange_rate:
-            return (amount * self.exchange_rate) / 10000  # Divide by 10000 because both are in cents
-        return amount / 100  # If no exchange rate, assume same currency
+            return (amount * self.exchange_rate + 5000) // 10000  # Both are in cents
+        return amount  # If no exchange rate, assume same currency
+    
+    @total_primary_currency_cents.expression
+    def total_primary_currency_cents(cls):
+        """SQL form of total_primary_currency_cents, so totals can be summed in the database"""
+        amount = func.coalesce(func.nullif(cls.actual_amount, 0), cls.estimated_amount)
+        rate = func.coalesce(func.nullif(cls.exchange_rate, 0), 10000)
+        return (amount * rate + 5000) // 10000
     
     @property
+    def total_primary_currency(self):
+        """Calculate total in primary currency using exchange rate"""
+        return self.total_primary_currency_cents / 100
+    
+    @hybrid_property
     def variance(self):
         """Calculate variance between estimated and actual"""
         if self.actual_amount is None:
             return None
         return (self.actual_amount - self.estimated_amount) / 100
     
-    @property
+    @variance.expression
+    def variance(cls):
+        """SQL form of variance - NULL when there is no actual amount"""
+        return (cls.actual_amount - cls.estimated_amount) / 100.0
+    
+    @hybrid_property
     def is_overdue(self):
         """Check if expense is overdue"""
         if not self.due_date or self.payment_status == 'paid':
             return False
-        from datetime import date
         return date.today() > self.due_date
     
+    @is_overdue.expression
+    def is_overdue(cls):
+        """SQL form of is_overdue, usable in filters and aggregates"""
+        return and_(
+            cls.due_date.isnot(None),
+            cls.due_date < date.today(),
+            cls.payment_status.is_distinct_from('paid')
+        )
+
+
 class ExpenseCategory(Base):
     """
     User-defined expense categories
     """
     __tablename__ = 'expense_categories'
+    __table_args__ = (
+        Index('ix_cat_profile_name', 'relocation_profile_id', 'name'),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -213,16 +276,48 @@ class ExpenseCategory(Base):
     def __repr__(self):
         """String representation for debugging"""
         return f"<ExpenseCategory(name='{self.name}')>"
+
+
+class ExchangeRate(Base):
+    """
+    Exchange rates fetched from the API, kept per day
+    Lets repeat runs on the same day reuse rates without any HTTP calls
+    """
+    __tablename__ = 'exchange_rates'
+    
+    # Composite primary key - one rate per currency pair per day
+    from_currency = Column(String(3), primary_key=True)
+    to_currency = Column(String(3), primary_key=True)
+    rate_date = Column(Date, primary_key=True)
     
+    # Rate stored in our cent format (e.g., 9200 for 0.92)
+    rate_cents = Column(Integer, nullable=False)
+    
+    # Last-Modified header from the API, used to revalidate the rate next day
+    last_modified = Column(String(64), nullable=True)
+    
+    def __repr__(self):
+        """String representation for debugging"""
+        return f"<ExchangeRate({self.from_currency}->{self.to_currency} {self.rate_date}: {self.rate_cents})>"
+
+
+# Engines are cached per database path so every CRUD call reuses the same
+# connection pool instead of building a new Engine each time
+_ENGINES = {}
+
+
 def get_engine(db_path=None):
     """
     Creates a connection to the database
     If the database doesn't exist, it will be created
+    The engine is created once per path and reused on later calls
     """
+    engine = _ENGINES.get(db_path)
+    if engine is not None:
+        return engine
+    
+    cache_key = db_path
     if db_path is None:
-        import os
-        from pathlib import Path
-        
         # Check if we're running on Railway or other cloud platforms
         # Railway, Heroku, and most cloud platforms set PORT env variable
         if os.environ.get('PORT') or os.environ.get('RAILWAY_ENVIRONMENT') or os.environ.get('DYNO'):
@@ -247,23 +342,100 @@ def get_engine(db_path=None):
             db_path = data_dir / 'relocation.db'
             print(f"✓ Development mode - using {db_path}")
     
-    return create_engine(f'sqlite:///{db_path}', echo=False)
+    # A full database URL can be passed instead of a SQLite file path
+    url = str(db_path) if '://' in str(db_path) else f'sqlite:///{db_path}'
+    
+    if url.startswith('sqlite'):
+        # SQLite files are cheap to open and only allow one writer, so keep a
+        # small pool; connections may be handed between threads by the pool
+        engine = create_engine(
+            url,
+            echo=False,
+            pool_size=5,
+            max_overflow=10,
+            connect_args={'check_same_thread': False}
+        )
+        event.listen(engine, 'connect', _set_sqlite_pragmas)
+    else:
+        # Server databases benefit from a larger pool with liveness checks
+        engine = create_engine(
+            url,
+            echo=False,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_use_lifo=True
+        )
+    
+    _ENGINES[cache_key] = engine
+    return engine
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Runs on every new SQLite connection
+    WAL lets readers work alongside a writer, and synchronous=NORMAL avoids
+    an fsync on every commit (still safe in WAL mode). Temporary sort
+    tables stay in memory, and each connection gets a 16 MB page cache
+    Foreign keys are enforced, so inserts don't need to check the parent
+    row exists first (SQLite leaves this off unless asked)
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-16000")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
 
-def init_database(db_path='data/relocation.db'):
+
+def init_database(db_path=None):
     """
     Initialize the database - creates all tables
     Call this once when setting up the app
+    By default this is the same database (and engine) get_engine() returns
+    to the rest of the app
     """
     engine = get_engine(db_path)
     Base.metadata.create_all(engine)
-    print(f"✓ Database initialized at {db_path}")
+    
+    # create_all skips tables that already exist, so add any indexes
+    # introduced after the database was first created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    
+    print(f"✓ Database initialized at {engine.url.database}")
     return engine
 
 
-def get_session(engine):
+# Shared session factory - objects stay usable after commit so callers
+# don't need to re-query them once the session is closed
+SessionLocal = sessionmaker(expire_on_commit=False)
+
+
+def get_session(engine=None):
     """
     Creates a session to interact with the database
     Think of it as opening a conversation with your database
+    Uses the shared engine from get_engine() unless one is given
+    """
+    return SessionLocal(bind=engine if engine is not None else get_engine())
+
+
+@contextmanager
+def session_scope():
+    """
+    Provides a transactional scope around a series of operations
+    Commits on success, rolls back on error and always closes the session
     """
-    Session = sessionmaker(bind=engine)
-    return Session()
\ No newline at end of file
+    session = SessionLocal(bind=get_engine())
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
\ No newline at end of file
@@ -2,10 +2,24 @@
 Database operations for Relocation Phases
 """
 
-from models import RelocationPhase, get_engine, get_session
+import logging
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import selectinload
+from models import RelocationPhase, Task, session_scope
+from request_scope import scoped_lookup, clears_request_scope
+from display import write_batched
 from database import get_profile_by_id
 
+logger = logging.getLogger(__name__)
 
+# Column names accepted by update_phase and update_phase_fast
+_PHASE_COLS = frozenset(c.name for c in RelocationPhase.__table__.columns) - {'id'}
+
+# Separator used by display_phase
+_DIV = "-" * 50
+
+
+@clears_request_scope
 def create_phase(relocation_profile_id, name, relative_start_month, relative_end_month, 
                  order_index, description=None):
     """
@@ -22,14 +36,7 @@ def create_phase(relocation_profile_id, name, relative_start_month, relative_end
     Returns:
         The created RelocationPhase object
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        # Verify the profile exists
-        profile = session.query(RelocationPhase).filter_by(id=relocation_profile_id).first()
-        # Note: We're not using get_profile_by_id here because it closes its own session
-        
+    with session_scope() as session:
         phase = RelocationPhase(
             relocation_profile_id=relocation_profile_id,
             name=name,
@@ -40,131 +47,255 @@ def create_phase(relocation_profile_id, name, relative_start_month, relative_end
         )
         
         session.add(phase)
-        session.commit()
-        
-        print(f"✓ Created phase: {phase.name}")
-        print(f"  ID: {phase.id}")
-        
-        phase_id = phase.id
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error creating phase: {e}")
-        raise
-    finally:
-        session.close()
     
-    return get_phase_by_id(phase_id)
+    logger.debug("Created phase %s (ID %s)", phase.name, phase.id)
+    
+    return phase
+
+
+# Typical phases of a relocation, in order - used to set up a new profile quickly
+DEFAULT_PHASES = (
+    dict(name="Research & Planning", relative_start_month=-12, relative_end_month=-6,
+         description="Choose a destination, budget, and check visa requirements"),
+    dict(name="Paperwork & Visas", relative_start_month=-6, relative_end_month=-3,
+         description="Apply for visas, gather documents, get translations"),
+    dict(name="Pre-departure", relative_start_month=-3, relative_end_month=0,
+         description="Book travel, arrange shipping, close or move accounts"),
+    dict(name="Arrival", relative_start_month=0, relative_end_month=1,
+         description="Temporary housing, registration, phone and bank account"),
+    dict(name="Settling In", relative_start_month=1, relative_end_month=6,
+         description="Long-term housing, schools, healthcare, local admin"),
+)
+
+
+@clears_request_scope
+def create_phases_bulk(relocation_profile_id, phases):
+    """
+    Create many phases for a profile in a single transaction
+    
+    Args:
+        relocation_profile_id: ID of the profile the phases belong to
+        phases: List of dicts with the create_phase arguments (without the profile ID)
+                - order_index defaults to numbering them in list order, after
+                the profile's existing phases
+    
+    Returns:
+        List of created RelocationPhase objects (with their IDs populated)
+    """
+    if not phases:
+        return []
+    
+    with session_scope() as session:
+        created = insert_phases(session, relocation_profile_id, phases)
+    
+    logger.debug("Created %d phase(s)", len(created))
+    
+    return created
 
 
-def get_all_phases(relocation_profile_id=None):
+def insert_phases(session, relocation_profile_id, phases):
+    """
+    create_phases_bulk in the caller's transaction, for operations that
+    create phases together with other rows - nothing is committed here
+    
+    Returns:
+        List of created RelocationPhase objects, in the same order as phases
+    """
+    start = _next_phase_order(session, relocation_profile_id)
+    records = [
+        {'relocation_profile_id': relocation_profile_id, 'order_index': index, **phase}
+        for index, phase in enumerate(phases, start=start)
+    ]
+    # One multi-row INSERT ... RETURNING, rows in the same order as phases
+    statement = insert(RelocationPhase).returning(RelocationPhase, sort_by_parameter_order=True)
+    return session.scalars(statement, records).all()
+
+
+def get_all_phases(relocation_profile_id=None, limit=None, offset=None, eager=False):
     """
     Get all phases, optionally filtered by profile
     
     Args:
         relocation_profile_id: Optional - only get phases for this profile
+        limit: Optional - return at most this many phases
+        offset: Optional - skip this many phases first
+        eager: Also load phase.tasks (with each task's expenses) and
+               phase.expenses - one extra query per relationship, however
+               many phases there are
     
     Returns:
         List of RelocationPhase objects, sorted by order_index
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         query = session.query(RelocationPhase)
         
+        if eager:
+            query = query.options(
+                selectinload(RelocationPhase.tasks).selectinload(Task.expenses),
+                selectinload(RelocationPhase.expenses)
+            )
+        
         if relocation_profile_id:
             query = query.filter_by(relocation_profile_id=relocation_profile_id)
         
-        phases = query.order_by(RelocationPhase.order_index).all()
+        query = query.order_by(RelocationPhase.order_index, RelocationPhase.id)
+        return query.limit(limit).offset(offset).all()
+
+
+def list_phase_summaries(relocation_profile_id=None):
+    """
+    Retrieve just the fields needed to list and pick phases in a menu
+    
+    Args:
+        relocation_profile_id: Optional - only get phases for this profile
+    
+    Returns:
+        List of (id, name, relocation_profile_id, relative_start_month,
+        relative_end_month) rows, sorted by order_index
+    """
+    with session_scope() as session:
+        query = session.query(
+            RelocationPhase.id,
+            RelocationPhase.name,
+            RelocationPhase.relocation_profile_id,
+            RelocationPhase.relative_start_month,
+            RelocationPhase.relative_end_month
+        )
         
-        # Load the data while session is open
-        result = []
-        for phase in phases:
-            # Access attributes to load them
-            _ = (phase.id, phase.name, phase.relocation_profile_id)
-            result.append(phase)
+        if relocation_profile_id:
+            query = query.filter_by(relocation_profile_id=relocation_profile_id)
         
-        return result
-    finally:
-        session.close()
+        return query.order_by(RelocationPhase.order_index).all()
 
 
+def get_next_phase_order(relocation_profile_id):
+    """
+    Get the order_index for a new phase - one past the profile's highest,
+    so it stays unique even after a phase in the middle was deleted
+    
+    Returns:
+        The next order_index (1 for a profile without phases)
+    """
+    with session_scope() as session:
+        return _next_phase_order(session, relocation_profile_id)
+
+
+def _next_phase_order(session, relocation_profile_id):
+    """get_next_phase_order in the caller's transaction"""
+    statement = (
+        select(func.coalesce(func.max(RelocationPhase.order_index), 0) + 1)
+        .where(RelocationPhase.relocation_profile_id == relocation_profile_id)
+    )
+    return session.scalar(statement)
+
+
+@scoped_lookup
 def get_phase_by_id(phase_id):
     """Get a specific phase by ID"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        phase = session.query(RelocationPhase).filter_by(id=phase_id).first()
-        if phase:
-            # Load attributes before session closes
-            _ = (phase.id, phase.name, phase.relocation_profile_id)
-        return phase
-    finally:
-        session.close()
+    with session_scope() as session:
+        return session.get(RelocationPhase, phase_id)
 
 
+@clears_request_scope
 def update_phase(phase_id, **kwargs):
-    """Update an existing phase"""
-    engine = get_engine()
-    session = get_session(engine)
+    """
+    Update an existing phase with a single UPDATE ... RETURNING statement
+    Unknown fields are skipped with a warning
     
-    try:
-        phase = session.query(RelocationPhase).filter_by(id=phase_id).first()
-        
-        if not phase:
-            print(f"❌ No phase found with ID {phase_id}")
-            return None
-        
-        for key, value in kwargs.items():
-            if hasattr(phase, key):
-                setattr(phase, key, value)
-                print(f"  ✓ Updated {key}")
-            else:
-                print(f"  ⚠️  Unknown field: {key}")
-        
-        session.commit()
-        print(f"\n✓ Phase {phase_id} updated successfully!")
-        
-        phase_id_copy = phase.id
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error updating phase: {e}")
-        raise
-    finally:
-        session.close()
+    Returns:
+        Updated RelocationPhase object, or None if not found
+    """
+    values = {}
+    for key, value in kwargs.items():
+        if key in _PHASE_COLS:
+            values[key] = value
+        else:
+            logger.warning("Unknown phase field: %s", key)
+    
+    if not values:
+        # Nothing to write - just hand back the phase as it is
+        phase = get_phase_by_id(phase_id)
+    else:
+        with session_scope() as session:
+            statement = (
+                update(RelocationPhase)
+                .where(RelocationPhase.id == phase_id)
+                .values(values)
+                .returning(RelocationPhase)
+            )
+            phase = session.scalars(statement).first()
     
-    return get_phase_by_id(phase_id_copy)
+    if not phase:
+        logger.warning("No phase found with ID %s", phase_id)
+        return None
+    
+    logger.debug("Updated phase %s: %s", phase_id, ", ".join(values))
+    
+    return phase
 
 
+@clears_request_scope
+def update_phase_fast(phase_id, **kwargs):
+    """
+    Update a phase with a single UPDATE statement, without loading it first
+    Use update_phase if you need the updated phase back
+    
+    Returns:
+        True if the phase was updated, False if it was not found
+        (or there was nothing to update)
+    """
+    if not kwargs:
+        return False
+    
+    unknown = [key for key in kwargs if key not in _PHASE_COLS]
+    if unknown:
+        raise ValueError(f"Unknown phase field(s): {', '.join(unknown)}")
+    
+    with session_scope() as session:
+        updated = session.query(RelocationPhase).filter_by(id=phase_id).update(
+            kwargs, synchronize_session=False
+        )
+    
+    if not updated:
+        logger.warning("No phase found with ID %s", phase_id)
+        return False
+    
+    return True
+
+
+@clears_request_scope
 def delete_phase(phase_id):
     """Delete a phase"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        phase = session.query(RelocationPhase).filter_by(id=phase_id).first()
+    with session_scope() as session:
+        phase = session.get(RelocationPhase, phase_id)
         
         if not phase:
-            print(f"❌ No phase found with ID {phase_id}")
+            logger.warning("No phase found with ID %s", phase_id)
             return False
         
         phase_name = phase.name
         
         session.delete(phase)
-        session.commit()
-        
-        print(f"✓ Deleted phase: {phase_name} (ID: {phase_id})")
-        return True
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error deleting phase: {e}")
-        raise
-    finally:
-        session.close()
+    
+    logger.debug("Deleted phase %s (ID %s)", phase_name, phase_id)
+    return True
+
+
+def format_phase(phase):
+    """Build the display text for a phase (without a trailing newline)"""
+    lines = [
+        "\n" + _DIV,
+        f"PHASE: {phase.name}",
+        _DIV,
+        f"ID: {phase.id}",
+        f"Timeline: Month {phase.relative_start_month} to {phase.relative_end_month}",
+        f"Order: {phase.order_index}",
+    ]
+    if phase.description:
+        lines.append(f"Description: {phase.description}")
+    lines.append(f"Profile ID: {phase.relocation_profile_id}")
+    lines.append(_DIV + "\n")
+    return "\n".join(lines)
 
 
 def display_phase(phase):
@@ -173,13 +304,12 @@ def display_phase(phase):
         print("No phase found")
         return
     
-    print("\n" + "-" * 50)
-    print(f"PHASE: {phase.name}")
-    print("-" * 50)
-    print(f"ID: {phase.id}")
-    print(f"Timeline: Month {phase.relative_start_month} to {phase.relative_end_month}")
-    print(f"Order: {phase.order_index}")
-    if phase.description:
-        print(f"Description: {phase.description}")
-    print(f"Profile ID: {phase.relocation_profile_id}")
-    print("-" * 50 + "\n")
\ No newline at end of file
+    print(format_phase(phase))
+
+
+def display_phases_bulk(phases, batch_size=50):
+    """
+    Pretty print many phases, writing them to stdout in batches
+    Returns the number of phases displayed
+    """
+    return write_batched(phases, format_phase, batch_size)
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Per-action memoization of get-by-ID lookups
+Inside a request_scope() block, repeated lookups of the same ID reuse the
+first result instead of querying the database again
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+# Results remembered for the current scope - None when no scope is active
+_scope = ContextVar('request_scope', default=None)
+
+
+@contextmanager
+def request_scope():
+    """Remember get-by-ID results until the block ends"""
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def clear_request_scope():
+    """Forget everything remembered in the current scope"""
+    cache = _scope.get()
+    if cache is not None:
+        cache.clear()
+
+
+def scoped_lookup(fn):
+    """Decorator for get-by-ID functions - reuses results within a request_scope()"""
+    @wraps(fn)
+    def wrapper(item_id):
+        cache = _scope.get()
+        if cache is None:
+            return fn(item_id)
+        
+        key = (fn.__name__, item_id)
+        if key not in cache:
+            cache[key] = fn(item_id)
+        return cache[key]
+    
+    return wrapper
+
+
+def clears_request_scope(fn):
+    """Decorator for functions that write data - remembered lookups may be stale afterwards"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        # Cleared before as well, so lookups made by the function itself are fresh
+        clear_request_scope()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            clear_request_scope()
+    
+    return wrapper
\ No newline at end of file
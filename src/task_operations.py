@@ -2,12 +2,39 @@
 Database operations for Tasks
 """
 
+import logging
 from datetime import date
-from models import Task, get_engine, get_session
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import joinedload, selectinload
+from models import Task, session_scope
+from request_scope import scoped_lookup, clears_request_scope
+from display import write_batched
 from database import get_profile_by_id
-from phase_operations import get_phase_by_id
+from phase_operations import get_phase_by_id, insert_phases
 
+logger = logging.getLogger(__name__)
 
+# Column names accepted by update_task
+_TASK_COLS = frozenset(c.name for c in Task.__table__.columns) - {'id'}
+
+# Columns selected by get_all_tasks_summary unless others are asked for
+_SUMMARY_COLS = (
+    Task.id, Task.title, Task.status, Task.critical, Task.planned_date,
+    Task.phase_id, Task.relocation_profile_id
+)
+
+# Separator used by format_task
+_DIV = "-" * 50
+
+# Status emoji used by format_task
+_STATUS_EMOJI = {
+    'not_started': '⏸️',
+    'in_progress': '🔄',
+    'completed': '✅'
+}
+
+
+@clears_request_scope
 def create_task(relocation_profile_id, phase_id, title, description=None, 
                 status='not_started', critical=False, planned_date=None, notes=None):
     """
@@ -26,10 +53,7 @@ def create_task(relocation_profile_id, phase_id, title, description=None,
     Returns:
         The created Task object
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         task = Task(
             relocation_profile_id=relocation_profile_id,
             phase_id=phase_id,
@@ -42,192 +66,327 @@ def create_task(relocation_profile_id, phase_id, title, description=None,
         )
         
         session.add(task)
-        session.commit()
-        
-        print(f"✓ Created task: {task.title}")
-        print(f"  ID: {task.id}")
+    
+    logger.debug("Created task %s (ID %s)", task.title, task.id)
+    
+    return task
+
+
+@clears_request_scope
+def create_tasks_bulk(records):
+    """
+    Create many tasks in a single transaction
+    
+    Args:
+        records: List of dicts with the same keys as create_task arguments
+    
+    Returns:
+        List of created Task objects (with their IDs populated)
+    """
+    records = list(records)
+    if not records:
+        return []
+    
+    with session_scope() as session:
+        tasks = _insert_tasks(session, records)
+    
+    logger.debug("Created %d task(s)", len(tasks))
+    
+    return tasks
+
+
+def _insert_tasks(session, records):
+    """Insert tasks in the caller's transaction - see create_tasks_bulk"""
+    # One multi-row INSERT ... RETURNING instead of building and flushing
+    # each object - rows come back in the same order as records
+    statement = insert(Task).returning(Task, sort_by_parameter_order=True)
+    return session.scalars(statement, records).all()
+
+
+@clears_request_scope
+def seed_phases_and_tasks(relocation_profile_id, phases, tasks=()):
+    """
+    Create a profile's phases and their tasks in a single transaction,
+    so setting up a plan costs one commit instead of one per phase and task
+    
+    Args:
+        relocation_profile_id: ID of the profile to seed
+        phases: List of dicts with the create_phase arguments (without the
+                profile ID) - order_index defaults to numbering them in list
+                order, after the profile's existing phases
+        tasks: List of dicts with the create_task arguments, where 'phase' is
+               the index into phases instead of a phase_id
+    
+    Returns:
+        (created phases, created tasks) - both lists in input order
+    """
+    tasks = list(tasks)
+    if not phases:
+        return [], []
+    
+    with session_scope() as session:
+        created_phases = insert_phases(session, relocation_profile_id, phases)
         
-        task_id = task.id
+        records = []
+        for task in tasks:
+            task = dict(task)
+            task['phase_id'] = created_phases[task.pop('phase')].id
+            records.append({'relocation_profile_id': relocation_profile_id, **task})
         
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error creating task: {e}")
-        raise
-    finally:
-        session.close()
+        created_tasks = _insert_tasks(session, records) if records else []
+    
+    logger.debug("Seeded %d phase(s) and %d task(s)", len(created_phases), len(created_tasks))
+    
+    return created_phases, created_tasks
+
+
+def _filter_tasks(query, relocation_profile_id, phase_id, status):
+    """Apply the shared task filters, ordered critical first then by planned date"""
+    if relocation_profile_id:
+        query = query.filter_by(relocation_profile_id=relocation_profile_id)
+    
+    if phase_id:
+        query = query.filter_by(phase_id=phase_id)
     
-    return get_task_by_id(task_id)
+    if isinstance(status, (list, tuple)):
+        query = query.filter(Task.status.in_(status))
+    elif status:
+        query = query.filter_by(status=status)
+    
+    # ID last keeps pages stable
+    return query.order_by(Task.critical.desc(), Task.planned_date, Task.id)
 
 
-def get_all_tasks(relocation_profile_id=None, phase_id=None, status=None):
+def get_all_tasks(relocation_profile_id=None, phase_id=None, status=None, eager=False,
+                  limit=None, offset=None):
     """
     Get all tasks, optionally filtered
     
     Args:
         relocation_profile_id: Filter by profile
         phase_id: Filter by phase
-        status: Filter by status (not_started, in_progress, completed)
+        status: Filter by status (not_started, in_progress, completed),
+                or a list/tuple of statuses to match any of them
+        eager: Also load task.phase and task.relocation_profile in the same
+               query, and task.expenses with one more - set this if you
+               need them, the tasks are detached once returned
+        limit: Optional - return at most this many tasks
+        offset: Optional - skip this many tasks first
     
     Returns:
         List of Task objects
     """
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
+    with session_scope() as session:
         query = session.query(Task)
         
-        if relocation_profile_id:
-            query = query.filter_by(relocation_profile_id=relocation_profile_id)
+        if eager:
+            query = query.options(
+                joinedload(Task.phase),
+                joinedload(Task.relocation_profile),
+                selectinload(Task.expenses)
+            )
         
-        if phase_id:
-            query = query.filter_by(phase_id=phase_id)
-        
-        if status:
-            query = query.filter_by(status=status)
-        
-        # Order by: critical first, then by planned date
-        tasks = query.order_by(Task.critical.desc(), Task.planned_date).all()
+        query = _filter_tasks(query, relocation_profile_id, phase_id, status)
+        return query.limit(limit).offset(offset).all()
+
+
+def get_all_tasks_summary(relocation_profile_id=None, phase_id=None, status=None,
+                          limit=None, offset=None, columns=_SUMMARY_COLS):
+    """
+    Get tasks for list views as plain rows instead of Task objects
+    Only the columns a task row shows are selected, and no ORM objects are
+    built - use get_all_tasks when the full task is needed
+    
+    Args:
+        relocation_profile_id: Filter by profile
+        phase_id: Filter by phase
+        status: Filter by status, or a list/tuple of statuses
+        limit: Optional - return at most this many rows
+        offset: Optional - skip this many rows first
+        columns: Task columns to select - by default id, title, status,
+                 critical, planned_date, phase_id and relocation_profile_id
+    
+    Returns:
+        List of rows with an attribute per column (row._asdict() gives a
+        dict), in get_all_tasks order
+    """
+    with session_scope() as session:
+        statement = _filter_tasks(select(*columns), relocation_profile_id, phase_id, status)
         
-        # Load data while session is open
-        result = []
-        for task in tasks:
-            _ = (task.id, task.title, task.status)
-            result.append(task)
+        return session.execute(statement.limit(limit).offset(offset)).all()
+
+
+def count_tasks(relocation_profile_id=None, phase_id=None, status=None):
+    """
+    Count tasks with a single COUNT query, using the get_all_tasks filters
+    
+    Returns:
+        Number of matching tasks
+    """
+    with session_scope() as session:
+        statement = _filter_tasks(select(func.count()).select_from(Task),
+                                  relocation_profile_id, phase_id, status)
         
-        return result
-    finally:
-        session.close()
+        # The row order doesn't matter for a count
+        return session.scalar(statement.order_by(None))
+
+
+def list_task_summaries(relocation_profile_id=None, phase_id=None, status=None):
+    """
+    Retrieve just the fields needed to list and pick tasks in a menu
+    
+    Args:
+        relocation_profile_id: Filter by profile
+        phase_id: Filter by phase
+        status: Filter by status, or a list/tuple of statuses
+    
+    Returns:
+        List of (id, title, status, critical) rows, in get_all_tasks order
+    """
+    return get_all_tasks_summary(relocation_profile_id, phase_id, status,
+                                 columns=(Task.id, Task.title, Task.status, Task.critical))
 
 
+@scoped_lookup
 def get_task_by_id(task_id):
     """Get a specific task by ID"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        task = session.query(Task).filter_by(id=task_id).first()
-        if task:
-            _ = (task.id, task.title, task.status)
-        return task
-    finally:
-        session.close()
+    with session_scope() as session:
+        return session.get(Task, task_id)
 
 
+@clears_request_scope
 def update_task(task_id, **kwargs):
-    """Update an existing task"""
-    engine = get_engine()
-    session = get_session(engine)
+    """
+    Update an existing task with a single UPDATE ... RETURNING statement
+    Unknown fields are skipped with a warning
     
-    try:
-        task = session.query(Task).filter_by(id=task_id).first()
-        
-        if not task:
-            print(f"❌ No task found with ID {task_id}")
-            return None
-        
-        for key, value in kwargs.items():
-            if hasattr(task, key):
-                setattr(task, key, value)
-                print(f"  ✓ Updated {key}")
-            else:
-                print(f"  ⚠️  Unknown field: {key}")
-        
-        session.commit()
-        print(f"\n✓ Task {task_id} updated successfully!")
-        
-        task_id_copy = task.id
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error updating task: {e}")
-        raise
-    finally:
-        session.close()
+    Returns:
+        Updated Task object, or None if not found
+    """
+    values = {}
+    for key, value in kwargs.items():
+        if key in _TASK_COLS:
+            values[key] = value
+        else:
+            logger.warning("Unknown task field: %s", key)
+    
+    if not values:
+        # Nothing to write - just hand back the task as it is
+        task = get_task_by_id(task_id)
+    else:
+        with session_scope() as session:
+            statement = (
+                update(Task)
+                .where(Task.id == task_id)
+                .values(values)
+                .returning(Task)
+            )
+            task = session.scalars(statement).first()
+    
+    if not task:
+        logger.warning("No task found with ID %s", task_id)
+        return None
+    
+    logger.debug("Updated task %s: %s", task_id, ", ".join(values))
     
-    return get_task_by_id(task_id_copy)
+    return task
 
 
+@clears_request_scope
 def delete_task(task_id):
     """Delete a task"""
-    engine = get_engine()
-    session = get_session(engine)
-    
-    try:
-        task = session.query(Task).filter_by(id=task_id).first()
+    with session_scope() as session:
+        task = session.get(Task, task_id)
         
         if not task:
-            print(f"❌ No task found with ID {task_id}")
+            logger.warning("No task found with ID %s", task_id)
             return False
         
         task_title = task.title
         
         session.delete(task)
-        session.commit()
-        
-        print(f"✓ Deleted task: {task_title} (ID: {task_id})")
-        return True
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error deleting task: {e}")
-        raise
-    finally:
-        session.close()
+    
+    logger.debug("Deleted task %s (ID %s)", task_title, task_id)
+    return True
 
 
+@clears_request_scope
 def mark_task_completed(task_id, completed_date=None):
     """
-    Mark a task as completed
+    Mark a task as completed with a single UPDATE ... RETURNING statement
     
     Args:
         task_id: ID of the task
         completed_date: Date completed (defaults to today)
     
     Returns:
-        Updated Task object
+        Updated Task object, or None if not found or already completed
     """
     if completed_date is None:
         completed_date = date.today()
     
-    return update_task(task_id, status='completed', completed_date=completed_date)
-
-
-def display_task(task):
-    """Pretty print a task"""
-    if not task:
-        print("No task found")
-        return
+    with session_scope() as session:
+        statement = (
+            update(Task)
+            # IS DISTINCT FROM, so tasks without a status can be completed too
+            .where(Task.id == task_id, Task.status.is_distinct_from('completed'))
+            .values(status='completed', completed_date=completed_date)
+            .returning(Task)
+        )
+        task = session.scalars(statement).first()
     
-    # Status emoji
-    status_emoji = {
-        'not_started': '⏸️',
-        'in_progress': '🔄',
-        'completed': '✅'
-    }
+    if not task:
+        logger.warning("No open task found with ID %s", task_id)
+        return None
     
-    emoji = status_emoji.get(task.status, '❓')
+    logger.debug("Task %s marked as completed", task_id)
+    return task
+
+
+def format_task(task):
+    """Build the display text for a task (without a trailing newline)"""
+    emoji = _STATUS_EMOJI.get(task.status, '❓')
     critical_mark = "🔴 CRITICAL" if task.critical else ""
     
-    print("\n" + "-" * 50)
-    print(f"{emoji} {task.title} {critical_mark}")
-    print("-" * 50)
-    print(f"ID: {task.id}")
-    print(f"Status: {task.status.replace('_', ' ').title()}")
+    lines = [
+        "\n" + _DIV,
+        f"{emoji} {task.title} {critical_mark}",
+        _DIV,
+        f"ID: {task.id}",
+        f"Status: {task.status.replace('_', ' ').title()}",
+    ]
     
     if task.description:
-        print(f"Description: {task.description}")
+        lines.append(f"Description: {task.description}")
     
     if task.planned_date:
-        print(f"Planned Date: {task.planned_date}")
+        lines.append(f"Planned Date: {task.planned_date}")
     
     if task.completed_date:
-        print(f"Completed Date: {task.completed_date}")
+        lines.append(f"Completed Date: {task.completed_date}")
     
-    print(f"Phase ID: {task.phase_id}")
-    print(f"Profile ID: {task.relocation_profile_id}")
+    lines.append(f"Phase ID: {task.phase_id}")
+    lines.append(f"Profile ID: {task.relocation_profile_id}")
     
     if task.notes:
-        print(f"Notes: {task.notes}")
+        lines.append(f"Notes: {task.notes}")
     
-    print("-" * 50 + "\n")
\ No newline at end of file
+    lines.append(_DIV + "\n")
+    return "\n".join(lines)
+
+
+def display_task(task):
+    """Pretty print a task"""
+    if not task:
+        print("No task found")
+        return
+    
+    print(format_task(task))
+
+
+def display_tasks_bulk(tasks, batch_size=50):
+    """
+    Pretty print many tasks, writing them to stdout in batches
+    Returns the number of tasks displayed
+    """
+    return write_batched(tasks, format_task, batch_size)
\ No newline at end of file
@@ -2,6 +2,7 @@
 Flask Web Application for Relocation OS
 """
 
+import gzip
 import sys
 from pathlib import Path
 
@@ -9,26 +10,31 @@ from pathlib import Path
 src_path = Path(__file__).parent.parent
 sys.path.insert(0, str(src_path))
 
-from flask import Flask, render_template, request, redirect, url_for, flash
-from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, make_response
+from jinja2 import FileSystemBytecodeCache
+from datetime import date
 
 # Import our existing operations
 from database import (
     create_relocation_profile,
     get_all_profiles,
     get_profile_by_id,
+    get_profile_with_phases,
     update_relocation_profile,
     delete_relocation_profile
 )
 from phase_operations import (
     create_phase,
-    get_all_phases,
+    get_next_phase_order,
     get_phase_by_id,
     delete_phase
 )
 from task_operations import (
     create_task,
     get_all_tasks,
+    get_all_tasks_summary,
+    count_tasks,
     get_task_by_id,
     update_task,
     delete_task,
@@ -37,43 +43,68 @@ from task_operations import (
 from expense_operations import (
     create_expense,
     get_all_expenses,
+    count_expenses,
     get_expense_by_id,
     update_expense,
+    update_expense_fast,
     delete_expense,
     mark_expense_paid,
-    get_budget_summary
+    get_budget_summary,
+    parse_amount_cents
 )
 from category_operations import (
     create_expense_category,
     get_all_categories,
     delete_expense_category
 )
+from currency_service import format_currency, prefetch_exchange_rate
 from models import init_database
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here-change-in-production'
 
+# Compiled templates are kept on disk (in the temp directory), so workers
+# started later load them instead of compiling every template again
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+# Separator for the startup log
+_BAR = "=" * 60
+
+# Format used by the date_format filter
+_DATE_FORMAT = '%b %d, %Y'
+
+# Responses smaller than this aren't worth compressing
+_COMPRESS_MIN_SIZE = 500
+
+# Response types that are compressed - pages and the JSON API
+_COMPRESS_MIMETYPES = frozenset({'text/html', 'application/json'})
+
+# Seconds expense_create waits for an exchange rate - a cached rate (in memory
+# or in the database) is back well within this, only an API call takes longer
+_RATE_WAIT = 0.5
+
+# Runs a page's independent queries side by side - SQLite releases the GIL
+# while it works, so the page waits for the slowest query, not all of them
+_query_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='view-query')
+
 # Initialize database on startup
-print("=" * 60)
+print(_BAR)
 print("STARTING DATABASE INITIALIZATION")
-print("=" * 60)
+print(_BAR)
 
 with app.app_context():
     try:
-        from models import Base, get_engine
         import os
         
         print(f"Environment check:")
         print(f"  PORT: {os.environ.get('PORT')}")
         print(f"  RAILWAY_ENVIRONMENT: {os.environ.get('RAILWAY_ENVIRONMENT')}")
         
-        engine = get_engine()
-        print(f"Engine created: {engine}")
-        
+        # Tables and indexes are set up once here, never on the request path
         print("Creating all tables...")
-        Base.metadata.create_all(engine)
-        print("✓ Base.metadata.create_all() completed")
+        engine = init_database()
+        print(f"Engine created: {engine}")
         
         # Verify tables were created
         from sqlalchemy import inspect
@@ -86,14 +117,18 @@ with app.app_context():
         else:
             print("❌❌❌ relocation_profiles table NOT FOUND!")
         
+        # Close the connections opened above - with gunicorn --preload this
+        # runs before the workers fork, and they must not share a connection
+        engine.dispose()
+        
     except Exception as e:
         print(f"❌ CRITICAL ERROR initializing database: {e}")
         import traceback
         traceback.print_exc()
 
-print("=" * 60)
+print(_BAR)
 print("DATABASE INITIALIZATION COMPLETE")
-print("=" * 60)
+print(_BAR)
 
 
 @app.route('/')
@@ -101,24 +136,26 @@ def index():
     """Home page - Dashboard"""
     profiles = get_all_profiles()
     
-    # Get summary data
+    # Get summary data - counted in SQL, only the 5 rows shown are loaded
     total_profiles = len(profiles)
-    total_tasks = len(get_all_tasks())
-    total_expenses = len(get_all_expenses())
+    total_tasks = count_tasks()
+    total_expenses = count_expenses()
+    unpaid_count = count_expenses(payment_status='unpaid')
     
     # Get incomplete tasks
-    incomplete_tasks = [t for t in get_all_tasks() if t.status != 'completed']
+    incomplete_tasks = get_all_tasks_summary(status=('not_started', 'in_progress'), limit=5)
     
     # Get unpaid expenses
-    unpaid_expenses = get_all_expenses(payment_status='unpaid')
+    unpaid_expenses = get_all_expenses(payment_status='unpaid', limit=5)
     
     return render_template('index.html',
                         profiles=profiles,
                         total_profiles=total_profiles,
                         total_tasks=total_tasks,
                         total_expenses=total_expenses,
-                        incomplete_tasks=incomplete_tasks[:5],  # Show 5 most recent
-                        unpaid_expenses=unpaid_expenses[:5])
+                        unpaid_count=unpaid_count,
+                        incomplete_tasks=incomplete_tasks,
+                        unpaid_expenses=unpaid_expenses)
 
 
 @app.route('/profiles')
@@ -131,31 +168,24 @@ def profiles_list():
 @app.route('/profile/<int:profile_id>')
 def profile_detail(profile_id):
     """View a single profile with all its data"""
-    profile = get_profile_by_id(profile_id)
+    profile = get_profile_with_phases(profile_id)
     if not profile:
         flash('Profile not found', 'error')
         return redirect(url_for('profiles_list'))
     
-    phases = get_all_phases(relocation_profile_id=profile_id)
-    tasks = get_all_tasks(relocation_profile_id=profile_id)
-    expenses = get_all_expenses(relocation_profile_id=profile_id)
-    budget_summary = get_budget_summary(profile_id)
-    categories = get_all_categories(relocation_profile_id=profile_id)
+    phases = profile.phases
+    tasks = _query_pool.submit(get_all_tasks_summary, relocation_profile_id=profile_id)
+    expenses = _query_pool.submit(get_all_expenses, relocation_profile_id=profile_id)
+    budget_summary = _query_pool.submit(get_budget_summary, profile_id)
+    categories = _query_pool.submit(get_all_categories, relocation_profile_id=profile_id)
     
     return render_template('profile_detail.html',
                         profile=profile,
                         phases=phases,
-                        tasks=tasks,
-                        expenses=expenses,
-                        budget_summary=budget_summary,
-                        categories=categories)
-    
-    return render_template('profile_detail.html',
-                        profile=profile,
-                        phases=phases,
-                        tasks=tasks,
-                        expenses=expenses,
-                        budget_summary=budget_summary)
+                        tasks=tasks.result(),
+                        expenses=expenses.result(),
+                        budget_summary=budget_summary.result(),
+                        categories=categories.result())
 
 
 @app.route('/profile/create', methods=['GET', 'POST'])
@@ -164,7 +194,7 @@ def profile_create():
     if request.method == 'POST':
         try:
             # Parse the date
-            target_date = datetime.strptime(request.form['target_arrival_date'], '%Y-%m-%d').date()
+            target_date = date.fromisoformat(request.form['target_arrival_date'])
             
             profile = create_relocation_profile(
                 relocation_name=request.form['relocation_name'],
@@ -199,20 +229,59 @@ def profile_delete(profile_id):
     return redirect(url_for('profiles_list'))
 
 
+def _render_conditional(template, **context):
+    """
+    Render a template with an ETag of the page, answering 304 Not Modified
+    when the browser already has the same page - the body isn't sent again
+    """
+    response = make_response(render_template(template, **context))
+    # Weak, because compress_response may gzip the body afterwards
+    response.add_etag(weak=True)
+    # Let the browser keep the page, but always check it's still current
+    response.cache_control.no_cache = True
+    
+    return response.make_conditional(request)
+
+
 @app.route('/tasks')
 def tasks_list():
     """List all tasks"""
     status_filter = request.args.get('status')
     tasks = get_all_tasks(status=status_filter)
     
-    return render_template('tasks_list.html', tasks=tasks, status_filter=status_filter)
+    return _render_conditional('tasks_list.html', tasks=tasks, status_filter=status_filter)
+
+
+@app.route('/api/tasks')
+def api_tasks():
+    """
+    Tasks as JSON, for pages that render or page through the list themselves
+    Accepts the same status filter as /tasks, plus limit and offset
+    """
+    rows = get_all_tasks_summary(
+        relocation_profile_id=request.args.get('profile_id', type=int),
+        status=request.args.get('status'),
+        limit=request.args.get('limit', type=int),
+        offset=request.args.get('offset', type=int)
+    )
+    
+    tasks = []
+    for row in rows:
+        task = row._asdict()
+        if task['planned_date']:
+            task['planned_date'] = task['planned_date'].isoformat()
+        tasks.append(task)
+    
+    return jsonify(tasks)
 
 
 @app.route('/task/<int:task_id>/complete', methods=['POST'])
 def task_complete(task_id):
     """Mark task as completed"""
-    mark_task_completed(task_id)
-    flash('Task marked as completed!', 'success')
+    if mark_task_completed(task_id):
+        flash('Task marked as completed!', 'success')
+    else:
+        flash('Task is already completed or was not found', 'error')
     
     # Redirect back to referring page or task list
     return redirect(request.referrer or url_for('tasks_list'))
@@ -235,14 +304,16 @@ def expenses_list():
     payment_filter = request.args.get('payment_status')
     expenses = get_all_expenses(payment_status=payment_filter)
     
-    return render_template('expenses_list.html', expenses=expenses, payment_filter=payment_filter)
+    return _render_conditional('expenses_list.html', expenses=expenses, payment_filter=payment_filter)
 
 
 @app.route('/expense/<int:expense_id>/pay', methods=['POST'])
 def expense_pay(expense_id):
     """Mark expense as paid"""
-    mark_expense_paid(expense_id)
-    flash('Expense marked as paid!', 'success')
+    if mark_expense_paid(expense_id):
+        flash('Expense marked as paid!', 'success')
+    else:
+        flash('Expense is already paid or was not found', 'error')
     
     return redirect(request.referrer or url_for('expenses_list'))
 
@@ -258,6 +329,27 @@ def expense_delete(expense_id):
     return redirect(request.referrer or url_for('expenses_list'))
 
 
+@app.after_request
+def compress_response(response):
+    """Gzip pages and JSON for clients that accept it - table rows compress very well"""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.mimetype not in _COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+        return response
+    
+    data = response.get_data()
+    if len(data) < _COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    
+    return response
+
+
 # Template filters
 @app.template_filter('currency')
 def currency_filter(amount_cents, currency='USD'):
@@ -265,18 +357,8 @@ def currency_filter(amount_cents, currency='USD'):
     if amount_cents is None:
         return 'N/A'
     
-    amount = amount_cents / 100
-    symbols = {
-        'USD': '$',
-        'EUR': '€',
-        'GBP': '£',
-        'JPY': '¥',
-        'CAD': 'C$',
-        'AUD': 'A$',
-    }
-    
-    symbol = symbols.get(currency, currency + ' ')
-    return f"{symbol}{amount:,.2f}"
+    # Same symbol table as the menu, built once in currency_service
+    return format_currency(amount_cents, currency)
 
 
 @app.template_filter('date_format')
@@ -284,7 +366,8 @@ def date_format_filter(date_obj):
     """Format date"""
     if not date_obj:
         return 'N/A'
-    return date_obj.strftime('%b %d, %Y')
+    return date_obj.strftime(_DATE_FORMAT)
+
 
 @app.route('/profile/<int:profile_id>/phase/create', methods=['GET', 'POST'])
 def phase_create(profile_id):
@@ -311,9 +394,8 @@ def phase_create(profile_id):
         except Exception as e:
             flash(f'Error creating phase: {str(e)}', 'error')
     
-    # Get existing phases to suggest next order_index
-    existing_phases = get_all_phases(relocation_profile_id=profile_id)
-    next_order = len(existing_phases) + 1
+    # Suggest the next order_index without loading the existing phases
+    next_order = get_next_phase_order(profile_id)
     
     return render_template('phase_form.html', profile=profile, next_order=next_order)
 
@@ -321,26 +403,32 @@ def phase_create(profile_id):
 @app.route('/profile/<int:profile_id>/task/create', methods=['GET', 'POST'])
 def task_create(profile_id):
     """Create a new task for a profile"""
-    profile = get_profile_by_id(profile_id)
+    # The profile and its phases come back from one query
+    profile = get_profile_with_phases(profile_id)
     if not profile:
         flash('Profile not found', 'error')
         return redirect(url_for('profiles_list'))
     
-    phases = get_all_phases(relocation_profile_id=profile_id)
+    phases = profile.phases
     if not phases:
         flash('Please create at least one phase first!', 'error')
         return redirect(url_for('profile_detail', profile_id=profile_id))
     
     if request.method == 'POST':
         try:
+            # The profile's phases are already loaded - check the phase without another query
+            phase_id = int(request.form['phase_id'])
+            if phase_id not in {p.id for p in phases}:
+                raise ValueError(f"phase {phase_id} does not belong to this profile")
+            
             # Parse planned date if provided
             planned_date = None
             if request.form.get('planned_date'):
-                planned_date = datetime.strptime(request.form['planned_date'], '%Y-%m-%d').date()
+                planned_date = date.fromisoformat(request.form['planned_date'])
             
             task = create_task(
                 relocation_profile_id=profile_id,
-                phase_id=int(request.form['phase_id']),
+                phase_id=phase_id,
                 title=request.form['title'],
                 description=request.form.get('description') or None,
                 status=request.form.get('status', 'not_started'),
@@ -358,42 +446,61 @@ def task_create(profile_id):
     return render_template('task_form.html', profile=profile, phases=phases, task=None)
 
 
+def _backfill_exchange_rate(expense_id, rate_future):
+    """Save an exchange rate that arrived after its expense was created"""
+    rate = rate_future.result()
+    if rate is not None:
+        update_expense_fast(expense_id, exchange_rate=rate)
+
+
 @app.route('/profile/<int:profile_id>/expense/create', methods=['GET', 'POST'])
 def expense_create(profile_id):
     """Create a new expense for a profile"""
-    profile = get_profile_by_id(profile_id)
+    # The profile and its phases come back from one query
+    profile = get_profile_with_phases(profile_id)
     if not profile:
         flash('Profile not found', 'error')
         return redirect(url_for('profiles_list'))
     
-    phases = get_all_phases(relocation_profile_id=profile_id)
+    phases = profile.phases
     if not phases:
         flash('Please create at least one phase first!', 'error')
         return redirect(url_for('profile_detail', profile_id=profile_id))
     
-    tasks = get_all_tasks(relocation_profile_id=profile_id)
-    
     if request.method == 'POST':
         try:
+            # Start the exchange rate lookup first, it runs while the form is parsed
+            currency = request.form.get('currency', profile.primary_currency)
+            rate_future = None
+            if currency != profile.primary_currency:
+                rate_future = prefetch_exchange_rate(currency, profile.primary_currency)
+            
+            # The profile's phases are already loaded - check the phase without another query
+            phase_id = int(request.form['phase_id'])
+            if phase_id not in {p.id for p in phases}:
+                raise ValueError(f"phase {phase_id} does not belong to this profile")
+            
             # Parse amounts (convert dollars to cents)
-            estimated = float(request.form['estimated_amount']) * 100
+            estimated = parse_amount_cents(request.form['estimated_amount'])
             
             actual = None
             if request.form.get('actual_amount'):
-                actual = float(request.form['actual_amount']) * 100
+                actual = parse_amount_cents(request.form['actual_amount'])
             
             # Parse due date if provided
             due_date = None
             if request.form.get('due_date'):
-                due_date = datetime.strptime(request.form['due_date'], '%Y-%m-%d').date()
+                due_date = date.fromisoformat(request.form['due_date'])
             
-            # Get exchange rate if currency differs from profile
-            currency = request.form.get('currency', profile.primary_currency)
+            # Wait briefly for the exchange rate - if the API is still being
+            # asked, don't keep the user waiting, it's filled in below
             exchange_rate = None
-            
-            if currency != profile.primary_currency:
-                from currency_service import get_exchange_rate
-                exchange_rate = get_exchange_rate(currency, profile.primary_currency)
+            rate_pending = False
+            if rate_future is not None:
+                try:
+                    exchange_rate = rate_future.result(timeout=_RATE_WAIT)
+                except FutureTimeout:
+                    rate_pending = True
             
             # Related task (optional)
             related_task_id = request.form.get('related_task_id')
@@ -404,11 +511,11 @@ def expense_create(profile_id):
             
             expense = create_expense(
                 relocation_profile_id=profile_id,
-                phase_id=int(request.form['phase_id']),
+                phase_id=phase_id,
                 title=request.form['title'],
                 category=request.form.get('category') or None,
-                estimated_amount=int(estimated),
-                actual_amount=int(actual) if actual else None,
+                estimated_amount=estimated,
+                actual_amount=actual if actual else None,
                 currency=currency,
                 exchange_rate=exchange_rate,
                 cost_certainty=request.form.get('cost_certainty', 'estimated'),
@@ -420,13 +527,23 @@ def expense_create(profile_id):
                 notes=request.form.get('notes') or None
             )
             
+            if rate_pending:
+                rate_future.add_done_callback(
+                    lambda future, expense_id=expense.id: _backfill_exchange_rate(expense_id, future)
+                )
+            
             flash(f'Expense "{expense.title}" created successfully!', 'success')
             return redirect(url_for('profile_detail', profile_id=profile_id))
             
         except Exception as e:
             flash(f'Error creating expense: {str(e)}', 'error')
     
+    # The task list is only needed to draw the form, not to save the expense
+    tasks = get_all_tasks_summary(relocation_profile_id=profile_id)
+    
     return render_template('expense_form.html', profile=profile, phases=phases, tasks=tasks, expense=None)
+
+
 @app.route('/profile/<int:profile_id>/category/create', methods=['GET', 'POST'])
 def category_create(profile_id):
     """Create a new expense category"""
@@ -463,6 +580,12 @@ def category_delete(category_id):
     return redirect(request.referrer or url_for('index'))
 
 
+# Compile the templates now that all filters are registered, so the first
+# request to each page doesn't have to
+for template_name in app.jinja_env.list_templates():
+    app.jinja_env.get_template(template_name)
+
+
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,29 @@
+"""
+Shared test setup - every test that asks for `db` gets its own empty database
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app's modules import each other by name, so put src on the path
+# the same way src/web/app.py does
+src_path = Path(__file__).parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+import models
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point the app at a fresh SQLite database for one test"""
+    engine = models.get_engine(str(tmp_path / 'test.db'))
+    
+    # get_engine() without a path - what the app uses - now returns this engine
+    monkeypatch.setitem(models._ENGINES, None, engine)
+    models.init_database()
+    
+    yield engine
+    
+    engine.dispose()
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Tests for category_operations
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from category_operations import create_expense_categories_bulk, get_all_categories, get_categories_by_ids
+from database import create_relocation_profile
+
+
+@pytest.fixture
+def profile(db):
+    return create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+
+
+def test_create_expense_categories_bulk(profile):
+    names = ["Housing", "Visas", "Shipping"]
+    
+    categories = create_expense_categories_bulk(
+        [dict(relocation_profile_id=profile.id, name=name) for name in names]
+    )
+    
+    assert [c.name for c in categories] == names
+    stored = {c.id: c.name for c in get_all_categories(relocation_profile_id=profile.id)}
+    assert {c.id: c.name for c in categories} == stored
+
+
+def test_create_expense_categories_bulk_is_one_transaction(profile):
+    # The second category points at a missing profile, so neither is kept
+    with pytest.raises(IntegrityError):
+        create_expense_categories_bulk([dict(relocation_profile_id=profile.id, name="Housing"),
+                                        dict(relocation_profile_id=profile.id + 1, name="Visas")])
+    
+    assert get_all_categories(relocation_profile_id=profile.id) == []
+
+
+def test_get_categories_by_ids(profile):
+    housing, visas = create_expense_categories_bulk(
+        [dict(relocation_profile_id=profile.id, name=name) for name in ("Housing", "Visas")]
+    )
+    
+    found = get_categories_by_ids([visas.id, housing.id, visas.id, visas.id + 1])
+    
+    # Each category once, whatever the duplicates - missing IDs are skipped
+    assert sorted(c.name for c in found) == ["Housing", "Visas"]
+    assert get_categories_by_ids([]) == []
\ No newline at end of file
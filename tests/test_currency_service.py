@@ -0,0 +1,109 @@
+"""
+Tests for currency_service
+"""
+
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import currency_service
+from currency_service import get_exchange_rate, get_exchange_rates, get_manual_exchange_rate
+
+
+class FakeResponse:
+    """Stands in for a requests.Response from the rates API"""
+    
+    def __init__(self, rates):
+        self.status_code = 200
+        self.headers = {'Last-Modified': 'Fri, 15 Oct 2027 16:00:00 GMT'}
+        self._rates = rates
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return {'rates': self._rates}
+
+
+class FakeHTTP:
+    """Stands in for the shared HTTP session - records each requested URL"""
+    
+    def __init__(self, rates=None, error=None):
+        self.rates = rates or {}
+        self.error = error
+        self.urls = []
+    
+    def get(self, url, headers=None, timeout=None):
+        self.urls.append(url)
+        if self.error:
+            raise self.error
+        wanted = parse_qs(urlparse(url).query)['to'][0].split(',')
+        return FakeResponse({to: rate for to, rate in self.rates.items() if to in wanted})
+
+
+@pytest.fixture
+def http(db, monkeypatch):
+    """Empty rate caches and no real API calls"""
+    monkeypatch.setattr(currency_service, '_batch_rates', {})
+    monkeypatch.setattr(currency_service, '_failed_lookups', {})
+    currency_service._rate_for_day.cache_clear()
+    yield
+    currency_service._rate_for_day.cache_clear()
+
+
+@pytest.mark.parametrize('typed, rate_cents', [
+    ('0.92', 9200),
+    ('0.0012', 12),
+    ('0.1020', 1020),
+])
+def test_get_manual_exchange_rate_rounds(monkeypatch, typed, rate_cents):
+    monkeypatch.setattr('builtins.input', lambda prompt: typed)
+    
+    assert get_manual_exchange_rate() == rate_cents
+
+
+def test_get_manual_exchange_rate_skipped(monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda prompt: '')
+    
+    assert get_manual_exchange_rate() is None
+
+
+def test_get_exchange_rates_fetches_all_pairs_at_once(http, monkeypatch):
+    fake = FakeHTTP(rates={'EUR': 0.92, 'GBP': 0.79, 'ILS': 3.7})
+    monkeypatch.setattr(currency_service, '_http', fake)
+    
+    rates = get_exchange_rates('USD', ['EUR', 'GBP', 'ILS', 'USD'])
+    
+    assert rates == {'EUR': 9200, 'GBP': 7900, 'ILS': 37000, 'USD': 10000}
+    assert len(fake.urls) == 1
+    # Single lookups are answered from the batch
+    assert get_exchange_rate('USD', 'GBP') == 7900
+    assert get_exchange_rates('USD', ['ILS']) == {'ILS': 37000}
+    assert len(fake.urls) == 1
+
+
+def test_get_exchange_rates_partial_reply(http, monkeypatch):
+    # The API leaves out currencies it doesn't know
+    fake = FakeHTTP(rates={'EUR': 0.92})
+    monkeypatch.setattr(currency_service, '_http', fake)
+    
+    assert get_exchange_rates('USD', ['EUR', 'XYZ']) == {'EUR': 9200}
+    assert ('USD', 'XYZ') in currency_service._failed_lookups
+    assert ('USD', 'EUR') not in currency_service._failed_lookups
+    
+    # The missing pair isn't asked for again until FAILED_LOOKUP_TTL has passed
+    assert get_exchange_rates('USD', ['EUR', 'XYZ']) == {'EUR': 9200}
+    assert get_exchange_rate('USD', 'XYZ') is None
+    assert len(fake.urls) == 1
+
+
+def test_get_exchange_rates_request_fails(http, monkeypatch):
+    fake = FakeHTTP(error=requests.ConnectionError("offline"))
+    monkeypatch.setattr(currency_service, '_http', fake)
+    
+    assert get_exchange_rates('USD', ['EUR', 'GBP']) == {}
+    assert {('USD', 'EUR'), ('USD', 'GBP')} <= set(currency_service._failed_lookups)
+    
+    assert get_exchange_rates('USD', ['EUR', 'GBP']) == {}
+    assert len(fake.urls) == 1
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Tests for database (relocation profile operations)
+"""
+
+from datetime import date
+
+import pytest
+
+from database import (
+    create_relocation_profile,
+    get_profile_by_id,
+    get_profiles_by_ids,
+    update_relocation_profile,
+    update_relocation_profile_fast
+)
+
+
+@pytest.fixture
+def profile(db):
+    return create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+
+
+def test_update_relocation_profile_fast(profile):
+    assert update_relocation_profile_fast(profile.id, family_size=3) is True
+    assert get_profile_by_id(profile.id).family_size == 3
+    assert update_relocation_profile_fast(profile.id + 1, family_size=3) is False
+
+
+def test_update_relocation_profile_fast_without_fields(profile):
+    assert update_relocation_profile_fast(profile.id) is False
+
+
+def test_profile_id_cannot_be_updated(profile):
+    updated = update_relocation_profile(profile.id, id=profile.id + 100, family_size=2)
+    
+    assert updated.id == profile.id
+    assert updated.family_size == 2
+    with pytest.raises(ValueError):
+        update_relocation_profile_fast(profile.id, id=profile.id + 100)
+
+
+def test_get_profiles_by_ids(profile):
+    other = create_relocation_profile("Second move", "Portugal", "Spain", date(2028, 1, 1))
+    
+    found = get_profiles_by_ids([other.id, profile.id, other.id, other.id + 1])
+    
+    # Each profile once, whatever the duplicates - missing IDs are skipped
+    assert sorted(p.id for p in found) == [profile.id, other.id]
+    assert get_profiles_by_ids([]) == []
\ No newline at end of file
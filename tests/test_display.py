@@ -0,0 +1,17 @@
+"""
+Tests for display
+"""
+
+from display import write_batched
+
+
+def test_write_batched(capsys):
+    count = write_batched(iter(range(5)), lambda n: f"item {n}", batch_size=2)
+    
+    assert count == 5
+    assert capsys.readouterr().out == "item 0\nitem 1\nitem 2\nitem 3\nitem 4\n"
+
+
+def test_write_batched_nothing(capsys):
+    assert write_batched([], str) == 0
+    assert capsys.readouterr().out == ""
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Tests for expense_operations
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from database import create_relocation_profile
+from expense_operations import (
+    count_expenses,
+    create_expense,
+    create_expenses_bulk,
+    get_expense_by_id,
+    get_expenses_by_ids,
+    mark_expense_paid,
+    parse_amount_cents,
+    update_expense_fast
+)
+from phase_operations import create_phase
+
+
+@pytest.mark.parametrize('text, cents', [
+    ('0.29', 29),
+    ('123.45', 12345),
+    ('1,5', 150),
+    ('123,45', 12345),
+    (' 10 ', 1000),
+    ('1.005', 101),
+])
+def test_parse_amount_cents(text, cents):
+    assert parse_amount_cents(text) == cents
+
+
+@pytest.mark.parametrize('text', ['1,000', '2,500', '1,000,50', '1,000.50', 'abc', '', 'nan'])
+def test_parse_amount_cents_rejects_ambiguous_or_invalid(text):
+    with pytest.raises(ValueError):
+        parse_amount_cents(text)
+
+
+def test_mark_expense_paid(db):
+    profile = create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    expense = create_expense(profile.id, phase.id, "Deposit", estimated_amount=150000)
+    
+    assert mark_expense_paid(expense.id).payment_status == 'paid'
+    # Already paid - nothing to update, so nothing is returned
+    assert mark_expense_paid(expense.id) is None
+    assert mark_expense_paid(expense.id + 1) is None
+    assert get_expense_by_id(expense.id).payment_status == 'paid'
+
+
+def test_update_expense_fast(db):
+    profile = create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    expense = create_expense(profile.id, phase.id, "Deposit", estimated_amount=150000)
+    
+    assert update_expense_fast(expense.id, actual_amount=140000) is True
+    assert get_expense_by_id(expense.id).actual_amount == 140000
+    # Nothing to update - no empty UPDATE is sent
+    assert update_expense_fast(expense.id) is False
+    assert update_expense_fast(expense.id + 1, actual_amount=1) is False
+    # The primary key isn't an updatable field
+    with pytest.raises(ValueError):
+        update_expense_fast(expense.id, id=expense.id + 100)
+
+
+def test_mark_expense_paid_without_status(db):
+    profile = create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    expense = create_expense(profile.id, phase.id, "Deposit", estimated_amount=150000)
+    update_expense_fast(expense.id, payment_status=None)
+    
+    assert mark_expense_paid(expense.id).payment_status == 'paid'
+
+
+def test_create_expenses_bulk(db):
+    profile = create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    records = [dict(relocation_profile_id=profile.id, phase_id=phase.id, title=f"Item {n}",
+                    estimated_amount=n * 100) for n in range(5)]
+    
+    expenses = create_expenses_bulk(records)
+    
+    # Returned in input order, each with the ID its row was stored under
+    assert [e.title for e in expenses] == [r['title'] for r in records]
+    for expense in expenses:
+        assert get_expense_by_id(expense.id).title == expense.title
+    assert create_expenses_bulk([]) == []
+
+
+def test_create_expenses_bulk_is_one_transaction(db):
+    profile = create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    records = [dict(relocation_profile_id=profile.id, phase_id=phase_id, title="Item",
+                    estimated_amount=100) for phase_id in (phase.id, phase.id + 1)]
+    
+    # The second row points at a missing phase, so neither row is kept
+    with pytest.raises(IntegrityError):
+        create_expenses_bulk(records)
+    assert count_expenses() == 0
+
+
+def test_get_expenses_by_ids(db):
+    profile = create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    first = create_expense(profile.id, phase.id, "Deposit", estimated_amount=150000)
+    second = create_expense(profile.id, phase.id, "Flights", estimated_amount=80000)
+    
+    found = get_expenses_by_ids(iter([second.id, first.id, second.id, second.id + 1]))
+    
+    # Each expense once, whatever the duplicates - missing IDs are skipped
+    assert sorted(e.id for e in found) == [first.id, second.id]
+    assert get_expenses_by_ids([]) == []
\ No newline at end of file
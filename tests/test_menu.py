@@ -0,0 +1,42 @@
+"""
+Tests for menu
+"""
+
+import ast
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+import menu
+
+# Menu handler functions - one per main menu entry, plus the default phases
+# offered after creating a profile
+MENU_FUNCTION_COUNT = 22
+
+
+def test_menu_function_count():
+    names = {name for name in dir(menu) if name.startswith('menu_')}
+    
+    assert len(names) == MENU_FUNCTION_COUNT
+
+
+def test_no_function_defined_twice():
+    # A second definition silently replaces the first, so check the source
+    tree = ast.parse(open(menu.__file__, encoding='utf-8').read())
+    counts = Counter(node.name for node in tree.body if isinstance(node, ast.FunctionDef))
+    
+    assert [name for name, count in counts.items() if count > 1] == []
+
+
+@pytest.mark.parametrize('handler, picker, noun', [
+    (menu.menu_update_profile, 'pick_profile', 'profile'),
+    (menu.menu_update_phase, 'pick_phase', 'phase'),
+])
+def test_update_of_a_row_deleted_since_it_was_listed(db, monkeypatch, capsys, handler, picker, noun):
+    # The pick comes from the short-lived menu cache, so the row may be gone
+    monkeypatch.setattr(menu, picker, lambda *args, **kwargs: SimpleNamespace(id=999))
+    
+    handler()
+    
+    assert f"No {noun} found with ID 999" in capsys.readouterr().out
\ No newline at end of file
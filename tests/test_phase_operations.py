@@ -0,0 +1,56 @@
+"""
+Tests for phase_operations
+"""
+
+from datetime import date
+
+import pytest
+
+from database import create_relocation_profile
+from phase_operations import (
+    create_phase,
+    create_phases_bulk,
+    get_all_phases,
+    get_next_phase_order,
+    get_phase_by_id,
+    update_phase_fast
+)
+
+
+@pytest.fixture
+def profile(db):
+    return create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+
+
+def test_create_phases_bulk_numbers_in_list_order(profile):
+    phases = create_phases_bulk(profile.id, [dict(name="A", relative_start_month=-6, relative_end_month=-3),
+                                             dict(name="B", relative_start_month=-3, relative_end_month=0)])
+    
+    assert [(p.name, p.order_index) for p in phases] == [("A", 1), ("B", 2)]
+    assert get_next_phase_order(profile.id) == 3
+
+
+def test_create_phases_bulk_continues_after_existing_phases(profile):
+    create_phase(profile.id, "First", -12, -6, order_index=1)
+    create_phase(profile.id, "Second", -6, -3, order_index=2)
+    
+    create_phases_bulk(profile.id, [dict(name="Third", relative_start_month=-3, relative_end_month=0),
+                                    dict(name="Fourth", relative_start_month=0, relative_end_month=1)])
+    
+    phases = get_all_phases(relocation_profile_id=profile.id)
+    assert [p.order_index for p in phases] == [1, 2, 3, 4]
+    assert [p.name for p in phases] == ["First", "Second", "Third", "Fourth"]
+
+
+def test_get_next_phase_order_without_phases(profile):
+    assert get_next_phase_order(profile.id) == 1
+
+
+def test_update_phase_fast(profile):
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    
+    assert update_phase_fast(phase.id, name="Landing") is True
+    assert get_phase_by_id(phase.id).name == "Landing"
+    # Nothing to update - no empty UPDATE is sent
+    assert update_phase_fast(phase.id) is False
+    assert update_phase_fast(phase.id + 1, name="Gone") is False
\ No newline at end of file
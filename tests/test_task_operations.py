@@ -0,0 +1,106 @@
+"""
+Tests for task_operations
+"""
+
+from datetime import date
+
+import pytest
+
+from database import create_relocation_profile
+from phase_operations import create_phase, get_all_phases
+from task_operations import (
+    create_task,
+    get_all_tasks,
+    get_all_tasks_summary,
+    list_task_summaries,
+    mark_task_completed,
+    seed_phases_and_tasks,
+    update_task
+)
+
+
+@pytest.fixture
+def profile(db):
+    return create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+
+
+def test_seed_phases_and_tasks(profile):
+    phases, tasks = seed_phases_and_tasks(
+        profile.id,
+        [dict(name="Paperwork", relative_start_month=-6, relative_end_month=-3),
+         dict(name="Arrival", relative_start_month=0, relative_end_month=1)],
+        [dict(phase=0, title="Apply for visa", critical=True),
+         dict(phase=1, title="Open bank account"),
+         dict(phase=1, title="Register address")]
+    )
+    
+    assert [(p.name, p.order_index) for p in phases] == [("Paperwork", 1), ("Arrival", 2)]
+    assert [(t.title, t.phase_id) for t in tasks] == [
+        ("Apply for visa", phases[0].id),
+        ("Open bank account", phases[1].id),
+        ("Register address", phases[1].id),
+    ]
+    assert all(t.relocation_profile_id == profile.id for t in tasks)
+    assert len(get_all_tasks(relocation_profile_id=profile.id)) == 3
+
+
+def test_seed_phases_and_tasks_after_existing_phases(profile):
+    create_phase(profile.id, "First", -12, -6, order_index=1)
+    create_phase(profile.id, "Second", -6, -3, order_index=2)
+    
+    phases, tasks = seed_phases_and_tasks(
+        profile.id,
+        [dict(name="Third", relative_start_month=-3, relative_end_month=0),
+         dict(name="Fourth", relative_start_month=0, relative_end_month=1)]
+    )
+    
+    assert [p.order_index for p in phases] == [3, 4]
+    assert tasks == []
+    assert [p.order_index for p in get_all_phases(relocation_profile_id=profile.id)] == [1, 2, 3, 4]
+
+
+def test_seed_phases_and_tasks_without_phases(profile):
+    assert seed_phases_and_tasks(profile.id, []) == ([], [])
+
+
+def test_mark_task_completed(profile):
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    task = create_task(profile.id, phase.id, "Register address")
+    
+    completed = mark_task_completed(task.id, completed_date=date(2027, 1, 5))
+    
+    assert completed.status == 'completed'
+    assert completed.completed_date == date(2027, 1, 5)
+    # Already completed - nothing is changed and nothing is returned
+    assert mark_task_completed(task.id, completed_date=date(2027, 2, 1)) is None
+    assert mark_task_completed(task.id + 1) is None
+    assert get_all_tasks(status='completed')[0].completed_date == date(2027, 1, 5)
+
+
+def test_mark_task_completed_without_status(profile):
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    task = create_task(profile.id, phase.id, "Register address")
+    update_task(task.id, status=None)
+    
+    assert mark_task_completed(task.id).status == 'completed'
+
+
+def test_task_summaries(profile):
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    create_task(profile.id, phase.id, "Open bank account", planned_date=date(2027, 1, 10))
+    create_task(profile.id, phase.id, "Register address", status='completed')
+    create_task(profile.id, phase.id, "Find a flat", critical=True)
+    
+    rows = get_all_tasks_summary(relocation_profile_id=profile.id, status=('not_started', 'in_progress'))
+    assert [row.title for row in rows] == ["Find a flat", "Open bank account"]
+    assert rows[1].planned_date == date(2027, 1, 10)
+    assert rows[1].phase_id == phase.id
+    
+    menu_rows = list_task_summaries(relocation_profile_id=profile.id)
+    assert menu_rows[0]._fields == ('id', 'title', 'status', 'critical')
+    assert [tuple(row)[1:] for row in menu_rows] == [
+        ("Find a flat", 'not_started', True),
+        # Tasks without a planned date sort first
+        ("Register address", 'completed', False),
+        ("Open bank account", 'not_started', False),
+    ]
\ No newline at end of file
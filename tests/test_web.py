@@ -0,0 +1,112 @@
+"""
+Tests for the Flask web app
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from category_operations import create_expense_category
+from database import create_relocation_profile
+from expense_operations import create_expense, get_all_expenses
+from phase_operations import create_phase
+from task_operations import create_task
+
+
+@pytest.fixture
+def client(db):
+    # Imported here so the app's startup runs against the test database
+    from web.app import app
+    
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+@pytest.fixture
+def profile(db):
+    return create_relocation_profile("Test move", "Israel", "Portugal", date(2027, 1, 1))
+
+
+def test_profile_detail_shows_categories(client, profile):
+    create_expense_category(profile.id, "Moving Truck")
+    
+    response = client.get(f'/profile/{profile.id}')
+    
+    assert response.status_code == 200
+    assert b'Moving Truck' in response.data
+    assert b'No categories yet' not in response.data
+
+
+def test_profile_detail_without_categories(client, profile):
+    response = client.get(f'/profile/{profile.id}')
+    
+    assert response.status_code == 200
+    assert b'No categories yet' in response.data
+
+
+def test_profile_detail_missing_profile(client, db):
+    response = client.get('/profile/999')
+    
+    assert response.status_code == 302
+
+
+def _post_expense(client, profile, phase):
+    return client.post(f'/profile/{profile.id}/expense/create', data={
+        'phase_id': phase.id,
+        'title': "Flat deposit",
+        'estimated_amount': "1500",
+        'currency': 'EUR',
+    })
+
+
+def test_expense_create_saves_a_cached_rate(client, profile, monkeypatch):
+    import web.app
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    
+    # A cached rate still comes back on the prefetch thread, like a real lookup
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        monkeypatch.setattr(web.app, 'prefetch_exchange_rate', lambda *pair: pool.submit(lambda: 9200))
+        response = _post_expense(client, profile, phase)
+    
+    assert response.status_code == 302
+    assert get_all_expenses(relocation_profile_id=profile.id)[0].exchange_rate == 9200
+
+
+def test_expense_create_backfills_a_slow_rate(client, profile, monkeypatch):
+    import web.app
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    lookup = Future()
+    monkeypatch.setattr(web.app, '_RATE_WAIT', 0.01)
+    monkeypatch.setattr(web.app, 'prefetch_exchange_rate', lambda *pair: lookup)
+    
+    response = _post_expense(client, profile, phase)
+    
+    # Saved straight away, without waiting for the rate
+    assert response.status_code == 302
+    assert get_all_expenses(relocation_profile_id=profile.id)[0].exchange_rate is None
+    
+    lookup.set_result(9200)
+    assert get_all_expenses(relocation_profile_id=profile.id)[0].exchange_rate == 9200
+
+
+def test_task_complete_only_once(client, profile):
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    task = create_task(profile.id, phase.id, "Register address")
+    
+    response = client.post(f'/task/{task.id}/complete', follow_redirects=True)
+    assert b'Task marked as completed!' in response.data
+    
+    response = client.post(f'/task/{task.id}/complete', follow_redirects=True)
+    assert b'Task is already completed or was not found' in response.data
+
+
+def test_expense_pay_only_once(client, profile):
+    phase = create_phase(profile.id, "Arrival", 0, 1, order_index=1)
+    expense = create_expense(profile.id, phase.id, "Deposit", estimated_amount=150000)
+    
+    response = client.post(f'/expense/{expense.id}/pay', follow_redirects=True)
+    assert b'Expense marked as paid!' in response.data
+    
+    response = client.post(f'/expense/{expense.id}/pay', follow_redirects=True)
+    assert b'Expense is already paid or was not found' in response.data
\ No newline at end of file